@@ -1,54 +1,89 @@
+import logging
+import time
+from typing import Callable, Dict
+
 import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
 
+from work_report import auth
 from work_report import colleagues as col
-from work_report.mediator import Mediator
+from work_report import metrics
+from work_report.layout import Panel, load_layout
+from work_report.mediator import Mediator, app_settings, init_database
+from work_report.profiling import Profiler
 from work_report.session_storage import SessionStorage
 
 # --------- init context & mediator -------------- #
+rerun_start = time.perf_counter()
+profiler = Profiler(enabled=app_settings.profiling)
+if profiler.enabled:
+    logging.basicConfig(level=logging.INFO)
+with profiler.measure("init_database"):
+    init_database()
 storage = SessionStorage(
     state=st.session_state,
 )
-mediator = Mediator(storage=storage)
+try:
+    user_name = auth.get_user_name(app_settings, auth.get_request_headers())
+except auth.AuthenticationError as error:
+    st.error(str(error))
+    st.stop()
+storage.init_state(storage.key_user.name, user_name)
+layout = load_layout(app_settings.layout_file)
+
+
+def get_expanded_key(panel: Panel) -> str:
+    return f"{storage.key_layout.checkbox_expanded}_{panel.value}"
+
+
+with profiler.measure("Mediator.__init__"):
+    # NOTE: data of disabled or collapsed panels are not loaded
+    mediator = Mediator(
+        storage=storage,
+        profiler=profiler,
+        datasets=layout.get_datasets(
+            lambda panel: bool(storage.get_state(get_expanded_key(panel)))
+        ),
+    )
 
 # --------- init streamlit-------------- #
 st.set_page_config(page_title=storage.get_language().main_page_title, layout="wide")
 
 # --------- construct -------------- #
-# TODO: configで読み込んで配置をカスタマイズできるようにする
-row_0 = st.columns([9, 1])
-row_1 = st.columns([1])
-row_2 = st.columns([1, 1])
-row_3 = st.columns([2, 1])
-row_4 = st.columns([1, 1])
-
-row_0[0].title(storage.get_language().main_title)
-col.language_selection(row_0[1], storage)
-col.message_area(row_1[0], storage, mediator)
-col.date_selection(row_2[0], storage, mediator)
-col.working_hours_schedule(row_2[1], storage)
-col.timeline_chart(
-    row_3[0],
-    storage,
-)
-col.job_timer(
-    row_3[1],
-    storage,
-    mediator,
-)
+PANELS: Dict[Panel, Callable[[DeltaGenerator], object]] = {
+    Panel.main_title: lambda gen: gen.title(storage.get_language().main_title),
+    Panel.language_selection: lambda gen: col.language_selection(gen, storage),
+    Panel.message_area: lambda gen: col.message_area(gen, storage, mediator),
+    Panel.date_selection: lambda gen: col.date_selection(gen, storage, mediator),
+    Panel.working_hours_schedule: lambda gen: col.working_hours_schedule(gen, storage),
+    Panel.timeline_chart: lambda gen: col.timeline_chart(gen, storage),
+    Panel.job_timer: lambda gen: col.job_timer(gen, storage, mediator),
+    Panel.job_addition_manually: lambda gen: col.job_addition_manually(
+        gen, storage, mediator
+    ),
+    Panel.job_creation: lambda gen: col.job_creation(gen, storage, mediator),
+    Panel.job_logs: lambda gen: col.job_logs(gen, storage, mediator),
+    Panel.note_area: lambda gen: col.note_area(gen, storage, mediator),
+    Panel.note_search: lambda gen: col.note_search(gen, storage, mediator),
+}
 
-col.job_addition_manually(
-    row_3[1],
-    storage,
-    mediator,
-)
-col.job_creation(
-    row_3[1],
-    storage,
-    mediator,
-)
-col.job_logs(
-    row_4[0],
-    storage,
-    mediator,
-)
-col.note_area(row_4[1], storage, mediator)
+for row in layout.rows:
+    for gen, panels in zip(st.columns(row.widths), row.columns):
+        for panel in panels:
+            if not panel.enabled:
+                continue
+            # NOTE: collapsed panels are skipped until expanded by the checkbox
+            if panel.collapsed and not gen.checkbox(
+                f"{storage.get_language().layout_checkbox_expanded}: {panel.panel.value}",
+                key=get_expanded_key(panel.panel),
+            ):
+                continue
+            with profiler.measure(f"col.{panel.panel.value}"):
+                PANELS[panel.panel](gen)
+
+# --------- profiling -------------- #
+if profiler.enabled:
+    col.profiling_panel(st.container(), storage, profiler)
+profiler.log()
+metrics.rerun_seconds.observe(time.perf_counter() - rerun_start)
+metrics.state_writes.observe(len(storage.get_changed_keys()))
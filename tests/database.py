@@ -0,0 +1,49 @@
+from typing import Final
+
+from pony.orm import Database, db_session
+
+from work_report.config import DatabaseSettings
+from work_report.database import models
+
+# NOTE: owner of the data registered by tests
+USER_NAME: Final[str] = "test"
+
+
+class DatabaseSettingsForTest(DatabaseSettings):
+    """Database settings of tests read from environment variables prefixed with TEST_DATABASE_.
+
+    Tests run against SQLite in memory by default,
+    and against PostgreSQL with e.g. TEST_DATABASE_PROVIDER=postgres.
+    """
+
+    # NOTE: in memory, but shared by threads, e.g. of the write queue and the async logic
+    filename: str = ":sharedmemory:"
+    pg_database: str = "work_report_test"
+
+    class Config:
+        env_prefix = "TEST_DATABASE_"
+
+
+settings = DatabaseSettingsForTest()
+
+
+def bind(db: Database) -> None:
+    db.bind(**settings.dict_bind())
+    if settings.provider != "sqlite" and settings.pool_size is not None:
+        db.use_shared_pool(size=settings.pool_size, timeout=settings.pool_timeout)
+    db.generate_mapping(create_tables=True)
+    with db_session:
+        models.User.insert_if_not_exists(USER_NAME)
+
+
+def unbind(db: Database) -> None:
+    db.drop_all_tables(with_all_data=True)
+    # NOTE: the tables for full-text search are not managed by Pony,
+    #       and SQLite in memory is kept while other threads are connected
+    with db_session:
+        db.execute("DROP TABLE IF EXISTS notes_fts")
+        if settings.provider == "sqlite":
+            db.execute("DROP VIEW IF EXISTS notes_fts_source")
+            db.execute("DROP TABLE IF EXISTS notes_fts_keys")
+    db.disconnect()
+    db.provider = db.schema = None
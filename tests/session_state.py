@@ -0,0 +1,31 @@
+from typing import Any, Dict, Iterator
+
+from streamlit.state import SessionStateProxy
+
+
+class DictSessionState(SessionStateProxy):
+    """Session state working without `streamlit run`"""
+
+    def __init__(self) -> None:
+        object.__setattr__(self, "_state", {})
+
+    def __getitem__(self, key: str | int) -> Any:
+        return self._state[key]
+
+    def __setitem__(self, key: str | int, value: Any) -> None:
+        self._state[key] = value
+
+    def __delitem__(self, key: str | int) -> None:
+        del self._state[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._state
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._state)
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._state)
@@ -1,5 +1,12 @@
+import logging
+from typing import Generator
+
 import pytest
+from pony.orm import db_session
 
+from tests import database
+from work_report import metrics
+from work_report.database import models  # pylint: disable=unused-import
 from work_report.database.database import DatabaseSingleton, InstantiationError
 
 
@@ -12,3 +19,77 @@ class TestDatabaseSingleton:
     def test_exc_instantiation_error(self) -> None:
         with pytest.raises(InstantiationError):
             DatabaseSingleton()
+
+
+@pytest.fixture(scope="function")
+def fixt_query_log_db() -> Generator[DatabaseSingleton, None, None]:
+    db = DatabaseSingleton.get_instance()
+    try:
+        database.bind(db)
+        db.reset_query_counters()
+        yield db
+    finally:
+        db.configure_query_log(
+            slow_query_threshold=None, session_statement_threshold=None
+        )
+        database.unbind(db)
+
+
+class TestQueryLog:
+    def test_normal_count_per_session(
+        self, fixt_query_log_db: DatabaseSingleton
+    ) -> None:
+        statements = metrics.statements.get()
+        with db_session:
+            for _ in range(3):
+                fixt_query_log_db.select("name FROM categories")
+            assert fixt_query_log_db.get_session_statement_count() == 3
+        with db_session:
+            fixt_query_log_db.select("name FROM categories")
+            assert fixt_query_log_db.get_session_statement_count() == 1
+
+        counters = fixt_query_log_db.get_query_counters()
+        assert counters.statements == 4
+        assert counters.sessions == 2
+        assert counters.max_session_statements == 3
+        assert counters.slow_statements == 0
+        assert counters.chatty_sessions == 0
+        assert metrics.statements.get() == statements + 4
+
+    def test_normal_log_chatty_session(
+        self, fixt_query_log_db: DatabaseSingleton, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        fixt_query_log_db.configure_query_log(
+            slow_query_threshold=None, session_statement_threshold=2
+        )
+        with caplog.at_level(logging.WARNING, logger="work_report.database.database"):
+            with db_session:
+                for _ in range(5):
+                    fixt_query_log_db.select("name FROM categories")
+
+        assert len(caplog.records) == 1
+        assert "more than 2 statements" in caplog.records[0].getMessage()
+        assert fixt_query_log_db.get_query_counters().chatty_sessions == 1
+
+    def test_normal_log_slow_query(
+        self, fixt_query_log_db: DatabaseSingleton, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        fixt_query_log_db.configure_query_log(
+            slow_query_threshold=0.0, session_statement_threshold=None
+        )
+        slow_statements = metrics.slow_statements.get()
+        with caplog.at_level(logging.WARNING, logger="work_report.database.database"):
+            with db_session:
+                fixt_query_log_db.select(
+                    "name FROM categories WHERE name = $name",
+                    globals={},
+                    locals={"name": "category"},
+                )
+
+        message = caplog.records[0].getMessage()
+        assert "Slow statement" in message
+        assert "'category'" in message
+        # Query plan of the primary key lookup
+        assert "categories" in message and "plan=[" in message
+        assert fixt_query_log_db.get_query_counters().slow_statements == 1
+        assert metrics.slow_statements.get() == slow_statements + 1
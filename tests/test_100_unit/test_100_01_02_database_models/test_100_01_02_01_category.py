@@ -5,6 +5,7 @@ import pytest
 from pony.orm import db_session
 from pony.orm.core import TransactionIntegrityError
 
+from tests.database import USER_NAME
 from work_report.database import models
 
 CATEGORY_NAME: Final[str] = str(uuid4())
@@ -15,7 +16,7 @@ CATEGORY_NAMES: Final[List[str]] = [str(uuid4()) for _ in range(3)]
 class TestInsert:
     def test_normal(self) -> None:
         with db_session:
-            models.Category.insert(CATEGORY_NAME)
+            models.Category.insert(USER_NAME, CATEGORY_NAME)
 
         with db_session:
             db_category = models.Category.get(name=CATEGORY_NAME)
@@ -26,18 +27,18 @@ class TestInsert:
     def test_exc_same_pk_inside_txn(self) -> None:
         with db_session:
             with pytest.raises(models.CRUDException):
-                models.Category.insert(CATEGORY_NAME)
-                models.Category.insert(CATEGORY_NAME)
+                models.Category.insert(USER_NAME, CATEGORY_NAME)
+                models.Category.insert(USER_NAME, CATEGORY_NAME)
 
     def test_exc_same_pk_separate_txn(self) -> None:
         # OK
         with db_session:
-            models.Category.insert(CATEGORY_NAME)
+            models.Category.insert(USER_NAME, CATEGORY_NAME)
 
         # Error: CRUDException isn't raised because an error occurs at the db_session.
         with pytest.raises(TransactionIntegrityError):
             with db_session:
-                models.Category.insert(CATEGORY_NAME)
+                models.Category.insert(USER_NAME, CATEGORY_NAME)
 
 
 @pytest.mark.usefixtures("fixt_init_db")
@@ -45,12 +46,12 @@ class TestSelect:
     def register_categories(self, category_names: List[str]) -> None:
         with db_session:
             for category_name in category_names:
-                models.Category.insert(category_name)
+                models.Category.insert(USER_NAME, category_name)
 
     def validate_all(self, expected_names: List[str]) -> None:
         sorted_expected_names = sorted(expected_names)
         with db_session:
-            db_categories = models.Category.select_all()
+            db_categories = models.Category.select_all(USER_NAME)
             assert len(db_categories) == len(sorted_expected_names)
             for i in range(len(db_categories)):
                 assert db_categories[i].name == sorted_expected_names[i]
@@ -59,7 +60,7 @@ class TestSelect:
         self, name: str, expected_category_name: str | None
     ) -> None:
         with db_session:
-            db_category = models.Category.select_one_by_name(name)
+            db_category = models.Category.select_one_by_name(USER_NAME, name)
             if expected_category_name is None:
                 assert db_category is None
             else:
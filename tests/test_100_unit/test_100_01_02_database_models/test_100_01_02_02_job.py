@@ -4,8 +4,11 @@ from uuid import uuid4
 
 import pytest
 from pony.orm import db_session, select
+from pony.orm.core import TransactionIntegrityError
 
+from tests.database import USER_NAME
 from work_report.database import models
+from work_report.database.database import DatabaseSingleton
 
 CATEGORY_NAME: Final[str] = str(uuid4())
 CATEGORY_NAMES: Final[List[str]] = [str(uuid4()) for _ in range(3)]
@@ -42,59 +45,97 @@ class TestInsert:
 
     def test_normal_without_category(self) -> None:
         with db_session:
-            models.Job.insert(JOB_NAME)
+            models.Job.insert(USER_NAME, JOB_NAME)
 
         self.validate_registered_job(JOB_NAME, None)
 
     def test_normal_with_category(self) -> None:
         # カテゴリー登録
         with db_session:
-            models.Category.insert(CATEGORY_NAME)
+            models.Category.insert(USER_NAME, CATEGORY_NAME)
 
         with db_session:
             db_category = models.Category.get(name=CATEGORY_NAME)
-            models.Job.insert(JOB_NAME, db_category)
+            models.Job.insert(USER_NAME, JOB_NAME, db_category)
 
         self.validate_registered_job(JOB_NAME, CATEGORY_NAME)
 
     def test_exc_same_job_inside_txn(self) -> None:
         with db_session:
             with pytest.raises(models.DataAlreadyExistsError):
-                models.Job.insert(JOB_NAME)
-                models.Job.insert(JOB_NAME)
+                models.Job.insert(USER_NAME, JOB_NAME)
+                models.Job.insert(USER_NAME, JOB_NAME)
 
     def test_exc_same_job_separate_txn(self) -> None:
         with db_session:
-            models.Job.insert(JOB_NAME)
+            models.Job.insert(USER_NAME, JOB_NAME)
 
         with db_session:
             with pytest.raises(models.DataAlreadyExistsError):
-                models.Job.insert(JOB_NAME)
+                models.Job.insert(USER_NAME, JOB_NAME)
 
     def test_exc_same_job_and_category_inside_txn(self) -> None:
         # カテゴリー登録
         with db_session:
-            models.Category.insert(CATEGORY_NAME)
+            models.Category.insert(USER_NAME, CATEGORY_NAME)
 
         with db_session:
             db_category = models.Category.get(name=CATEGORY_NAME)
             with pytest.raises(models.DataAlreadyExistsError):
-                models.Job.insert(JOB_NAME, db_category)
-                models.Job.insert(JOB_NAME, db_category)
+                models.Job.insert(USER_NAME, JOB_NAME, db_category)
+                models.Job.insert(USER_NAME, JOB_NAME, db_category)
 
     def test_exc_same_job_and_category_separate_txn(self) -> None:
         # カテゴリー登録
         with db_session:
-            models.Category.insert(CATEGORY_NAME)
+            models.Category.insert(USER_NAME, CATEGORY_NAME)
 
         with db_session:
             db_category = models.Category.get(name=CATEGORY_NAME)
-            models.Job.insert(JOB_NAME, db_category)
+            models.Job.insert(USER_NAME, JOB_NAME, db_category)
 
         with db_session:
             db_category = models.Category.get(name=CATEGORY_NAME)
             with pytest.raises(models.DataAlreadyExistsError):
-                models.Job.insert(JOB_NAME, db_category)
+                models.Job.insert(USER_NAME, JOB_NAME, db_category)
+
+    def test_normal_cached_by_session(self) -> None:
+        with db_session:
+            models.Category.insert(USER_NAME, CATEGORY_NAME)
+
+        with db_session:
+            db_user = models.User.get(name=USER_NAME)
+            db_category = models.Category.get(name=CATEGORY_NAME)
+            assert len(db_user.jobs) == len(db_category.jobs) == 0
+            assert models.Job.select_all(USER_NAME) == []
+
+            models.Job.insert(USER_NAME, JOB_NAME, db_category)
+            # Jobs loaded before the insert are loaded again
+            assert [x.name for x in db_user.jobs] == [JOB_NAME]
+            assert [x.name for x in db_category.jobs] == [JOB_NAME]
+            assert [x.name for x in models.Job.select_all(USER_NAME)] == [JOB_NAME]
+
+    def test_exc_same_job_message(self) -> None:
+        with db_session:
+            models.Job.insert(USER_NAME, JOB_NAME)
+
+        with db_session:
+            with pytest.raises(models.DataAlreadyExistsError, match=JOB_NAME):
+                models.Job.insert(USER_NAME, JOB_NAME)
+
+    def test_normal_single_statement(self) -> None:
+        with db_session:
+            models.Job.insert(USER_NAME, JOB_NAME)
+            assert DatabaseSingleton.get_instance().get_session_statement_count() == 1
+
+    def test_exc_same_job_without_category_by_database(self) -> None:
+        with db_session:
+            models.Job(user=USER_NAME, name=JOB_NAME)
+
+        # The unique index works for jobs inserted without Job.insert
+        with pytest.raises(TransactionIntegrityError):
+            with db_session:
+                models.Job(user=USER_NAME, name=JOB_NAME)
 
 
 @pytest.mark.usefixtures("fixt_init_db")
@@ -108,14 +149,16 @@ class TestSelect:
     ) -> None:
         with db_session:
             for category_name in category_names:
-                models.Category.insert(category_name)
-                db_category = models.Category.select_one_by_name(category_name)
+                models.Category.insert(USER_NAME, category_name)
+                db_category = models.Category.select_one_by_name(
+                    USER_NAME, category_name
+                )
                 for job_name in job_names:
-                    models.Job.insert(job_name, db_category)
+                    models.Job.insert(USER_NAME, job_name, db_category)
 
             if registers_category_none:
                 for job_name in job_names:
-                    models.Job.insert(job_name)
+                    models.Job.insert(USER_NAME, job_name)
 
     def validate_all(
         self, expected_category_names: List[str], expected_job_names: List[str]
@@ -126,7 +169,7 @@ class TestSelect:
         )
 
         with db_session:
-            db_jobs = models.Job.select_all()
+            db_jobs = models.Job.select_all(USER_NAME)
 
             assert len(db_jobs) == len(sorted_combinations)
             for i in range(len(db_jobs)):
@@ -155,7 +198,7 @@ class TestSelect:
                         if j.name == expected_job_name
                         and j.category.name == expected_category_name
                     ).get()
-            db_job = models.Job.select_one_by_id(job_id)
+            db_job = models.Job.select_one_by_id(USER_NAME, job_id)
             if expected_job_name is None:
                 assert db_job is None
             else:
@@ -174,6 +217,19 @@ class TestSelect:
         self.register_categories_jobs(CATEGORY_NAMES, JOB_NAMES)
         self.validate_all(CATEGORY_NAMES, JOB_NAMES)
 
+    def test_all_normal_category_none_first(self) -> None:
+        self.register_categories_jobs(
+            CATEGORY_NAMES, JOB_NAMES, registers_category_none=True
+        )
+        with db_session:
+            db_jobs = models.Job.select_all(USER_NAME)
+            assert [db_job.category for db_job in db_jobs[: len(JOB_NAMES)]] == [
+                None
+            ] * len(JOB_NAMES)
+            assert [db_job.name for db_job in db_jobs[: len(JOB_NAMES)]] == sorted(
+                JOB_NAMES
+            )
+
     def test_one_by_id_normal_data_empty(self) -> None:
         self.validate_one(None, None, job_id=999)
 
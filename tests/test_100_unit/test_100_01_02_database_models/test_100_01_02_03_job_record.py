@@ -6,6 +6,7 @@ from uuid import uuid4
 import pytest
 from pony.orm import db_session, select
 
+from tests.database import USER_NAME
 from work_report.database import models
 
 JOB_NAMES: Final[List[str]] = [str(uuid4()) for _ in range(3)]
@@ -19,7 +20,7 @@ class TestInsert:
     def register_jobs(self, job_names: List[str]) -> List[int]:
         with db_session:
             for job_name in job_names:
-                models.Job.insert(job_name)
+                models.Job.insert(USER_NAME, job_name)
 
             db_job_ids = cast(List[int], select(j.id for j in models.Job)[:])  # type: ignore[attr-defined]
 
@@ -60,7 +61,7 @@ class TestInsert:
         ] = []  # job_id, start, end
         with db_session:
             for db_job_id in db_job_ids:
-                db_job = models.Job.select_one_by_id(db_job_id)
+                db_job = models.Job.select_one_by_id(USER_NAME, db_job_id)
                 if db_job is None:
                     raise Exception("!?!?!?")
                 start = datetime.now()
@@ -77,7 +78,7 @@ class TestUpdate:
     def register_job_records(self, job_names: List[str]) -> Tuple[List[int], List[int]]:
         with db_session:
             for job_name in job_names:
-                models.Job.insert(job_name)
+                models.Job.insert(USER_NAME, job_name)
 
             db_jobs = models.Job.select()[:]
             for db_job in db_jobs:
@@ -95,7 +96,7 @@ class TestUpdate:
             for db_job_record_id in db_job_record_ids:
                 db_job_id = random.choice(db_job_ids)
 
-                db_job = models.Job.select_one_by_id(db_job_id)
+                db_job = models.Job.select_one_by_id(USER_NAME, db_job_id)
                 db_job_record = cast(
                     models.JobRecord | None, models.JobRecord.get(id=db_job_record_id)
                 )
@@ -137,7 +138,7 @@ class TestSelect:
     ) -> List[Tuple[int, int, datetime, datetime | None]]:
         with db_session:
             for job_name in job_names:
-                models.Job.insert(job_name)
+                models.Job.insert(USER_NAME, job_name)
 
             db_jobs = models.Job.select()[:]
             for db_job in db_jobs:
@@ -158,7 +159,7 @@ class TestSelect:
         self, job_name: str, __date: date, is_finished: bool
     ) -> Tuple[int, int, datetime, datetime | None]:
         with db_session:
-            models.Job.insert(job_name)
+            models.Job.insert(USER_NAME, job_name)
 
             db_job = models.Job.get()
             # start = datetime.combine(__date, datetime.now().time()) + timedelta(
@@ -186,7 +187,9 @@ class TestSelect:
             expected_job_record_attrs, key=lambda x: (x[2], x[0])
         )
         with db_session:
-            db_job_records = models.JobRecord.select_all_finished_by_date(__date)
+            db_job_records = models.JobRecord.select_finished_between(
+                USER_NAME, __date, __date
+            )
 
             assert len(db_job_records) == len(sorted_expected_job_record_attrs)
             for i in range(len(db_job_records)):
@@ -227,7 +230,7 @@ class TestSelect:
         expects_none: bool = False,
     ) -> None:
         with db_session:
-            db_job_record = models.JobRecord.select_one_by_id(job_record_id)
+            db_job_record = models.JobRecord.select_one_by_id(USER_NAME, job_record_id)
             self.validate_one_session_inner(
                 db_job_record,
                 expected_job_id,
@@ -245,7 +248,9 @@ class TestSelect:
         expects_none: bool = False,
     ) -> None:
         with db_session:
-            db_job_record = models.JobRecord.select_one_in_progress_by_date(__date)
+            db_job_record = models.JobRecord.select_one_in_progress_by_date(
+                USER_NAME, __date
+            )
             self.validate_one_session_inner(
                 db_job_record,
                 expected_job_id,
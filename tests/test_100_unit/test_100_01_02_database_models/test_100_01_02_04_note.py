@@ -1,14 +1,18 @@
 from datetime import date, datetime, timedelta
-from typing import Final
+from typing import Final, List, Tuple, cast
 from uuid import uuid4
 
 import pytest
 from pony.orm import db_session
 
-from work_report.database import models
+from tests import database
+from tests.database import USER_NAME
+from work_report.database import compression, models
+from work_report.database.database import DatabaseSingleton
 
 CURRENT_DATE: Final[date] = datetime.now().date()
 CONTENT: Final[str] = str(uuid4())
+LONG_CONTENT: Final[str] = CONTENT * 100
 
 
 @pytest.mark.usefixtures("fixt_init_db")
@@ -22,31 +26,145 @@ class TestUpsert:
 
     def test_normal_insert(self) -> None:
         with db_session:
-            models.Note.upsert(CURRENT_DATE, CONTENT)
+            models.Note.upsert(USER_NAME, CURRENT_DATE, CONTENT)
 
         self.validate_registered_note(CURRENT_DATE, CONTENT)
 
     def test_normal_upsert(self) -> None:
         with db_session:
-            models.Note.upsert(CURRENT_DATE, CONTENT)
+            models.Note.upsert(USER_NAME, CURRENT_DATE, CONTENT)
 
         updated_content = str(uuid4())
         with db_session:
-            models.Note.upsert(CURRENT_DATE, updated_content)
+            models.Note.upsert(USER_NAME, CURRENT_DATE, updated_content)
         self.validate_registered_note(CURRENT_DATE, updated_content)
 
+    def test_normal_upsert_unchanged(self) -> None:
+        with db_session:
+            models.Note.upsert(USER_NAME, CURRENT_DATE, CONTENT)
+
+        with db_session:
+            models.Note.upsert(USER_NAME, CURRENT_DATE, CONTENT)
+            db_note = models.Note.get(date=CURRENT_DATE)
+            # Not modified, so UPDATE is not issued
+            assert db_note._status_ == "loaded"
+        self.validate_registered_note(CURRENT_DATE, CONTENT)
+
+
+@pytest.mark.usefixtures("fixt_init_db")
+class TestUpsertCompression:
+    def get_note(self, __date: date) -> Tuple[str | None, str | None, str | None]:
+        with db_session:
+            db_note = models.Note.get(date=__date)
+            return db_note.raw_content, db_note.codec, db_note.content
+
+    def test_normal_compressed(self) -> None:
+        with db_session:
+            models.Note.upsert(
+                USER_NAME, CURRENT_DATE, LONG_CONTENT, codec="zlib", threshold=10
+            )
+
+        assert self.get_note(CURRENT_DATE) == ("", "zlib", LONG_CONTENT)
+
+    def test_normal_not_compressed_short(self) -> None:
+        with db_session:
+            models.Note.upsert(
+                USER_NAME, CURRENT_DATE, CONTENT, codec="zlib", threshold=100
+            )
+
+        assert self.get_note(CURRENT_DATE) == (CONTENT, None, CONTENT)
+
+    def test_normal_not_compressed_without_codec(self) -> None:
+        with db_session:
+            models.Note.upsert(USER_NAME, CURRENT_DATE, LONG_CONTENT, threshold=10)
+
+        assert self.get_note(CURRENT_DATE) == (LONG_CONTENT, None, LONG_CONTENT)
+
+    def test_normal_compressed_to_short(self) -> None:
+        with db_session:
+            models.Note.upsert(
+                USER_NAME, CURRENT_DATE, LONG_CONTENT, codec="zlib", threshold=100
+            )
+        with db_session:
+            models.Note.upsert(
+                USER_NAME, CURRENT_DATE, CONTENT, codec="zlib", threshold=100
+            )
+
+        assert self.get_note(CURRENT_DATE) == (CONTENT, None, CONTENT)
+
+    def test_normal_preview(self) -> None:
+        with db_session:
+            models.Note.upsert(USER_NAME, CURRENT_DATE, LONG_CONTENT, preview_length=10)
+
+        with db_session:
+            db_note = models.Note.get(date=CURRENT_DATE)
+            assert db_note.truncated
+            assert db_note.preview == LONG_CONTENT[:10]
+
+    def test_normal_no_preview_short(self) -> None:
+        with db_session:
+            models.Note.upsert(USER_NAME, CURRENT_DATE, CONTENT, preview_length=100)
+
+        with db_session:
+            db_note = models.Note.get(date=CURRENT_DATE)
+            assert not db_note.truncated
+            assert db_note.preview is None
+
+    def test_normal_compressed_database_size(self) -> None:
+        if database.settings.provider != "sqlite":
+            pytest.skip("Pages are counted only on SQLite")
+        # NOTE: long words make the index much smaller than the content
+        content = ("word" * 16 + " ") * 2000
+
+        def count_used_pages() -> int:
+            db = DatabaseSingleton.get_instance()
+            with db_session:
+                return cast(
+                    int,
+                    db.get(
+                        "(SELECT page_count FROM pragma_page_count()) "
+                        "- (SELECT freelist_count FROM pragma_freelist_count())"
+                    ),
+                )
+
+        used_pages = count_used_pages()
+        with db_session:
+            models.Note.upsert(USER_NAME, CURRENT_DATE, content)
+        raw_pages = count_used_pages() - used_pages
+
+        used_pages = count_used_pages()
+        with db_session:
+            models.Note.upsert(
+                USER_NAME,
+                CURRENT_DATE + timedelta(days=1),
+                content,
+                codec="zlib",
+                threshold=10,
+            )
+        compressed_pages = count_used_pages() - used_pages
+
+        # NOTE: the full-text search index keeps no copy of the content
+        assert compressed_pages * 4 < raw_pages
+
+    def test_exc_unknown_codec(self) -> None:
+        with db_session:
+            with pytest.raises(compression.CompressionError):
+                models.Note.upsert(
+                    USER_NAME, CURRENT_DATE, LONG_CONTENT, codec="unknown", threshold=10
+                )
+
 
 @pytest.mark.usefixtures("fixt_init_db")
 class TestSelect:
     def register_note(self, __date: date, content: str) -> None:
         with db_session:
-            models.Note.upsert(__date, content)
+            models.Note.upsert(USER_NAME, __date, content)
 
     def validate_one_by_date(
         self, __date: date, expected_content: str | None, expects_none: bool
     ) -> None:
         with db_session:
-            db_note = models.Note.select_one_by_date(__date)
+            db_note = models.Note.select_one_by_date(USER_NAME, __date)
             if expects_none:
                 assert db_note is None
             else:
@@ -64,3 +182,80 @@ class TestSelect:
     def test_one_by_date_normal_data_missing(self) -> None:
         self.register_note(CURRENT_DATE, CONTENT)
         self.validate_one_by_date(CURRENT_DATE + timedelta(days=1), CONTENT, True)
+
+
+@pytest.mark.usefixtures("fixt_init_db")
+class TestSearch:
+    def register_note(self, __date: date, content: str) -> None:
+        with db_session:
+            models.Note.upsert(USER_NAME, __date, content)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[date, str]]:
+        with db_session:
+            return models.Note.search(USER_NAME, query, limit)
+
+    def test_normal_data_empty(self) -> None:
+        assert self.search("meeting") == []
+
+    def test_normal_match(self) -> None:
+        self.register_note(CURRENT_DATE, "weekly meeting with the team")
+        self.register_note(CURRENT_DATE + timedelta(days=1), "code review")
+
+        results = self.search("meeting")
+        assert len(results) == 1
+        assert results[0][0] == CURRENT_DATE
+        assert "**meeting**" in results[0][1]
+
+    def test_normal_all_words(self) -> None:
+        self.register_note(CURRENT_DATE, "weekly meeting with the team")
+        self.register_note(CURRENT_DATE + timedelta(days=1), "meeting with customer")
+
+        results = self.search("meeting team")
+        assert [result[0] for result in results] == [CURRENT_DATE]
+
+    def test_normal_updated(self) -> None:
+        self.register_note(CURRENT_DATE, "weekly meeting")
+        self.register_note(CURRENT_DATE, "code review")
+
+        assert self.search("meeting") == []
+        assert [result[0] for result in self.search("review")] == [CURRENT_DATE]
+
+    def test_normal_compressed(self) -> None:
+        with db_session:
+            models.Note.upsert(
+                USER_NAME,
+                CURRENT_DATE,
+                "weekly meeting " * 100,
+                codec="zlib",
+                threshold=10,
+            )
+        with db_session:
+            models.Note.upsert(
+                USER_NAME,
+                CURRENT_DATE,
+                "code review " * 100,
+                codec="zlib",
+                threshold=10,
+            )
+
+        assert self.search("meeting") == []
+        results = self.search("review")
+        assert [result[0] for result in results] == [CURRENT_DATE]
+        assert "**review**" in results[0][1]
+
+    def test_normal_limit(self) -> None:
+        for i in range(3):
+            self.register_note(CURRENT_DATE + timedelta(days=i), "meeting")
+
+        assert len(self.search("meeting", 2)) == 2
+
+    @pytest.mark.parametrize(("query"), [(""), ("   ")])
+    def test_normal_blank_query(self, query: str) -> None:
+        self.register_note(CURRENT_DATE, "meeting")
+        assert self.search(query) == []
+
+    @pytest.mark.parametrize(("query"), [('"meeting'), ("meeting AND"), ("-meeting")])
+    def test_normal_query_syntax_ignored(self, query: str) -> None:
+        self.register_note(CURRENT_DATE, "meeting")
+        # Not raised as FTS5 syntax error
+        self.search(query)
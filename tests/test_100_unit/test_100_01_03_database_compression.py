@@ -0,0 +1,22 @@
+import pytest
+
+from work_report.database import compression
+
+CONTENT = "作業ログ\n" * 100
+
+
+class TestCompress:
+    @pytest.mark.parametrize(("codec"), compression.available_codecs())
+    def test_normal_round_trip(self, codec: str) -> None:
+        data = compression.compress(CONTENT, codec)
+        assert len(data) < len(CONTENT.encode("utf-8"))
+        assert compression.decompress(data, codec) == CONTENT
+
+    def test_exc_unknown_codec(self) -> None:
+        with pytest.raises(compression.CompressionError):
+            compression.compress(CONTENT, "unknown")
+
+    def test_exc_unknown_codec_decompress(self) -> None:
+        data = compression.compress(CONTENT, compression.ZLIB)
+        with pytest.raises(compression.CompressionError):
+            compression.decompress(data, "unknown")
@@ -0,0 +1,178 @@
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+from work_report.database.pool import PoolTimeoutError, ShardedPool, SharedPool
+
+
+class Connection:
+    def __init__(self) -> None:
+        self.rollbacks = 0
+        self.closed = False
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class DBAPIModule:
+    """DB-API module opening fake connections"""
+
+    def __init__(self) -> None:
+        self.connections: List[Connection] = []
+
+    def connect(self, *args: Any, **kwargs: Any) -> Connection:
+        connection = Connection()
+        self.connections.append(connection)
+        return connection
+
+
+def create_pool(size: int = 2, timeout: float = 0.1) -> SharedPool:
+    return SharedPool(DBAPIModule(), (), {}, size=size, timeout=timeout)
+
+
+class TestSharedPool:
+    def test_normal_reuse_released(self) -> None:
+        pool = create_pool()
+        connection, is_new = pool.connect()
+        assert is_new
+        pool.release(connection)
+        assert connection.rollbacks == 1
+
+        assert pool.connect() == (connection, False)
+
+    def test_normal_reuse_among_threads(self) -> None:
+        pool = create_pool()
+        connection, _ = pool.connect()
+        pool.release(connection)
+
+        borrowed: List[Any] = []
+        thread = threading.Thread(target=lambda: borrowed.append(pool.connect()))
+        thread.start()
+        thread.join()
+        assert borrowed == [(connection, False)]
+
+    def test_normal_dropped(self) -> None:
+        pool = create_pool(size=1)
+        connection, _ = pool.connect()
+        pool.drop(connection)
+        assert connection.closed
+
+        new_connection, is_new = pool.connect()
+        assert is_new
+        assert new_connection is not connection
+
+    def test_normal_disconnect(self) -> None:
+        pool = create_pool()
+        connections = [pool.connect()[0] for _ in range(2)]
+        for connection in connections:
+            pool.release(connection)
+        pool.disconnect()
+        assert all(connection.closed for connection in connections)
+
+    def test_normal_wait_released(self) -> None:
+        pool = create_pool(size=1, timeout=5)
+        connection, _ = pool.connect()
+        timer = threading.Timer(0.05, pool.release, args=(connection,))
+        timer.start()
+        assert pool.connect() == (connection, False)
+        timer.join()
+
+    def test_exc_exhausted(self) -> None:
+        pool = create_pool(size=2)
+        pool.connect()
+        pool.connect()
+        with pytest.raises(PoolTimeoutError):
+            pool.connect()
+
+
+class Opener:
+    """Opener of fake connections to each file"""
+
+    def __init__(self) -> None:
+        self.connections: Dict[str, List[Connection]] = {}
+
+    def __call__(self, filename: str) -> Connection:
+        connection = Connection()
+        self.connections.setdefault(filename, []).append(connection)
+        return connection
+
+
+def create_sharded_pool(max_shards: int = 2) -> ShardedPool:
+    return ShardedPool(
+        Opener(), lambda shard: f"{shard}.db", "default.db", max_shards=max_shards
+    )
+
+
+def borrow(pool: ShardedPool, shard: str | None) -> Any:
+    if shard is None:
+        connection, _ = pool.connect()
+    else:
+        with pool.route(shard):
+            connection, _ = pool.connect()
+    pool.release(connection)
+    return connection
+
+
+class TestShardedPool:
+    def test_normal_routed(self) -> None:
+        pool = create_sharded_pool()
+        with pool.route("alice"):
+            connection, is_new = pool.connect()
+        assert is_new
+        pool.release(connection)
+        assert pool.get_open_filenames() == ["alice.db"]
+
+        with pool.route("alice"):
+            assert pool.connect() == (connection, False)
+
+    def test_normal_default(self) -> None:
+        pool = create_sharded_pool()
+        borrow(pool, None)
+        assert pool.get_open_filenames() == ["default.db"]
+
+    def test_normal_shards_separated(self) -> None:
+        pool = create_sharded_pool()
+        alice = borrow(pool, "alice")
+        bob = borrow(pool, "bob")
+        assert alice is not bob
+        assert borrow(pool, "alice") is alice
+
+    def test_normal_route_nested(self) -> None:
+        pool = create_sharded_pool()
+        with pool.route("alice"):
+            with pool.route("bob"):
+                pass
+            connection, _ = pool.connect()
+        pool.release(connection)
+        assert pool.get_open_filenames() == ["alice.db"]
+
+    def test_normal_least_recently_used_closed(self) -> None:
+        pool = create_sharded_pool(max_shards=2)
+        alice = borrow(pool, "alice")
+        bob = borrow(pool, "bob")
+        borrow(pool, "alice")
+        carol = borrow(pool, "carol")
+
+        assert pool.get_open_filenames() == ["alice.db", "carol.db"]
+        assert bob.closed
+        assert not alice.closed
+        assert not carol.closed
+
+    def test_normal_dropped(self) -> None:
+        pool = create_sharded_pool()
+        with pool.route("alice"):
+            connection, _ = pool.connect()
+        pool.drop(connection)
+        assert connection.closed
+        assert pool.get_open_filenames() == []
+
+    def test_normal_disconnect(self) -> None:
+        pool = create_sharded_pool()
+        connections = [borrow(pool, shard) for shard in ["alice", "bob"]]
+        pool.disconnect()
+        assert all(connection.closed for connection in connections)
+        assert pool.get_open_filenames() == []
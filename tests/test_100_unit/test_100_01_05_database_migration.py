@@ -0,0 +1,125 @@
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+from typing import Final, Generator
+
+import pytest
+from pony.orm import db_session
+
+from tests import database
+from tests.database import USER_NAME
+from work_report.database import compression, models
+from work_report.database.database import DatabaseSingleton
+from work_report.database.migration import MigrationError, import_single_user_file
+
+CURRENT_DATE: Final[date] = date(2022, 1, 1)
+START: Final[datetime] = datetime(2022, 1, 1, 9, 0, 0, 123456)
+END: Final[datetime] = datetime(2022, 1, 1, 10)
+LONG_CONTENT: Final[str] = " ".join(["meeting"] * 100)
+
+# NOTE: tables created by Pony before entities had users
+OLD_SCHEMA: Final[str] = """
+CREATE TABLE categories (name TEXT PRIMARY KEY);
+CREATE TABLE jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    category TEXT REFERENCES categories (name)
+);
+CREATE TABLE job_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job INTEGER NOT NULL REFERENCES jobs (id),
+    start DATETIME NOT NULL,
+    "end" DATETIME
+);
+"""
+
+
+@pytest.fixture(scope="function")
+def fixt_init_db() -> Generator[None, None, None]:
+    db = DatabaseSingleton.get_instance()
+    try:
+        database.bind(db)
+        yield
+    finally:
+        database.unbind(db)
+
+
+def create_old_file(filename: str, *, with_compression: bool) -> None:
+    connection = sqlite3.connect(filename)
+    connection.executescript(OLD_SCHEMA)
+    if with_compression:
+        connection.execute(
+            "CREATE TABLE notes (date DATE PRIMARY KEY, content TEXT, "
+            "compressed_content BLOB, codec TEXT, preview TEXT)"
+        )
+        connection.execute(
+            "INSERT INTO notes VALUES (?, '', ?, 'zlib', NULL)",
+            (CURRENT_DATE.isoformat(), compression.compress(LONG_CONTENT, "zlib")),
+        )
+    else:
+        connection.execute("CREATE TABLE notes (date DATE PRIMARY KEY, content TEXT)")
+        connection.execute(
+            "INSERT INTO notes VALUES (?, ?)", (CURRENT_DATE.isoformat(), LONG_CONTENT)
+        )
+    connection.execute("INSERT INTO categories VALUES ('category')")
+    connection.execute("INSERT INTO jobs VALUES (10, 'job', 'category')")
+    connection.execute("INSERT INTO jobs VALUES (20, 'job', NULL)")
+    connection.execute(
+        "INSERT INTO job_records VALUES (1, 10, ?, ?)",
+        (START.isoformat(" "), END.isoformat(" ")),
+    )
+    connection.execute(
+        "INSERT INTO job_records VALUES (2, 20, ?, NULL)", (END.isoformat(" "),)
+    )
+    connection.commit()
+    connection.close()
+
+
+@pytest.mark.usefixtures("fixt_init_db")
+class TestImportSingleUserFile:
+    @pytest.mark.parametrize(("with_compression"), [(True), (False)])
+    def test_normal(self, tmp_path: Path, with_compression: bool) -> None:
+        filename = str(tmp_path / "old.db")
+        create_old_file(filename, with_compression=with_compression)
+
+        import_single_user_file(filename, "imported")
+
+        with db_session:
+            assert [c.name for c in models.Category.select_all("imported")] == [
+                "category"
+            ]
+            db_jobs = models.Job.select_all("imported")
+            assert [(j.name, j.category) for j in db_jobs] == [
+                ("job", None),
+                ("job", models.Category.select_one_by_name("imported", "category")),
+            ]
+
+            db_job_records = models.JobRecord.select_finished_between(
+                "imported", CURRENT_DATE, CURRENT_DATE
+            )
+            assert [(r.job.category.name, r.start, r.end) for r in db_job_records] == [
+                ("category", START, END)
+            ]
+            db_job_record = models.JobRecord.select_one_in_progress_by_date(
+                "imported", CURRENT_DATE
+            )
+            assert db_job_record is not None
+            assert db_job_record.job.category is None
+
+            db_note = models.Note.select_one_by_date("imported", CURRENT_DATE)
+            assert db_note is not None
+            assert db_note.content == LONG_CONTENT
+            assert models.Note.search("imported", "meeting", 10)[0][0] == CURRENT_DATE
+
+            # Not imported into other users
+            assert models.Job.select_all(USER_NAME) == []
+            assert models.Note.search(USER_NAME, "meeting", 10) == []
+
+    def test_exc_already_has_users(self, tmp_path: Path) -> None:
+        filename = str(tmp_path / "new.db")
+        connection = sqlite3.connect(filename)
+        connection.execute("CREATE TABLE categories (user_name TEXT, name TEXT)")
+        connection.close()
+
+        with pytest.raises(MigrationError):
+            import_single_user_file(filename, "imported")
@@ -0,0 +1,125 @@
+import os
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Final, Generator, List, cast
+
+import pytest
+from pony.orm import db_session
+
+from tests import database
+from tests.database import USER_NAME
+from work_report import fast_path
+from work_report.database import archive, models
+from work_report.database.database import DatabaseSingleton
+
+pytestmark = pytest.mark.skipif(
+    database.settings.provider != "sqlite", reason="Archives of SQLite files"
+)
+
+CURRENT_YEAR: Final[int] = date.today().year
+DATES: Final[List[date]] = [
+    date(CURRENT_YEAR - 2, 12, 31),
+    date(CURRENT_YEAR - 1, 1, 1),
+    date(CURRENT_YEAR - 1, 6, 30),
+    date(CURRENT_YEAR, 1, 1),
+]
+
+
+@pytest.fixture(scope="function")
+def fixt_file_db(tmp_path: Path) -> Generator[Path, None, None]:
+    db = DatabaseSingleton.get_instance()
+    filename = tmp_path / "sqlite.db"
+    try:
+        db.bind(provider="sqlite", filename=str(filename), create_db=True)
+        db.generate_mapping(create_tables=True)
+        with db_session:
+            models.User.insert_if_not_exists(USER_NAME)
+            db_job = models.Job(user=USER_NAME, name="job")
+            for __date in DATES:
+                start = datetime.combine(__date, time(9))
+                models.JobRecord.insert(db_job, start, start + timedelta(hours=1))
+            # in progress, so not archived
+            models.JobRecord.insert(db_job, datetime.combine(DATES[2], time(18)))
+        yield filename
+    finally:
+        db.disconnect()
+        db.provider = db.schema = None
+
+
+def select_dates(start: date, end: date) -> List[date]:
+    with db_session:
+        return [
+            db_job_record.start.date()
+            for db_job_record in models.JobRecord.select_finished_between(
+                USER_NAME, start, end
+            )
+        ]
+
+
+def count_live() -> int:
+    with db_session:
+        return cast(int, models.JobRecord.select().count())
+
+
+class TestArchiveYear:
+    def test_normal(self, fixt_file_db: Path) -> None:
+        assert archive.archive_year(CURRENT_YEAR - 1) == 2
+
+        assert os.path.exists(
+            archive.get_archive_filename(str(fixt_file_db), CURRENT_YEAR - 1)
+        )
+        assert count_live() == 3
+
+    def test_normal_nothing_to_archive(self, fixt_file_db: Path) -> None:
+        assert archive.archive_year(CURRENT_YEAR - 10) == 0
+        assert count_live() == 5
+
+    def test_exc_not_closed(self, fixt_file_db: Path) -> None:
+        with pytest.raises(archive.ArchiveError):
+            archive.archive_year(CURRENT_YEAR)
+
+    def test_exc_in_memory(self) -> None:
+        db = DatabaseSingleton.get_instance()
+        try:
+            database.bind(db)
+            with pytest.raises(archive.ArchiveError):
+                archive.archive_year(CURRENT_YEAR - 1)
+        finally:
+            database.unbind(db)
+
+
+class TestSelectFinishedBetween:
+    def test_normal_live_only(self, fixt_file_db: Path) -> None:
+        assert select_dates(DATES[0], DATES[-1]) == DATES
+
+    def test_normal_spanning_archives(self, fixt_file_db: Path) -> None:
+        archive.archive_year(CURRENT_YEAR - 2)
+        archive.archive_year(CURRENT_YEAR - 1)
+
+        assert select_dates(DATES[0], DATES[-1]) == DATES
+        assert select_dates(DATES[1], DATES[1]) == [DATES[1]]
+        assert select_dates(DATES[1], DATES[2]) == DATES[1:3]
+
+    def test_normal_archives_not_attached(self, fixt_file_db: Path) -> None:
+        archive.archive_year(CURRENT_YEAR - 1)
+        # Connections attaching the archive are closed
+        DatabaseSingleton.get_instance().disconnect()
+
+        with db_session:
+            models.JobRecord.select_finished_between(USER_NAME, DATES[3], DATES[3])
+            attached = DatabaseSingleton.get_instance().select(
+                "name FROM pragma_database_list"
+            )
+        assert attached == ["main"]
+
+
+class TestFastPath:
+    def test_normal_spanning_archives(self, fixt_file_db: Path) -> None:
+        archive.archive_year(CURRENT_YEAR - 1)
+
+        with db_session:
+            job_records = fast_path.select_finished_job_records(
+                USER_NAME, DATES[0], DATES[-1]
+            )
+        assert [job_record.start.date() for job_record in job_records] == DATES
+        assert {job_record.job.name for job_record in job_records} == {"job"}
@@ -0,0 +1,44 @@
+from typing import Any, Generator, List
+
+import pytest
+
+from tests import database
+from work_report.database.database import DatabaseSingleton
+from work_report.database.statements import StatementRegistry
+
+
+@pytest.fixture(scope="function")
+def fixt_init_db() -> Generator[None, None, None]:
+    db = DatabaseSingleton.get_instance()
+    try:
+        database.bind(db)
+        yield
+    finally:
+        database.unbind(db)
+
+
+@pytest.mark.usefixtures("fixt_init_db")
+class TestStatementRegistry:
+    def test_normal_built_once(self) -> None:
+        registry = StatementRegistry()
+        dialects: List[str] = []
+
+        @registry.register("statement")
+        def build(provider: Any) -> str:
+            dialects.append(provider.dialect)
+            return f"SELECT {provider.quote_name('end')}"
+
+        assert registry.get("statement") == 'SELECT "end"'
+        assert registry.get("statement") == 'SELECT "end"'
+        assert dialects == [DatabaseSingleton.get_instance().provider.dialect]
+
+    def test_exc_already_registered(self) -> None:
+        registry = StatementRegistry()
+        registry.register("statement")(lambda _: "SELECT 1")
+
+        with pytest.raises(ValueError):
+            registry.register("statement")(lambda _: "SELECT 2")
+
+    def test_exc_not_registered(self) -> None:
+        with pytest.raises(KeyError):
+            StatementRegistry().get("statement")
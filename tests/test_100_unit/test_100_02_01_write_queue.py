@@ -0,0 +1,163 @@
+import threading
+import time
+from typing import Generator, List
+
+import pytest
+from pony.orm.core import CommitException
+
+from work_report.write_queue import (
+    WriteQueue,
+    WriteQueueClosedError,
+    is_database_locked,
+)
+
+
+@pytest.fixture(scope="function")
+def fixt_write_queue() -> Generator[WriteQueue, None, None]:
+    write_queue = WriteQueue(max_retries=3, backoff=0.001)
+    try:
+        yield write_queue
+    finally:
+        write_queue.close(timeout=5)
+
+
+def block_queue(write_queue: WriteQueue) -> threading.Event:
+    """Occupy the worker thread until the returned event is set."""
+    started = threading.Event()
+    released = threading.Event()
+
+    def block() -> None:
+        started.set()
+        released.wait(timeout=5)
+
+    write_queue.submit(block)
+    started.wait(timeout=5)
+    return released
+
+
+class TestIsDatabaseLocked:
+    def test_normal_locked(self) -> None:
+        assert is_database_locked(Exception("database is locked"))
+
+    def test_normal_locked_cause(self) -> None:
+        try:
+            try:
+                raise Exception("database is locked")
+            except Exception as error:
+                raise CommitException("commit failed", [error]) from error
+        except CommitException as error:
+            assert is_database_locked(error)
+
+    def test_normal_not_locked(self) -> None:
+        assert not is_database_locked(Exception("no such table"))
+
+
+class TestSubmit:
+    def test_normal_in_order(self, fixt_write_queue: WriteQueue) -> None:
+        results: List[int] = []
+        futures = [fixt_write_queue.submit(results.append, i) for i in range(10)]
+        for future in futures:
+            future.result(timeout=5)
+        assert results == list(range(10))
+
+    def test_normal_result(self, fixt_write_queue: WriteQueue) -> None:
+        future = fixt_write_queue.submit(lambda x, y: x + y, 1, 2)
+        assert future.result(timeout=5) == 3
+
+    def test_normal_coalesce(self, fixt_write_queue: WriteQueue) -> None:
+        results: List[str] = []
+        event = block_queue(fixt_write_queue)
+
+        futures = [
+            fixt_write_queue.submit(results.append, content, key="note")
+            for content in ["a", "ab", "abc"]
+        ]
+        assert fixt_write_queue.depth() == 1
+        assert all(future is futures[0] for future in futures)
+
+        event.set()
+        futures[0].result(timeout=5)
+        assert results == ["abc"]
+
+    def test_normal_not_coalesce_different_keys(
+        self, fixt_write_queue: WriteQueue
+    ) -> None:
+        results: List[str] = []
+        event = block_queue(fixt_write_queue)
+
+        future_1 = fixt_write_queue.submit(results.append, "a", key="note_1")
+        future_2 = fixt_write_queue.submit(results.append, "b", key="note_2")
+        assert fixt_write_queue.depth() == 2
+
+        event.set()
+        future_1.result(timeout=5)
+        future_2.result(timeout=5)
+        assert results == ["a", "b"]
+
+    def test_normal_debounce(self, fixt_write_queue: WriteQueue) -> None:
+        results: List[str] = []
+        future = fixt_write_queue.submit(results.append, "a", key="note", delay=0.2)
+        time.sleep(0.1)
+        fixt_write_queue.submit(results.append, "ab", key="note", delay=0.2)
+        time.sleep(0.15)
+        # The delay was restarted by the second submission
+        assert results == []
+
+        future.result(timeout=5)
+        assert results == ["ab"]
+
+    def test_normal_delayed_not_blocking(self, fixt_write_queue: WriteQueue) -> None:
+        results: List[str] = []
+        delayed_future = fixt_write_queue.submit(results.append, "a", delay=0.2)
+        fixt_write_queue.submit(results.append, "b").result(timeout=5)
+        assert results == ["b"]
+
+        delayed_future.result(timeout=5)
+        assert results == ["b", "a"]
+
+    def test_normal_flush_delayed(self, fixt_write_queue: WriteQueue) -> None:
+        results: List[str] = []
+        future = fixt_write_queue.submit(results.append, "a", key="note", delay=60)
+        fixt_write_queue.submit(results.append, "ab", key="note")
+        future.result(timeout=5)
+        assert results == ["ab"]
+
+    def test_normal_retry_locked(self, fixt_write_queue: WriteQueue) -> None:
+        calls: List[int] = []
+
+        def write() -> str:
+            calls.append(1)
+            if len(calls) < 3:
+                raise Exception("database is locked")
+            return "done"
+
+        assert fixt_write_queue.submit(write).result(timeout=5) == "done"
+        assert len(calls) == 3
+
+    def test_exc_retry_exhausted(self, fixt_write_queue: WriteQueue) -> None:
+        calls: List[int] = []
+
+        def write() -> None:
+            calls.append(1)
+            raise Exception("database is locked")
+
+        with pytest.raises(Exception, match="database is locked"):
+            fixt_write_queue.submit(write).result(timeout=5)
+        assert len(calls) == 4
+
+    def test_exc_not_retried(self, fixt_write_queue: WriteQueue) -> None:
+        calls: List[int] = []
+
+        def write() -> None:
+            calls.append(1)
+            raise ValueError("invalid")
+
+        with pytest.raises(ValueError):
+            fixt_write_queue.submit(write).result(timeout=5)
+        assert len(calls) == 1
+
+    def test_exc_closed(self) -> None:
+        write_queue = WriteQueue()
+        write_queue.close(timeout=5)
+        with pytest.raises(WriteQueueClosedError):
+            write_queue.submit(print)
@@ -0,0 +1,74 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from work_report.metrics import Registry, start_http_server, timed
+
+
+class TestRegistry:
+    def test_normal_counter(self) -> None:
+        registry = Registry()
+        counter = registry.counter("requests_total", "Requests")
+        counter.inc(cache="job", result="hit")
+        counter.inc(2, cache="job", result="hit")
+        counter.inc(cache="job", result="miss")
+
+        assert counter.get(cache="job", result="hit") == 3
+        assert registry.render() == (
+            "# HELP requests_total Requests\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{cache="job",result="hit"} 3.0\n'
+            'requests_total{cache="job",result="miss"} 1.0\n'
+        )
+
+    def test_normal_histogram(self) -> None:
+        registry = Registry()
+        histogram = registry.histogram("seconds", "Seconds", buckets=(0.1, 1.0))
+        for value in [0.05, 0.1, 0.5, 3.0]:
+            histogram.observe(value, method="Job.acquire_all")
+
+        assert histogram.get_count(method="Job.acquire_all") == 4
+        assert registry.render() == (
+            "# HELP seconds Seconds\n"
+            "# TYPE seconds histogram\n"
+            'seconds_bucket{method="Job.acquire_all",le="0.1"} 2\n'
+            'seconds_bucket{method="Job.acquire_all",le="1.0"} 3\n'
+            'seconds_bucket{method="Job.acquire_all",le="+Inf"} 4\n'
+            'seconds_sum{method="Job.acquire_all"} 3.65\n'
+            'seconds_count{method="Job.acquire_all"} 4\n'
+        )
+
+    def test_exc_duplicated(self) -> None:
+        registry = Registry()
+        registry.counter("requests_total", "Requests")
+        with pytest.raises(ValueError):
+            registry.histogram("requests_total", "Requests")
+
+
+class TestTimed:
+    def test_normal(self) -> None:
+        @timed
+        def acquire() -> int:
+            return 1
+
+        assert acquire() == 1
+        assert acquire.__name__ == "acquire"
+
+
+class TestHttpServer:
+    def test_normal(self) -> None:
+        registry = Registry()
+        registry.counter("requests_total", "Requests").inc()
+        server = start_http_server(0, target=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_port}"
+            with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+                assert response.status == 200
+                assert response.read().decode() == registry.render()
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/", timeout=5)
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,91 @@
+import time
+from typing import Generator, List
+
+import pytest
+
+from tests import database
+from work_report import metrics
+from work_report.catalog import Catalog
+from work_report.database.database import DatabaseSingleton
+
+
+@pytest.fixture(scope="function")
+def fixt_init_db() -> Generator[None, None, None]:
+    db = DatabaseSingleton.get_instance()
+    try:
+        database.bind(db)
+        yield
+    finally:
+        database.unbind(db)
+
+
+class Loader:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self) -> List[int]:
+        self.count += 1
+        return [self.count]
+
+
+@pytest.mark.usefixtures("fixt_init_db")
+class TestCatalog:
+    def test_normal_cached(self) -> None:
+        catalog: Catalog[int] = Catalog("test_cached")
+        load = Loader()
+
+        assert catalog.get("alice", load) == [1]
+        assert catalog.get("alice", load) == [1]
+        assert load.count == 1
+        assert metrics.cache_requests.get(cache="test_cached", result="hit") == 1
+        assert metrics.cache_requests.get(cache="test_cached", result="miss") == 1
+
+    def test_normal_copy(self) -> None:
+        catalog: Catalog[int] = Catalog("test_copy")
+        catalog.get("alice", Loader()).append(2)
+
+        assert catalog.get("alice", Loader()) == [1]
+
+    def test_normal_invalidate(self) -> None:
+        catalog: Catalog[int] = Catalog("test_invalidate")
+        load = Loader()
+        catalog.get("alice", load)
+        catalog.get("bob", load)
+
+        catalog.invalidate("alice")
+
+        assert catalog.get("alice", load) == [3]
+        assert catalog.get("bob", load) == [2]
+
+    def test_normal_invalidated_while_loading(self) -> None:
+        catalog: Catalog[int] = Catalog("test_invalidated_while_loading")
+
+        def load_stale() -> List[int]:
+            catalog.invalidate("alice")
+            return [0]
+
+        assert catalog.get("alice", load_stale) == [0]
+        # Loaded again because the stale list is not cached
+        assert catalog.get("alice", Loader()) == [1]
+
+    def test_normal_expired(self) -> None:
+        catalog: Catalog[int] = Catalog("test_expired", ttl=0.05)
+        load = Loader()
+        catalog.get("alice", load)
+        assert catalog.get("alice", load) == [1]
+
+        # Loaded again because changes by other processes may be missed
+        time.sleep(0.06)
+        assert catalog.get("alice", load) == [2]
+        assert catalog.get("alice", load) == [2]
+
+    def test_normal_database_bound_again(self) -> None:
+        catalog: Catalog[int] = Catalog("test_database_bound_again")
+        load = Loader()
+        catalog.get("alice", load)
+
+        db = DatabaseSingleton.get_instance()
+        database.unbind(db)
+        database.bind(db)
+
+        assert catalog.get("alice", load) == [2]
@@ -0,0 +1,43 @@
+from tests.session_state import DictSessionState
+from work_report.session_storage import SessionStorage
+
+
+def create_storage() -> SessionStorage:
+    return SessionStorage(state=DictSessionState())
+
+
+class TestSetState:
+    def test_normal_changed(self) -> None:
+        storage = create_storage()
+        storage.set_state("key", False)
+        storage.set_state("key", True)
+
+        assert storage.get_state("key") is True
+        assert storage.get_changed_keys() == {"key"}
+
+    def test_normal_unchanged_not_written(self) -> None:
+        state = DictSessionState()
+        state["key"] = True
+        storage = SessionStorage(state=state)
+
+        storage.set_state("key", True, do_init=True)
+
+        assert storage.get_changed_keys() == set()
+
+    def test_normal_same_value_of_other_type_written(self) -> None:
+        state = DictSessionState()
+        state["key"] = 1
+        storage = SessionStorage(state=state)
+
+        storage.set_state("key", True)
+
+        assert storage.get_state("key") is True
+        assert storage.get_changed_keys() == {"key"}
+
+    def test_normal_initialized(self) -> None:
+        storage = create_storage()
+        storage.init_state("key", 1)
+        storage.init_state("key", 2)
+
+        assert storage.get_state("key") == 1
+        assert storage.get_changed_keys() == {"key"}
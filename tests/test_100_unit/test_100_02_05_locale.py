@@ -0,0 +1,79 @@
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from work_report import locale
+
+
+def write_json(path: Path, data: object) -> None:
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+class TestLocaleRegistry:
+    def test_normal_built_once(self, tmp_path: Path) -> None:
+        path = tmp_path / "en.json"
+        write_json(path, locale.languages.get_default().dict())
+        registry = locale.LocaleRegistry(default_code="en")
+        registry.register_file("en", "English", path)
+        assert registry.get_codes() == ["en"]
+        assert registry.get_name("en") == "English"
+
+        language = registry.get("en")
+        assert language is registry.get_default()
+        # NOTE: the file is never read again
+        path.unlink()
+        assert registry.get("en") is language
+
+    def test_normal_directory(self, tmp_path: Path) -> None:
+        write_json(tmp_path / "languages.json", {"en": "English", "xx": "Xx"})
+        write_json(tmp_path / "en.json", locale.languages.get_default().dict())
+        write_json(tmp_path / "xx.json", {"language": "Xx", "main_title": "Title"})
+        registry = locale.LocaleRegistry(default_code="en")
+        registry.register_directory(tmp_path)
+        assert registry.get_codes() == ["en", "xx"]
+
+        # NOTE: keys missing in the file fall back to the default language
+        language = registry.get("xx")
+        assert (language.language, language.main_title) == ("Xx", "Title")
+        assert language.main_page_title == registry.get_default().main_page_title
+
+    def test_normal_lazy(self, tmp_path: Path) -> None:
+        write_json(tmp_path / "languages.json", {"en": "English", "xx": "Xx"})
+        write_json(tmp_path / "en.json", locale.languages.get_default().dict())
+        registry = locale.LocaleRegistry(default_code="en")
+        registry.register_directory(tmp_path)
+
+        # NOTE: xx.json does not exist, but is not read until selected
+        assert registry.get_name("xx") == "Xx"
+        assert registry.get_default().language == "English"
+        with pytest.raises(FileNotFoundError):
+            registry.get("xx")
+
+    def test_normal_languages(self) -> None:
+        assert locale.languages.get_codes() == ["en", "ja"]
+        assert locale.languages.get("ja") is locale.languages.get("ja")
+        assert [
+            locale.languages.get(code).language for code in locale.languages.get_codes()
+        ] == [locale.languages.get_name(code) for code in locale.languages.get_codes()]
+
+    def test_exc_already_registered(self, tmp_path: Path) -> None:
+        registry = locale.LocaleRegistry(default_code="en")
+        registry.register_file("en", "English", tmp_path / "en.json")
+
+        with pytest.raises(ValueError):
+            registry.register_file("en", "English", tmp_path / "en.json")
+
+    def test_exc_not_registered(self) -> None:
+        with pytest.raises(KeyError):
+            locale.LocaleRegistry(default_code="en").get_default()
+
+    def test_exc_invalid_default(self, tmp_path: Path) -> None:
+        write_json(tmp_path / "languages.json", {"en": "English"})
+        write_json(tmp_path / "en.json", {"language": "English"})
+        registry = locale.LocaleRegistry(default_code="en")
+        registry.register_directory(tmp_path)
+
+        with pytest.raises(ValidationError):
+            registry.get("en")
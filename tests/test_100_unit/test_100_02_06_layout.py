@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from work_report.layout import (
+    DEFAULT_LAYOUT,
+    Layout,
+    Panel,
+    PanelLayout,
+    RowLayout,
+    load_layout,
+)
+from work_report.mediator import Dataset
+
+KIOSK_LAYOUT = Layout(
+    rows=[
+        RowLayout(
+            widths=[1],
+            columns=[
+                [
+                    PanelLayout(panel=Panel.job_timer),
+                    PanelLayout(panel=Panel.job_logs, collapsed=True),
+                    PanelLayout(panel=Panel.note_area, enabled=False),
+                ]
+            ],
+        )
+    ]
+)
+
+
+class TestLayout:
+    def test_normal_default(self) -> None:
+        assert {panel.panel for panel in DEFAULT_LAYOUT.get_panels()} == set(Panel)
+        assert DEFAULT_LAYOUT.get_datasets(lambda _: False) == frozenset(Dataset)
+
+    def test_normal_collapsed(self) -> None:
+        assert [panel.panel for panel in KIOSK_LAYOUT.get_panels()] == [
+            Panel.job_timer,
+            Panel.job_logs,
+        ]
+        assert KIOSK_LAYOUT.get_datasets(lambda _: False) == {
+            Dataset.jobs,
+            Dataset.job_record_in_progress,
+        }
+        assert KIOSK_LAYOUT.get_datasets(lambda panel: panel == Panel.job_logs) == {
+            Dataset.jobs,
+            Dataset.job_record_in_progress,
+            Dataset.job_records,
+        }
+
+    def test_normal_load(self, tmp_path: Path) -> None:
+        path = tmp_path / "layout.json"
+        path.write_text(KIOSK_LAYOUT.json(), encoding="utf-8")
+
+        assert load_layout(str(path)) == KIOSK_LAYOUT
+        assert load_layout(None) is DEFAULT_LAYOUT
+
+    def test_exc_columns(self) -> None:
+        with pytest.raises(ValidationError):
+            RowLayout(widths=[1, 1], columns=[[PanelLayout(panel=Panel.job_timer)]])
+
+    def test_exc_panel(self) -> None:
+        with pytest.raises(ValidationError):
+            PanelLayout(panel="unknown")
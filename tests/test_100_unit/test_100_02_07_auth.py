@@ -0,0 +1,29 @@
+from typing import Dict
+
+import pytest
+
+from work_report import auth
+from work_report.config import AppSettings
+
+HEADER = "X-Forwarded-User"
+
+
+class TestGetUserName:
+    def test_normal_single_user(self) -> None:
+        settings = AppSettings(default_user="alice")
+        assert auth.get_user_name(settings, {HEADER: "bob"}) == "alice"
+
+    def test_normal_header(self) -> None:
+        settings = AppSettings(user_header=HEADER)
+        assert auth.get_user_name(settings, {HEADER: "bob"}) == "bob"
+
+    @pytest.mark.parametrize(("headers"), [(None), ({}), ({HEADER: ""})])
+    def test_exc_header_missing(self, headers: Dict[str, str] | None) -> None:
+        settings = AppSettings(user_header=HEADER)
+        with pytest.raises(auth.AuthenticationError):
+            auth.get_user_name(settings, headers)
+
+
+class TestGetRequestHeaders:
+    def test_normal_not_streamlit_run(self) -> None:
+        assert auth.get_request_headers() is None
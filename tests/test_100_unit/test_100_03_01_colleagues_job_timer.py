@@ -0,0 +1,15 @@
+from datetime import timedelta
+
+from work_report.colleagues.job_timer import build_elapsed_timer_html
+
+
+class TestBuildElapsedTimerHtml:
+    def test_normal(self) -> None:
+        html = build_elapsed_timer_html("<Elapsed>", timedelta(minutes=1, seconds=5))
+        assert "&lt;Elapsed&gt;:" in html
+        assert "Date.now() - 65000;" in html
+        assert "`${Math.floor(seconds / 3600)}:" in html
+
+    def test_normal_future_start(self) -> None:
+        html = build_elapsed_timer_html("Elapsed", timedelta(seconds=-1))
+        assert "Date.now() - 0;" in html
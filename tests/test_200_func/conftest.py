@@ -2,6 +2,7 @@ from typing import Generator
 
 import pytest
 
+from tests import database
 from work_report.database.database import DatabaseSingleton
 
 
@@ -9,9 +10,7 @@ from work_report.database.database import DatabaseSingleton
 def fixt_init_db() -> Generator[None, None, None]:
     db = DatabaseSingleton.get_instance()
     try:
-        db.bind(provider="sqlite", filename=":memory:", create_db=True)
-        db.generate_mapping(create_tables=True)
+        database.bind(db)
         yield
     finally:
-        db.drop_all_tables(with_all_data=True)
-        db.provider = db.schema = None
+        database.unbind(db)
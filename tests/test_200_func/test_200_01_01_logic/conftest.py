@@ -0,0 +1,23 @@
+from typing import Generator
+
+import pytest
+
+from tests import database
+from work_report import fast_path
+from work_report.database.database import DatabaseSingleton
+
+
+@pytest.fixture(scope="function", params=[False, True], ids=["orm", "fast_path"])
+def fixt_init_db(request: pytest.FixtureRequest) -> Generator[None, None, None]:
+    """Run the logic tests both through the ORM and through the fast path of SQLite."""
+    if request.param and database.settings.provider != "sqlite":
+        pytest.skip("Fast path of SQLite")
+
+    db = DatabaseSingleton.get_instance()
+    try:
+        database.bind(db)
+        fast_path.configure(enabled=request.param)
+        yield
+    finally:
+        fast_path.configure(enabled=False)
+        database.unbind(db)
@@ -4,6 +4,7 @@ from uuid import uuid4
 import pytest
 from pony.orm import db_session
 
+from tests.database import USER_NAME
 from work_report import logic, view_models
 from work_report.database import models
 
@@ -15,25 +16,32 @@ CATEGORY_NAMES: Final[List[str]] = [str(uuid4()) for _ in range(3)]
 class TestRegister:
     def validate_registered_category(self, expected_category_name: str) -> None:
         with db_session:
-            db_category = models.Category.select_one_by_name(expected_category_name)
+            db_category = models.Category.select_one_by_name(
+                USER_NAME, expected_category_name
+            )
             assert type(db_category) is models.Category
             assert db_category.name == expected_category_name
 
     def test_normal(self) -> None:
-        logic.Category.register(CATEGORY_NAME)
+        logic.Category.register(USER_NAME, CATEGORY_NAME)
         self.validate_registered_category(CATEGORY_NAME)
 
     def test_exc_same_same_pk(self) -> None:
-        logic.Category.register(CATEGORY_NAME)
+        logic.Category.register(USER_NAME, CATEGORY_NAME)
         with pytest.raises(logic.LogicException):
-            logic.Category.register(CATEGORY_NAME)
+            logic.Category.register(USER_NAME, CATEGORY_NAME)
+
+    def test_normal_same_name_other_user(self) -> None:
+        logic.Category.register(USER_NAME, CATEGORY_NAME)
+        logic.Category.register("other", CATEGORY_NAME)
+        self.validate_registered_category(CATEGORY_NAME)
 
 
 @pytest.mark.usefixtures("fixt_init_db")
 class TestAcquire:
     def register_categories(self, category_names: List[str]) -> None:
         for category_name in category_names:
-            logic.Category.register(category_name)
+            logic.Category.register(USER_NAME, category_name)
 
     def validate_all(
         self,
@@ -47,10 +55,23 @@ class TestAcquire:
             assert result_categories[i].name == sorted_expected_category_names[i]
 
     def test_all_normal_data_empty(self) -> None:
-        result = logic.Category.acquire_all()
+        result = logic.Category.acquire_all(USER_NAME)
         self.validate_all(result, [])
 
     def test_all_normal_data_exists(self) -> None:
         self.register_categories(CATEGORY_NAMES)
-        result = logic.Category.acquire_all()
+        result = logic.Category.acquire_all(USER_NAME)
+        self.validate_all(result, CATEGORY_NAMES)
+
+    def test_all_normal_data_of_other_user(self) -> None:
+        self.register_categories(CATEGORY_NAMES)
+        result = logic.Category.acquire_all("other")
+        self.validate_all(result, [])
+
+    def test_all_normal_invalidated_by_register(self) -> None:
+        self.register_categories(CATEGORY_NAMES[:1])
+        logic.Category.acquire_all(USER_NAME)
+
+        self.register_categories(CATEGORY_NAMES[1:])
+        result = logic.Category.acquire_all(USER_NAME)
         self.validate_all(result, CATEGORY_NAMES)
@@ -4,8 +4,10 @@ from uuid import uuid4
 import pytest
 from pony.orm import db_session, select
 
+from tests.database import USER_NAME
 from work_report import logic, view_models
 from work_report.database import models
+from work_report.database.database import DatabaseSingleton
 
 CATEGORY_NAMES: Final[List[str]] = [str(uuid4()) for _ in range(3)]
 JOB_NAMES: Final[List[str]] = [str(uuid4()) for _ in range(3)]
@@ -19,7 +21,9 @@ class TestRegister:
         with db_session:
             db_category: models.Category | None = None
             if expected_category_name is not None:
-                db_category = models.Category.select_one_by_name(expected_category_name)
+                db_category = models.Category.select_one_by_name(
+                    USER_NAME, expected_category_name
+                )
 
             db_job: models.Job | None
             if db_category is not None:
@@ -36,29 +40,29 @@ class TestRegister:
             assert db_job.job_records == set()
 
     def test_normal_without_category(self) -> None:
-        logic.Job.register(JOB_NAMES[0])
+        logic.Job.register(USER_NAME, JOB_NAMES[0])
         self.validate_registered_job(JOB_NAMES[0])
 
     def test_normal_with_category(self) -> None:
-        logic.Category.register(CATEGORY_NAMES[0])
-        logic.Job.register(JOB_NAMES[0], CATEGORY_NAMES[0])
+        logic.Category.register(USER_NAME, CATEGORY_NAMES[0])
+        logic.Job.register(USER_NAME, JOB_NAMES[0], CATEGORY_NAMES[0])
         self.validate_registered_job(JOB_NAMES[0], CATEGORY_NAMES[0])
 
     def test_exc_same_name(self) -> None:
-        logic.Job.register(JOB_NAMES[0])
+        logic.Job.register(USER_NAME, JOB_NAMES[0])
         with pytest.raises(logic.LogicException):
-            logic.Job.register(JOB_NAMES[0])
+            logic.Job.register(USER_NAME, JOB_NAMES[0])
 
     def test_exc_same_name_and_category(self) -> None:
-        logic.Category.register(CATEGORY_NAMES[0])
-        logic.Job.register(JOB_NAMES[0], CATEGORY_NAMES[0])
+        logic.Category.register(USER_NAME, CATEGORY_NAMES[0])
+        logic.Job.register(USER_NAME, JOB_NAMES[0], CATEGORY_NAMES[0])
 
         with pytest.raises(logic.LogicException):
-            logic.Job.register(JOB_NAMES[0], CATEGORY_NAMES[0])
+            logic.Job.register(USER_NAME, JOB_NAMES[0], CATEGORY_NAMES[0])
 
     def test_exc_register_not_found(self) -> None:
         with pytest.raises(logic.LogicException):
-            logic.Job.register(JOB_NAMES[0], CATEGORY_NAMES[0])
+            logic.Job.register(USER_NAME, JOB_NAMES[0], CATEGORY_NAMES[0])
 
 
 @pytest.mark.usefixtures("fixt_init_db")
@@ -69,9 +73,9 @@ class TestAcquire:
         self, job_names: List[str], category_names: List[str]
     ) -> List[Tuple[int, str, str]]:
         for category_name in category_names:
-            logic.Category.register(category_name)
+            logic.Category.register(USER_NAME, category_name)
             for job_name in job_names:
-                logic.Job.register(job_name, category_name)
+                logic.Job.register(USER_NAME, job_name, category_name)
 
         with db_session:
             db_job_attrs = cast(List[Tuple[int, str, str]], select((j.id, j.name, j.category.name) for j in models.Job)[:])  # type: ignore[attr-defined]
@@ -82,14 +86,15 @@ class TestAcquire:
         sorted_expected_job_attrs = sorted(
             expected_job_attrs, key=lambda x: (x[2], x[1])
         )
-        result = logic.Job.acquire_all()
+        result = logic.Job.acquire_all(USER_NAME)
         assert len(result) == len(sorted_expected_job_attrs)
         for i in range(len(result)):
             assert type(result[i]) is view_models.Job
             assert result[i].id == sorted_expected_job_attrs[i][0]
             assert result[i].name == sorted_expected_job_attrs[i][1]
-            assert type(result[i].category) is view_models.Category
-            assert result[i].category.name == sorted_expected_job_attrs[i][2]
+            category = result[i].category
+            assert type(category) is view_models.Category
+            assert category.name == sorted_expected_job_attrs[i][2]
 
     def test_all_normal_data_empty(self) -> None:
         self.validate_all([])
@@ -97,3 +102,30 @@ class TestAcquire:
     def test_all_normal_data_exists(self) -> None:
         db_job_attrs = self.register_jobs(JOB_NAMES, CATEGORY_NAMES)
         self.validate_all(db_job_attrs)
+
+    def test_all_normal_cached(self) -> None:
+        self.register_jobs(JOB_NAMES, CATEGORY_NAMES)
+        logic.Job.acquire_all(USER_NAME)
+        db = DatabaseSingleton.get_instance()
+        db.reset_query_counters()
+
+        result = logic.Job.acquire_all(USER_NAME)
+
+        assert len(result) == len(JOB_NAMES) * len(CATEGORY_NAMES)
+        assert db.get_query_counters().statements == 0
+
+    def test_all_normal_invalidated_by_register(self) -> None:
+        assert logic.Job.acquire_all(USER_NAME) == []
+
+        logic.Job.register(USER_NAME, JOB_NAMES[0])
+        assert [job.name for job in logic.Job.acquire_all(USER_NAME)] == [JOB_NAMES[0]]
+
+        logic.Category.register(USER_NAME, CATEGORY_NAMES[0])
+        logic.Job.register(USER_NAME, JOB_NAMES[1], CATEGORY_NAMES[0])
+        assert [job.name for job in logic.Job.acquire_all(USER_NAME)] == JOB_NAMES[:2]
+
+    def test_all_normal_other_user(self) -> None:
+        logic.Job.register(USER_NAME, JOB_NAMES[0])
+        logic.Job.acquire_all(USER_NAME)
+
+        assert logic.Job.acquire_all("other") == []
@@ -5,6 +5,7 @@ from uuid import uuid4
 import pytest
 from pony.orm import db_session, select
 
+from tests.database import USER_NAME
 from work_report import logic, view_models
 from work_report.database import models
 
@@ -25,9 +26,9 @@ def register_jobs(
     job_names: List[str], category_names: List[str]
 ) -> List[Tuple[int, str, str]]:
     for category_name in category_names:
-        logic.Category.register(category_name)
+        logic.Category.register(USER_NAME, category_name)
         for job_name in job_names:
-            logic.Job.register(job_name, category_name)
+            logic.Job.register(USER_NAME, job_name, category_name)
 
     with db_session:
         db_job_attrs = cast(List[Tuple[int, str, str]], select((j.id, j.name, j.category.name) for j in models.Job)[:])  # type: ignore[attr-defined]
@@ -57,7 +58,7 @@ class TestRegister:
     def test_normal(self) -> None:
         db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
         logic.JobRecord.register(
-            db_job_attrs[0][0], START_DATETIMES[0], END_DATETIMES[0]
+            USER_NAME, db_job_attrs[0][0], START_DATETIMES[0], END_DATETIMES[0]
         )
         self.validate_registered_job_record(
             db_job_attrs[0][0], START_DATETIMES[0], END_DATETIMES[0]
@@ -65,26 +66,36 @@ class TestRegister:
 
     def test_exc_job_not_found(self) -> None:
         with pytest.raises(logic.LogicException):
-            logic.JobRecord.register(999, START_DATETIMES[0], END_DATETIMES[0])
+            logic.JobRecord.register(
+                USER_NAME, 999, START_DATETIMES[0], END_DATETIMES[0]
+            )
+
+    def test_exc_job_of_other_user(self) -> None:
+        db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
+        with pytest.raises(logic.LogicException):
+            logic.JobRecord.register(
+                "other", db_job_attrs[0][0], START_DATETIMES[0], END_DATETIMES[0]
+            )
 
     def test_exc_end_equals_to_start(self) -> None:
         db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
         with pytest.raises(logic.LogicException):
             logic.JobRecord.register(
-                db_job_attrs[0][0], START_DATETIMES[0], START_DATETIMES[0]
+                USER_NAME, db_job_attrs[0][0], START_DATETIMES[0], START_DATETIMES[0]
             )
 
     def test_exc_end_less_than_start(self) -> None:
         db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
         with pytest.raises(logic.LogicException):
             logic.JobRecord.register(
-                db_job_attrs[0][0], END_DATETIMES[0], START_DATETIMES[0]
+                USER_NAME, db_job_attrs[0][0], END_DATETIMES[0], START_DATETIMES[0]
             )
 
     def test_exc_diff_dates(self) -> None:
         db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
         with pytest.raises(logic.LogicException):
             logic.JobRecord.register(
+                USER_NAME,
                 db_job_attrs[0][0],
                 START_DATETIMES[0],
                 END_DATETIMES[0] + timedelta(days=1),
@@ -96,7 +107,7 @@ class TestRevise:
     def register_job_record(
         self, job_id: int, start: datetime, end: datetime
     ) -> Tuple[int, int, datetime, datetime]:
-        logic.JobRecord.register(job_id, start, end)
+        logic.JobRecord.register(USER_NAME, job_id, start, end)
         with db_session:
             db_job_record_attr = cast(
                 Tuple[int, int, datetime, datetime],
@@ -117,7 +128,7 @@ class TestRevise:
         replaced_second_expected_start = expected_start.replace(second=0, microsecond=0)
         repalced_second_expected_end = expected_end.replace(second=0, microsecond=0)
         with db_session:
-            db_job_record = models.JobRecord.select_one_by_id(job_record_id)
+            db_job_record = models.JobRecord.select_one_by_id(USER_NAME, job_record_id)
             assert type(db_job_record) is models.JobRecord
             assert db_job_record.id == job_record_id
             assert type(db_job_record.job) is models.Job
@@ -131,6 +142,7 @@ class TestRevise:
             db_job_attrs[0][0], START_DATETIMES[0], END_DATETIMES[0]
         )
         logic.JobRecord.revise(
+            USER_NAME,
             db_job_record_attr[0],
             db_job_attrs[1][0],
             START_DATETIMES[1],
@@ -147,7 +159,7 @@ class TestRevise:
         db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
         with pytest.raises(logic.LogicException):
             logic.JobRecord.revise(
-                999, db_job_attrs[0], START_DATETIMES[0], END_DATETIMES[0]
+                USER_NAME, 999, db_job_attrs[0], START_DATETIMES[0], END_DATETIMES[0]
             )
 
     def test_exc_end_equals_to_start(self) -> None:
@@ -157,6 +169,7 @@ class TestRevise:
         )
         with pytest.raises(logic.LogicException):
             logic.JobRecord.revise(
+                USER_NAME,
                 db_job_record_attr[0],
                 db_job_attrs[1][0],
                 START_DATETIMES[1],
@@ -170,6 +183,7 @@ class TestRevise:
         )
         with pytest.raises(logic.LogicException):
             logic.JobRecord.revise(
+                USER_NAME,
                 db_job_record_attr[0],
                 db_job_attrs[1][0],
                 END_DATETIMES[1],
@@ -183,6 +197,7 @@ class TestRevise:
         )
         with pytest.raises(logic.LogicException):
             logic.JobRecord.revise(
+                USER_NAME,
                 db_job_record_attr[0],
                 db_job_attrs[1][0],
                 START_DATETIMES[1],
@@ -202,7 +217,7 @@ class TestStart:
         replaced_after_datetime = after_datetime.replace(second=0, microsecond=0)
         with db_session:
             db_job_record = models.JobRecord.select_one_in_progress_by_date(
-                before_datetime.date()
+                USER_NAME, before_datetime.date()
             )
             assert type(db_job_record) is models.JobRecord
             assert type(db_job_record.job) is models.Job
@@ -217,7 +232,7 @@ class TestStart:
     def test_normal(self) -> None:
         db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
         before_datetime = datetime.combine(CURRENT_DATE, datetime.now().time())
-        logic.JobRecord.start(db_job_attrs[0][0])
+        logic.JobRecord.start(USER_NAME, db_job_attrs[0][0])
         after_datetime = datetime.combine(CURRENT_DATE, datetime.now().time())
         self.validate_started_job_record(
             db_job_attrs[0][0], before_datetime, after_datetime
@@ -225,14 +240,14 @@ class TestStart:
 
     def test_exc_job_not_found(self) -> None:
         with pytest.raises(logic.LogicException):
-            logic.JobRecord.start(999)
+            logic.JobRecord.start(USER_NAME, 999)
 
     def test_exc_job_already_started(self) -> None:
         db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
-        logic.JobRecord.start(db_job_attrs[0][0])
+        logic.JobRecord.start(USER_NAME, db_job_attrs[0][0])
 
         with pytest.raises(logic.LogicException):
-            logic.JobRecord.start(db_job_attrs[1][0])
+            logic.JobRecord.start(USER_NAME, db_job_attrs[1][0])
 
 
 @pytest.mark.usefixtures("fixt_init_db")
@@ -248,7 +263,7 @@ class TestStop:
         replaced_before_datetime = before_datetime_stop.replace(second=0, microsecond=0)
         replaced_after_datetime = after_datetime_stop.replace(second=0, microsecond=0)
         with db_session:
-            db_job_record = models.JobRecord.select_one_by_id(job_record_id)
+            db_job_record = models.JobRecord.select_one_by_id(USER_NAME, job_record_id)
             assert type(db_job_record) is models.JobRecord
             assert db_job_record.id == job_record_id
             assert type(db_job_record.job) is models.Job
@@ -261,13 +276,13 @@ class TestStop:
             )
 
     def start_job(self, job_id: int) -> Tuple[int, datetime]:
-        logic.JobRecord.start(job_id)
+        logic.JobRecord.start(USER_NAME, job_id)
 
         db_job_record_id: int
         db_job_record_start: datetime
         with db_session:
             db_job_record = models.JobRecord.select_one_in_progress_by_date(
-                CURRENT_DATE
+                USER_NAME, CURRENT_DATE
             )
             if db_job_record is None:
                 raise Exception("!?!?!?")
@@ -280,7 +295,7 @@ class TestStop:
         db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
         db_job_record_id, db_job_record_start = self.start_job(db_job_attrs[0][0])
         before_datetime = datetime.combine(CURRENT_DATE, datetime.now().time())
-        logic.JobRecord.stop(db_job_record_id)
+        logic.JobRecord.stop(USER_NAME, db_job_record_id)
         after_datetime = datetime.combine(CURRENT_DATE, datetime.now().time())
         self.validate_stopped_job_record(
             db_job_record_id,
@@ -292,15 +307,22 @@ class TestStop:
 
     def test_exc_job_not_found(self) -> None:
         with pytest.raises(logic.LogicException):
-            logic.JobRecord.stop(999)
+            logic.JobRecord.stop(USER_NAME, 999)
+
+    def test_exc_job_record_of_other_user(self) -> None:
+        db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
+        db_job_record_id, _ = self.start_job(db_job_attrs[0][0])
+
+        with pytest.raises(logic.LogicException):
+            logic.JobRecord.stop("other", db_job_record_id)
 
     def test_exc_job_already_stopped(self) -> None:
         db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
         db_job_record_id, _ = self.start_job(db_job_attrs[0][0])
-        logic.JobRecord.stop(db_job_record_id)
+        logic.JobRecord.stop(USER_NAME, db_job_record_id)
 
         with pytest.raises(logic.LogicException):
-            logic.JobRecord.stop(db_job_record_id)
+            logic.JobRecord.stop(USER_NAME, db_job_record_id)
 
 
 @pytest.mark.usefixtures("fixt_init_db")
@@ -312,15 +334,17 @@ class TestAcquire:
         is_last_working: bool = False,
     ) -> List[Tuple[int, int, datetime, datetime | None]]:
         for start, end in starts_ends[:-1]:
-            logic.JobRecord.register(job_id, start, end)
+            logic.JobRecord.register(USER_NAME, job_id, start, end)
         if is_last_working:
             with db_session:
-                db_job = models.Job.select_one_by_id(job_id)
+                db_job = models.Job.select_one_by_id(USER_NAME, job_id)
                 if db_job is None:
                     raise Exception("!?!?!?")
                 models.JobRecord.insert(db_job, starts_ends[-1][0])
         else:
-            logic.JobRecord.register(job_id, starts_ends[-1][0], starts_ends[-1][1])
+            logic.JobRecord.register(
+                USER_NAME, job_id, starts_ends[-1][0], starts_ends[-1][1]
+            )
 
         with db_session:
             db_job_record_attrs = cast(
@@ -340,7 +364,7 @@ class TestAcquire:
         sorted_expected_job_record_attrs = sorted(
             expected_job_record_attrs, key=lambda x: (x[2], x[0])
         )
-        result = logic.JobRecord.acquire_all_finished_by_date(__date)
+        result = logic.JobRecord.acquire_all_finished_by_date(USER_NAME, __date)
 
         assert len(result) == len(sorted_expected_job_record_attrs)
         for i in range(len(result)):
@@ -359,7 +383,7 @@ class TestAcquire:
         expected_start: datetime | None,
         expects_none: bool = False,
     ) -> None:
-        result = logic.JobRecord.acquire_one_in_progress_by_date(__date)
+        result = logic.JobRecord.acquire_one_in_progress_by_date(USER_NAME, __date)
         if expects_none:
             assert result is None
         else:
@@ -390,6 +414,30 @@ class TestAcquire:
         ]
         self.validate_all_by_date(CURRENT_DATE, db_job_record_attrs)
 
+    def test_all_between_normal_data_exists(self) -> None:
+        db_job_attrs = register_jobs(JOB_NAMES, CATEGORY_NAMES)
+        db_job_record_attrs = self.register_job_records(
+            db_job_attrs[0][0], list(zip(START_DATETIMES, END_DATETIMES)), True
+        )
+        expected_ids = [
+            attr[0]
+            for attr in sorted(db_job_record_attrs, key=lambda x: (x[2], x[0]))
+            if attr[3] is not None
+        ]
+
+        result = logic.JobRecord.acquire_all_finished_between(
+            USER_NAME, CURRENT_DATE - timedelta(days=1), CURRENT_DATE
+        )
+        assert [job_record.id for job_record in result] == expected_ids
+        assert (
+            logic.JobRecord.acquire_all_finished_between(
+                USER_NAME,
+                CURRENT_DATE - timedelta(days=2),
+                CURRENT_DATE - timedelta(days=1),
+            )
+            == []
+        )
+
     def test_one_in_progress_by_date_normal_data_empty(self) -> None:
         self.validate_one_in_progress_by_date(CURRENT_DATE, None, None, None, True)
 
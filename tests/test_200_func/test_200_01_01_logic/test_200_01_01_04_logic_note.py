@@ -5,6 +5,7 @@ from uuid import uuid4
 import pytest
 from pony.orm import db_session
 
+from tests.database import USER_NAME
 from work_report import logic, view_models
 from work_report.database import models
 
@@ -17,31 +18,37 @@ CONTENTS: Final[List[str]] = [str(uuid4()) for _ in range(3)]
 class TestSave:
     def validate_saved_note(self, __date: date, expected_content: str) -> None:
         with db_session:
-            db_note = models.Note.select_one_by_date(__date)
+            db_note = models.Note.select_one_by_date(USER_NAME, __date)
             assert type(db_note) is models.Note
             assert db_note.date == __date
             assert db_note.content == expected_content
 
     def test_normal_with_empty(self) -> None:
-        logic.Note.save(CURRENT_DATE, CONTENTS[0])
+        logic.Note.save(USER_NAME, CURRENT_DATE, CONTENTS[0])
         self.validate_saved_note(CURRENT_DATE, CONTENTS[0])
 
     def test_normal_with_saved(self) -> None:
-        logic.Note.save(CURRENT_DATE, CONTENTS[0])
-        logic.Note.save(CURRENT_DATE, CONTENTS[1])
+        logic.Note.save(USER_NAME, CURRENT_DATE, CONTENTS[0])
+        logic.Note.save(USER_NAME, CURRENT_DATE, CONTENTS[1])
         self.validate_saved_note(CURRENT_DATE, CONTENTS[1])
 
+    def test_exc_unknown_codec(self) -> None:
+        with pytest.raises(logic.LogicException):
+            logic.Note.save(
+                USER_NAME, CURRENT_DATE, CONTENTS[0], codec="unknown", threshold=1
+            )
+
 
 @pytest.mark.usefixtures("fixt_init_db")
 class TestAcquire:
     def register_notes(self, dates_contents: List[Tuple[date, str]]) -> None:
         for __date, content in dates_contents:
-            logic.Note.save(__date, content)
+            logic.Note.save(USER_NAME, __date, content)
 
     def validate_one_by_date(
         self, __date: date, expected_content: str | None, expects_none: bool = False
     ) -> None:
-        db_note = logic.Note.acquire_one_by_date(__date)
+        db_note = logic.Note.acquire_one_by_date(USER_NAME, __date)
         if expects_none:
             assert db_note is None
         else:
@@ -55,3 +62,65 @@ class TestAcquire:
     def test_one_by_date_normal_data_exists(self) -> None:
         self.register_notes(list(zip(DATES, CONTENTS)))
         self.validate_one_by_date(DATES[0], CONTENTS[0])
+
+    @pytest.mark.parametrize(("codec"), [("zlib"), (None)])
+    def test_one_by_date_normal_preview(self, codec: str | None) -> None:
+        long_content = CONTENTS[0] * 100
+        logic.Note.save(
+            USER_NAME,
+            CURRENT_DATE,
+            long_content,
+            codec=codec,
+            threshold=10,
+            preview_length=10,
+        )
+
+        db_note = logic.Note.acquire_one_by_date(USER_NAME, CURRENT_DATE, preview=True)
+        assert type(db_note) is view_models.Note
+        assert db_note.content == long_content[:10]
+        assert db_note.truncated
+
+        db_note = logic.Note.acquire_one_by_date(USER_NAME, CURRENT_DATE)
+        assert type(db_note) is view_models.Note
+        assert db_note.content == long_content
+        assert not db_note.truncated
+
+    def test_one_by_date_normal_preview_short(self) -> None:
+        logic.Note.save(USER_NAME, CURRENT_DATE, CONTENTS[0], preview_length=100)
+
+        db_note = logic.Note.acquire_one_by_date(USER_NAME, CURRENT_DATE, preview=True)
+        assert type(db_note) is view_models.Note
+        assert db_note.content == CONTENTS[0]
+        assert not db_note.truncated
+
+
+@pytest.mark.usefixtures("fixt_init_db")
+class TestSearch:
+    def test_normal_data_empty(self) -> None:
+        assert logic.Note.search(USER_NAME, CONTENTS[0]) == []
+
+    def test_normal_data_exists(self) -> None:
+        for __date, content in zip(DATES, CONTENTS):
+            logic.Note.save(USER_NAME, __date, f"daily note {content}")
+
+        results = logic.Note.search(USER_NAME, CONTENTS[1])
+        assert len(results) == 1
+        assert type(results[0]) is view_models.NoteSearchResult
+        assert results[0].date == DATES[1]
+        # NOTE: highlighted words are surrounded by "**" differently among providers
+        assert CONTENTS[1] in results[0].snippet.replace("**", "")
+
+    def test_normal_limit(self) -> None:
+        for __date, content in zip(DATES, CONTENTS):
+            logic.Note.save(USER_NAME, __date, f"daily note {content}")
+
+        assert len(logic.Note.search(USER_NAME, "daily", limit=2)) == 2
+
+    def test_normal_data_of_other_user(self) -> None:
+        logic.Note.save(USER_NAME, DATES[0], f"daily note {CONTENTS[0]}")
+        logic.Note.save("other", DATES[0], "daily note")
+
+        assert logic.Note.search("other", CONTENTS[0]) == []
+        assert [result.date for result in logic.Note.search("other", "daily")] == [
+            DATES[0]
+        ]
@@ -0,0 +1,75 @@
+import os
+from datetime import date
+from pathlib import Path
+from typing import Generator
+
+import pytest
+from pony.orm import db_session
+
+from tests import database
+from work_report import logic
+from work_report.database import models
+from work_report.database.database import DatabaseSingleton
+
+pytestmark = pytest.mark.skipif(
+    database.settings.provider != "sqlite", reason="Sharding of SQLite files"
+)
+
+
+@pytest.fixture(scope="function")
+def fixt_sharded_db(tmp_path: Path) -> Generator[Path, None, None]:
+    db = DatabaseSingleton.get_instance()
+    try:
+        db.bind(
+            provider="sqlite", filename=str(tmp_path / "default.db"), create_db=True
+        )
+        db.generate_mapping(create_tables=True)
+        db.use_sharding("shards/{shard}.db", max_shards=2)
+        yield tmp_path / "shards"
+    finally:
+        db.disconnect()
+        db.provider = db.schema = None
+
+
+class TestSharding:
+    def test_normal_file_per_user(self, fixt_sharded_db: Path) -> None:
+        logic.Category.register("alice", "category")
+        logic.Job.register("alice", "job", "category")
+        logic.Note.save("alice", date(2022, 1, 1), "weekly meeting")
+        logic.Category.register("bob", "category")
+
+        assert sorted(os.listdir(fixt_sharded_db)) == ["alice.db", "bob.db"]
+        assert [job.name for job in logic.Job.acquire_all("alice")] == ["job"]
+        assert logic.Job.acquire_all("bob") == []
+        assert len(logic.Note.search("alice", "meeting")) == 1
+        assert logic.Note.search("bob", "meeting") == []
+
+        # Nothing is written to the default file
+        with db_session:
+            assert models.Category.select_all("alice") == []
+
+    def test_exc_same_job_without_category_in_shard(
+        self, fixt_sharded_db: Path
+    ) -> None:
+        logic.Job.register("alice", "job")
+
+        with pytest.raises(logic.LogicException):
+            logic.Job.register("alice", "job")
+
+    def test_normal_user_name_escaped(self, fixt_sharded_db: Path) -> None:
+        logic.Category.register("../alice", "category")
+
+        assert os.listdir(fixt_sharded_db) == ["..%2Falice.db"]
+        assert [c.name for c in logic.Category.acquire_all("../alice")] == ["category"]
+
+    def test_normal_least_recently_used_closed(self, fixt_sharded_db: Path) -> None:
+        for user_name in ["alice", "bob", "carol"]:
+            logic.Category.register(user_name, "category")
+
+        pool = DatabaseSingleton.get_instance().provider.pool
+        assert [os.path.basename(f) for f in pool.get_open_filenames()] == [
+            "bob.db",
+            "carol.db",
+        ]
+        # Reopened
+        assert [c.name for c in logic.Category.acquire_all("alice")] == ["category"]
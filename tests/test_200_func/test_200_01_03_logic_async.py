@@ -0,0 +1,121 @@
+import asyncio
+from datetime import date
+from typing import Any, Generator, List
+
+import pytest
+
+from tests.database import USER_NAME
+from work_report import logic_async, view_models
+from work_report.logic_async import LogicException
+
+# NOTE: simultaneous calls, more than the threads of the executor
+CONCURRENCY = 200
+
+
+@pytest.fixture(scope="function")
+def fixt_executor(fixt_init_db: None) -> Generator[None, None, None]:
+    try:
+        logic_async.configure(max_workers=8)
+        yield
+    finally:
+        logic_async.configure(max_workers=logic_async.DEFAULT_MAX_WORKERS)
+
+
+def count_exceptions(results: List[Any]) -> int:
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, LogicException):
+            raise result
+    return sum(isinstance(result, LogicException) for result in results)
+
+
+@pytest.mark.usefixtures("fixt_executor")
+class TestLogicAsync:
+    def test_normal(self) -> None:
+        async def run() -> None:
+            await logic_async.Category.register(USER_NAME, "category")
+            await logic_async.Job.register(USER_NAME, "job", "category")
+            await logic_async.Note.save(USER_NAME, date(2022, 1, 1), "weekly meeting")
+
+            jobs = await logic_async.Job.acquire_all(USER_NAME)
+            assert [(x.name, str(x.category)) for x in jobs] == [("job", "category")]
+            assert isinstance(jobs[0], view_models.Job)
+            note = await logic_async.Note.acquire_one_by_date(
+                USER_NAME, date(2022, 1, 1)
+            )
+            assert note is not None and note.content == "weekly meeting"
+            results = await logic_async.Note.search(USER_NAME, "weekly")
+            assert [x.date for x in results] == [date(2022, 1, 1)]
+
+        asyncio.run(run())
+
+    def test_exc_logic_exception(self) -> None:
+        async def run() -> None:
+            await logic_async.Category.register(USER_NAME, "category")
+            with pytest.raises(LogicException):
+                await logic_async.Category.register(USER_NAME, "category")
+
+        asyncio.run(run())
+
+    def test_concurrent_start_stop_same_job(self) -> None:
+        async def run() -> None:
+            await logic_async.Job.register(USER_NAME, "job")
+            job_id = (await logic_async.Job.acquire_all(USER_NAME))[0].id
+
+            # NOTE: only one job can be in progress
+            results = await asyncio.gather(
+                *(
+                    logic_async.JobRecord.start(USER_NAME, job_id)
+                    for _ in range(CONCURRENCY)
+                ),
+                return_exceptions=True,
+            )
+            assert count_exceptions(results) == CONCURRENCY - 1
+
+            job_record = await logic_async.JobRecord.acquire_one_in_progress_by_date(
+                USER_NAME, date.today()
+            )
+            assert job_record is not None
+
+            # NOTE: the job can be stopped only once
+            results = await asyncio.gather(
+                *(
+                    logic_async.JobRecord.stop(USER_NAME, job_record.id)
+                    for _ in range(CONCURRENCY)
+                ),
+                return_exceptions=True,
+            )
+            assert count_exceptions(results) == CONCURRENCY - 1
+            assert (
+                await logic_async.JobRecord.acquire_one_in_progress_by_date(
+                    USER_NAME, date.today()
+                )
+                is None
+            )
+
+        asyncio.run(run())
+
+    def test_concurrent_start_stop_users(self) -> None:
+        user_names = [f"user{i}" for i in range(CONCURRENCY)]
+
+        async def start_stop(user_name: str) -> None:
+            job_id = (await logic_async.Job.acquire_all(user_name))[0].id
+            await logic_async.JobRecord.start(user_name, job_id)
+            job_record = await logic_async.JobRecord.acquire_one_in_progress_by_date(
+                user_name, date.today()
+            )
+            assert job_record is not None
+            await logic_async.JobRecord.stop(user_name, job_record.id)
+
+        async def run() -> None:
+            for user_name in user_names:
+                await logic_async.Job.register(user_name, "job")
+            await asyncio.gather(*(start_stop(x) for x in user_names))
+            for user_name in user_names:
+                assert (
+                    await logic_async.JobRecord.acquire_one_in_progress_by_date(
+                        user_name, date.today()
+                    )
+                    is None
+                )
+
+        asyncio.run(run())
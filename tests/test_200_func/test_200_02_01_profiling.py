@@ -0,0 +1,71 @@
+import json
+import logging
+
+import pytest
+
+from tests.database import USER_NAME
+from work_report import logic
+from work_report.profiling import Profiler
+
+
+class TestProfiler:
+    def test_normal_measure_sql(self, fixt_init_db: None) -> None:
+        profiler = Profiler(enabled=True)
+        with profiler.measure("logic.Category.register"):
+            logic.Category.register(USER_NAME, "category")
+        with profiler.measure("logic.Category.acquire_all"):
+            logic.Category.acquire_all(USER_NAME)
+        with profiler.measure("no sql"):
+            pass
+
+        records = profiler.get_records()
+        assert [record.name for record in records] == [
+            "logic.Category.register",
+            "logic.Category.acquire_all",
+            "no sql",
+        ]
+        assert records[0].sql_count >= 1
+        assert records[1].sql_count >= 1
+        assert records[2].sql_count == 0
+        assert all(record.elapsed >= 0 for record in records)
+
+    def test_normal_nested(self, fixt_init_db: None) -> None:
+        profiler = Profiler(enabled=True)
+        with profiler.measure("outer"):
+            with profiler.measure("inner"):
+                logic.Category.acquire_all(USER_NAME)
+
+        inner, outer = profiler.get_records()
+        assert (inner.name, inner.depth) == ("inner", 1)
+        assert (outer.name, outer.depth) == ("outer", 0)
+        assert outer.sql_count == inner.sql_count
+        assert outer.elapsed >= inner.elapsed
+
+        summary = profiler.summarize()
+        assert summary["sql_count"] == outer.sql_count
+        assert [phase["name"] for phase in summary["phases"]] == ["inner", "outer"]
+
+    def test_normal_disabled(self, fixt_init_db: None) -> None:
+        profiler = Profiler()
+        with profiler.measure("logic.Category.acquire_all"):
+            logic.Category.acquire_all(USER_NAME)
+        assert profiler.get_records() == []
+
+    def test_normal_log(
+        self, fixt_init_db: None, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        profiler = Profiler(enabled=True)
+        with profiler.measure("logic.Category.acquire_all"):
+            logic.Category.acquire_all(USER_NAME)
+
+        with caplog.at_level(logging.INFO, logger="work_report.profiling"):
+            profiler.log()
+        assert len(caplog.records) == 1
+        line = json.loads(caplog.records[0].getMessage())
+        assert line["event"] == "rerun"
+        assert line["phases"][0]["name"] == "logic.Category.acquire_all"
+
+    def test_normal_log_disabled(self, caplog: pytest.LogCaptureFixture) -> None:
+        with caplog.at_level(logging.INFO, logger="work_report.profiling"):
+            Profiler().log()
+        assert caplog.records == []
@@ -0,0 +1,20 @@
+import pytest
+
+from tests.database import USER_NAME
+from work_report import logic, metrics
+
+
+class TestLogicMetrics:
+    def test_normal_observe_transaction(self, fixt_init_db: None) -> None:
+        count = metrics.logic_seconds.get_count(method="Category.acquire_all")
+        logic.Category.acquire_all(USER_NAME)
+        assert (
+            metrics.logic_seconds.get_count(method="Category.acquire_all") == count + 1
+        )
+
+    def test_exc_count_error(self, fixt_init_db: None) -> None:
+        logic.Category.register(USER_NAME, "category")
+        errors = metrics.logic_errors.get(method="Category.register")
+        with pytest.raises(logic.LogicException):
+            logic.Category.register(USER_NAME, "category")
+        assert metrics.logic_errors.get(method="Category.register") == errors + 1
@@ -0,0 +1,175 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, time
+from typing import Generator
+
+import pytest
+
+from tests import database
+from tests.database import USER_NAME
+from tests.session_state import DictSessionState
+from work_report import logic, mediator, metrics
+from work_report.mediator import Dataset, Mediator
+from work_report.profiling import Profiler
+from work_report.session_storage import SessionStorage
+
+
+@pytest.fixture(scope="function")
+def fixt_storage(fixt_init_db: None) -> SessionStorage:
+    storage = SessionStorage(state=DictSessionState())
+    storage.set_state(storage.key_user.name, USER_NAME)
+    storage.set_state(storage.key_date_selection.input, date.today())
+    return storage
+
+
+@pytest.fixture(scope="function")
+def fixt_load_executor(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Generator[ThreadPoolExecutor, None, None]:
+    if not mediator.db.is_shared_by_threads():
+        pytest.skip("SQLite in memory is not shared by threads")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        monkeypatch.setattr(mediator, "load_executor", executor)
+        yield executor
+
+
+class TestMediatorLoad:
+    def test_normal_concurrently(
+        self, fixt_storage: SessionStorage, fixt_load_executor: ThreadPoolExecutor
+    ) -> None:
+        logic.Category.register(USER_NAME, "category")
+        logic.Job.register(USER_NAME, "job", "category")
+        job = logic.Job.acquire_all(USER_NAME)[0]
+        logic.JobRecord.register(
+            USER_NAME,
+            job.id,
+            datetime.combine(date.today(), time(0, 0)),
+            datetime.combine(date.today(), time(0, 1)),
+        )
+        logic.Note.save(USER_NAME, date.today(), "note")
+
+        profiler = Profiler(enabled=True)
+        Mediator(storage=fixt_storage, profiler=profiler)
+        assert "Mediator.load_concurrently" in [x.name for x in profiler.get_records()]
+        assert fixt_storage.get_jobs() == [job]
+        assert fixt_storage.get_categories()[0].name == "category"
+        assert len(fixt_storage.get_job_records()) == 1
+        assert fixt_storage.get_job_record_in_progress() is None
+        note = fixt_storage.get_note()
+        assert note is not None and note.content == "note"
+
+    def test_normal_datasets(self, fixt_storage: SessionStorage) -> None:
+        logic.Job.register(USER_NAME, "job")
+
+        Mediator(storage=fixt_storage, datasets=frozenset({Dataset.job_records}))
+        assert fixt_storage.get_jobs() == []
+        assert fixt_storage.get_job_records() == []
+        assert fixt_storage.get_note() is None
+
+
+class TestMediatorSessionData:
+    def test_normal_reused_by_reruns(self, fixt_storage: SessionStorage) -> None:
+        logic.Job.register(USER_NAME, "job")
+        Mediator(storage=fixt_storage)
+        jobs = fixt_storage.get_jobs()
+
+        hits = metrics.cache_requests.get(cache="session_data", result="hit")
+        Mediator(storage=fixt_storage)
+        assert metrics.cache_requests.get(
+            cache="session_data", result="hit"
+        ) == hits + len(Dataset)
+        assert fixt_storage.get_jobs() is jobs
+
+    def test_normal_reloaded_after_write(self, fixt_storage: SessionStorage) -> None:
+        mediator_ = Mediator(storage=fixt_storage)
+        assert fixt_storage.get_jobs() == []
+
+        fixt_storage.set_state(fixt_storage.key_job_creation.input, "job")
+        mediator_.click_create_job_or_category()
+        Mediator(storage=fixt_storage)
+        assert [job.name for job in fixt_storage.get_jobs()] == ["job"]
+
+    def test_normal_reloaded_by_arguments(self, fixt_storage: SessionStorage) -> None:
+        logic.Note.save(USER_NAME, date(2022, 1, 1), "old")
+        Mediator(storage=fixt_storage)
+        assert fixt_storage.get_note() is None
+
+        fixt_storage.set_state(fixt_storage.key_date_selection.input, date(2022, 1, 1))
+        Mediator(storage=fixt_storage)
+        note = fixt_storage.get_note()
+        assert note is not None and note.content == "old"
+
+    def test_normal_not_reused(
+        self, fixt_storage: SessionStorage, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(mediator.app_settings, "session_data_ttl", None)
+        Mediator(storage=fixt_storage)
+        logic.Job.register(USER_NAME, "job")
+
+        hits = metrics.cache_requests.get(cache="session_data", result="hit")
+        Mediator(storage=fixt_storage)
+        assert metrics.cache_requests.get(cache="session_data", result="hit") == hits
+        assert [job.name for job in fixt_storage.get_jobs()] == ["job"]
+
+
+def wait_writes(storage: SessionStorage) -> None:
+    wait(list(storage.get_state(storage.key_write_queue.futures) or {}))
+
+
+class TestMediatorNote:
+    def test_normal_autosave_edits(
+        self, fixt_storage: SessionStorage, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(mediator.app_settings, "note_autosave_delay", 0.01)
+        logic.Note.save(USER_NAME, date.today(), "saved")
+        mediator_ = Mediator(storage=fixt_storage)
+        assert fixt_storage.get_state(fixt_storage.key_note_area.text_area) == "saved"
+
+        # NOTE: type and blur, then the debounced write lands after the rerun
+        fixt_storage.set_state(fixt_storage.key_note_area.checkbox_autosave, True)
+        fixt_storage.set_state(fixt_storage.key_note_area.text_area, "first")
+        mediator_.change_note()
+        Mediator(storage=fixt_storage)
+        wait_writes(fixt_storage)
+
+        # NOTE: the second edit is kept on the rerun after the write has landed
+        fixt_storage.set_state(fixt_storage.key_note_area.text_area, "second")
+        mediator_ = Mediator(storage=fixt_storage)
+        assert fixt_storage.get_state(fixt_storage.key_note_area.text_area) == "second"
+        mediator_.change_note()
+        wait_writes(fixt_storage)
+
+        note = logic.Note.acquire_one_by_date(USER_NAME, date.today())
+        assert note is not None and note.content == "second"
+
+    def test_normal_seeded_per_date(self, fixt_storage: SessionStorage) -> None:
+        logic.Note.save(USER_NAME, date(2022, 1, 1), "old")
+        Mediator(storage=fixt_storage)
+        assert fixt_storage.get_state(fixt_storage.key_note_area.text_area) == ""
+
+        fixt_storage.set_state(fixt_storage.key_date_selection.input, date(2022, 1, 1))
+        Mediator(storage=fixt_storage)
+        assert fixt_storage.get_state(fixt_storage.key_note_area.text_area) == "old"
+
+
+class TestSharedReferenceData:
+    def test_normal_shared_by_sessions(self, fixt_init_db: None) -> None:
+        logic.Category.register(USER_NAME, "category")
+        logic.Job.register(USER_NAME, "job", "category")
+
+        misses = {
+            cache: metrics.cache_requests.get(cache=cache, result="miss")
+            for cache in ("job_catalog", "category_catalog")
+        }
+        storages = []
+        for _ in range(2):
+            storage = SessionStorage(state=DictSessionState())
+            storage.set_state(storage.key_user.name, USER_NAME)
+            Mediator(storage=storage)
+            storages.append(storage)
+
+        # NOTE: the second session is served by the catalogs loaded by the first one
+        for cache, miss in misses.items():
+            assert metrics.cache_requests.get(cache=cache, result="miss") == miss + 1
+        assert storages[0].get_jobs()[0] is storages[1].get_jobs()[0]
+        assert storages[0].get_categories()[0] is storages[1].get_categories()[0]
+        assert storages[0].get_language() is storages[1].get_language()
@@ -0,0 +1,32 @@
+from typing import Final, Generator, List
+
+import pytest
+
+from tests import database
+from tests.session_state import DictSessionState
+from work_report.database.database import DatabaseSingleton
+
+from .data_generator import GeneratedData, Scale, generate
+
+SCALES: Final[List[Scale]] = [
+    Scale("small", categories=3, jobs=10, years=1),
+    Scale("medium", categories=10, jobs=50, years=3),
+    Scale("large", categories=20, jobs=200, years=10),
+]
+
+
+@pytest.fixture(scope="package", params=SCALES, ids=[scale.name for scale in SCALES])
+def fixt_bench_db(
+    request: pytest.FixtureRequest,
+) -> Generator[GeneratedData, None, None]:
+    db = DatabaseSingleton.get_instance()
+    try:
+        database.bind(db)
+        yield generate(request.param)
+    finally:
+        database.unbind(db)
+
+
+@pytest.fixture(scope="function")
+def fixt_session_state() -> DictSessionState:
+    return DictSessionState()
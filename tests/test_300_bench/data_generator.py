@@ -0,0 +1,78 @@
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Final, List, NamedTuple
+
+from pony.orm import db_session
+
+from tests.database import USER_NAME
+from work_report.database import models
+
+VOCABULARY: Final[List[str]] = [f"word{i}" for i in range(5000)]
+WORDS_PER_NOTE: Final[int] = 100
+RECORDS_PER_DAY: Final[int] = 8
+LAST_DATE: Final[date] = date(2021, 12, 31)
+
+
+class Scale(NamedTuple):
+    name: str
+    categories: int
+    jobs: int
+    years: int
+
+
+class GeneratedData(NamedTuple):
+    scale: Scale
+    job_ids: List[int]
+    category_names: List[str]
+    first_date: date
+    last_date: date
+
+
+def generate(scale: Scale, *, seed: int = 0) -> GeneratedData:
+    """Populate the bound database with deterministic synthetic data.
+
+    Each day until LAST_DATE has RECORDS_PER_DAY finished job records of one hour
+    from 9:00 and a note. The last day also has a job record in progress.
+
+    Args:
+        scale (Scale): Number of categories, jobs and years
+        seed (int, optional): Seed of the random generator
+
+    Returns:
+        GeneratedData: Keys of the generated data
+    """
+    rand = random.Random(seed)
+    first_date = LAST_DATE - timedelta(days=scale.years * 365 - 1)
+
+    with db_session:
+        category_names = [f"category{i}" for i in range(scale.categories)]
+        for category_name in category_names:
+            models.Category.insert(USER_NAME, category_name)
+        db_categories = models.Category.select_all(USER_NAME)
+
+        db_jobs = [
+            models.Job(
+                user=USER_NAME, name=f"job{i}", category=rand.choice(db_categories)
+            )
+            for i in range(scale.jobs)
+        ]
+
+        for day in range(scale.years * 365):
+            __date = first_date + timedelta(days=day)
+            for hour in range(RECORDS_PER_DAY):
+                start = datetime.combine(__date, time(9 + hour))
+                models.JobRecord.insert(
+                    rand.choice(db_jobs), start, start + timedelta(hours=1)
+                )
+            models.Note.upsert(
+                USER_NAME, __date, " ".join(rand.choices(VOCABULARY, k=WORDS_PER_NOTE))
+            )
+
+        models.JobRecord.insert(
+            rand.choice(db_jobs), datetime.combine(LAST_DATE, time(18))
+        )
+
+    with db_session:
+        job_ids = [db_job.id for db_job in models.Job.select_all(USER_NAME)]
+
+    return GeneratedData(scale, job_ids, category_names, first_date, LAST_DATE)
@@ -0,0 +1,27 @@
+import itertools
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.database import USER_NAME
+from work_report import logic
+
+from ..data_generator import GeneratedData
+
+
+class TestRegister:
+    @pytest.mark.benchmark(group="logic.Category.register")
+    def test_register(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        counter = itertools.count()
+        benchmark(lambda: logic.Category.register(USER_NAME, f"bench{next(counter)}"))
+
+
+class TestAcquire:
+    @pytest.mark.benchmark(group="logic.Category.acquire_all")
+    def test_all(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        categories = benchmark(logic.Category.acquire_all, USER_NAME)
+        assert len(categories) >= fixt_bench_db.scale.categories
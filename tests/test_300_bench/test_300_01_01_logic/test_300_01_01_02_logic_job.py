@@ -0,0 +1,51 @@
+import itertools
+from typing import List
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.database import USER_NAME
+from work_report import logic, view_models
+
+from ..data_generator import GeneratedData
+
+
+class TestRegister:
+    @pytest.mark.benchmark(group="logic.Job.register")
+    def test_without_category(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        counter = itertools.count()
+        benchmark(lambda: logic.Job.register(USER_NAME, f"bench{next(counter)}"))
+
+    @pytest.mark.benchmark(group="logic.Job.register")
+    def test_with_category(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        counter = itertools.count()
+        category_name = fixt_bench_db.category_names[0]
+        benchmark(
+            lambda: logic.Job.register(
+                USER_NAME, f"bench{next(counter)}", category_name
+            )
+        )
+
+
+class TestAcquire:
+    @pytest.mark.benchmark(group="logic.Job.acquire_all")
+    def test_all(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        jobs = benchmark(logic.Job.acquire_all, USER_NAME)
+        assert len(jobs) >= fixt_bench_db.scale.jobs
+
+    @pytest.mark.benchmark(group="logic.Job.acquire_all")
+    def test_all_uncached(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        def acquire_all() -> List[view_models.Job]:
+            logic.job_catalog.invalidate(USER_NAME)
+            return logic.Job.acquire_all(USER_NAME)
+
+        jobs = benchmark(acquire_all)
+        assert len(jobs) >= fixt_bench_db.scale.jobs
@@ -0,0 +1,85 @@
+from datetime import date, datetime, time
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.database import USER_NAME
+from work_report import logic
+
+from ..data_generator import RECORDS_PER_DAY, GeneratedData
+
+
+class TestRegister:
+    @pytest.mark.benchmark(group="logic.JobRecord.register")
+    def test_register(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        first_date = fixt_bench_db.first_date
+        benchmark(
+            logic.JobRecord.register,
+            USER_NAME,
+            fixt_bench_db.job_ids[0],
+            datetime.combine(first_date, time(20)),
+            datetime.combine(first_date, time(21)),
+        )
+
+
+class TestRevise:
+    @pytest.mark.benchmark(group="logic.JobRecord.revise")
+    def test_revise(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        first_date = fixt_bench_db.first_date
+        job_record = logic.JobRecord.acquire_all_finished_by_date(
+            USER_NAME, first_date
+        )[0]
+        benchmark(
+            logic.JobRecord.revise,
+            USER_NAME,
+            job_record.id,
+            fixt_bench_db.job_ids[-1],
+            job_record.start,
+            job_record.end,
+        )
+
+
+class TestStartStop:
+    @pytest.mark.benchmark(group="logic.JobRecord.start_stop")
+    def test_start_stop(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        job_id = fixt_bench_db.job_ids[0]
+
+        def start_stop() -> None:
+            logic.JobRecord.start(USER_NAME, job_id)
+            job_record = logic.JobRecord.acquire_one_in_progress_by_date(
+                USER_NAME, date.today()
+            )
+            assert job_record is not None
+            logic.JobRecord.stop(USER_NAME, job_record.id)
+
+        benchmark(start_stop)
+
+
+class TestAcquire:
+    @pytest.mark.benchmark(group="logic.JobRecord.acquire_all_finished_by_date")
+    def test_all_finished_by_date(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        job_records = benchmark(
+            logic.JobRecord.acquire_all_finished_by_date,
+            USER_NAME,
+            fixt_bench_db.last_date,
+        )
+        assert len(job_records) == RECORDS_PER_DAY
+
+    @pytest.mark.benchmark(group="logic.JobRecord.acquire_one_in_progress_by_date")
+    def test_one_in_progress_by_date(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        job_record = benchmark(
+            logic.JobRecord.acquire_one_in_progress_by_date,
+            USER_NAME,
+            fixt_bench_db.last_date,
+        )
+        assert job_record is not None
@@ -0,0 +1,66 @@
+import itertools
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.database import USER_NAME
+from work_report import logic
+
+from ..data_generator import GeneratedData
+
+
+class TestSave:
+    @pytest.mark.benchmark(group="logic.Note.save")
+    def test_save(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        counter = itertools.count()
+        last_date = fixt_bench_db.last_date
+        # NOTE: content is changed every time, otherwise saving is skipped
+        benchmark(
+            lambda: logic.Note.save(USER_NAME, last_date, f"bench note {next(counter)}")
+        )
+
+
+class TestAcquire:
+    @pytest.mark.benchmark(group="logic.Note.acquire_one_by_date")
+    def test_one_by_date(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        note = benchmark(
+            logic.Note.acquire_one_by_date, USER_NAME, fixt_bench_db.first_date
+        )
+        assert note is not None
+
+    @pytest.mark.benchmark(group="logic.Note.acquire_one_by_date_preview")
+    def test_one_by_date_preview(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        note = benchmark(
+            lambda: logic.Note.acquire_one_by_date(
+                USER_NAME, fixt_bench_db.first_date, preview=True
+            )
+        )
+        assert note is not None
+
+
+class TestSearch:
+    @pytest.mark.benchmark(group="logic.Note.search_one_word")
+    def test_one_word(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        results = benchmark(logic.Note.search, USER_NAME, "word42")
+        assert results != []
+
+    @pytest.mark.benchmark(group="logic.Note.search_two_words")
+    def test_two_words(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        benchmark(logic.Note.search, USER_NAME, "word42 word4242")
+
+    @pytest.mark.benchmark(group="logic.Note.search_no_match")
+    def test_no_match(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        results = benchmark(logic.Note.search, USER_NAME, "nothing")
+        assert results == []
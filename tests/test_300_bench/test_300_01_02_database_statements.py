@@ -0,0 +1,114 @@
+from typing import Any, Callable
+
+import pytest
+from pony.orm import db_session
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.database import USER_NAME
+from work_report.database import models
+
+from .data_generator import GeneratedData
+
+# NOTE: "lambda" is the lambda query translated by Pony on every call used before,
+#       and "statement" is the statement built once by the registry
+
+
+def in_session(func: Callable[[], Any]) -> Callable[[], Any]:
+    def wrapper() -> Any:
+        with db_session:
+            return func()
+
+    return wrapper
+
+
+class TestJobSelectOneById:
+    @pytest.mark.benchmark(group="models.Job.select_one_by_id")
+    def test_lambda(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        job_id = fixt_bench_db.job_ids[0]
+        db_job = benchmark(
+            in_session(
+                lambda: models.Job.get(
+                    lambda x: x.id == job_id and x.user.name == USER_NAME
+                )
+            )
+        )
+        assert db_job is not None
+
+    @pytest.mark.benchmark(group="models.Job.select_one_by_id")
+    def test_statement(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        job_id = fixt_bench_db.job_ids[0]
+        db_job = benchmark(
+            in_session(lambda: models.Job.select_one_by_id(USER_NAME, job_id))
+        )
+        assert db_job is not None
+
+
+class TestJobRecordSelectFinishedBetween:
+    @pytest.mark.benchmark(group="models.JobRecord.select_finished_between")
+    def test_lambda(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        range_start, range_end = models.day_range(fixt_bench_db.last_date)
+        db_job_records = benchmark(
+            in_session(
+                lambda: models.JobRecord.select(
+                    lambda j: j.user.name == USER_NAME
+                    and j.start >= range_start
+                    and j.start < range_end
+                    and j.end >= range_start
+                    and j.end < range_end
+                ).order_by(lambda x: (x.start, x.id))[:]
+            )
+        )
+        assert len(db_job_records) > 0
+
+    @pytest.mark.benchmark(group="models.JobRecord.select_finished_between")
+    def test_statement(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        last_date = fixt_bench_db.last_date
+        db_job_records = benchmark(
+            in_session(
+                lambda: models.JobRecord.select_finished_between(
+                    USER_NAME, last_date, last_date
+                )
+            )
+        )
+        assert len(db_job_records) > 0
+
+
+class TestJobRecordSelectOneInProgressByDate:
+    @pytest.mark.benchmark(group="models.JobRecord.select_one_in_progress_by_date")
+    def test_lambda(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        day_start, day_end = models.day_range(fixt_bench_db.last_date)
+        db_job_record = benchmark(
+            in_session(
+                lambda: models.JobRecord.get(
+                    lambda j: j.user.name == USER_NAME
+                    and j.start >= day_start
+                    and j.start < day_end
+                    and j.end is None
+                )
+            )
+        )
+        assert db_job_record is not None
+
+    @pytest.mark.benchmark(group="models.JobRecord.select_one_in_progress_by_date")
+    def test_statement(
+        self, benchmark: BenchmarkFixture, fixt_bench_db: GeneratedData
+    ) -> None:
+        last_date = fixt_bench_db.last_date
+        db_job_record = benchmark(
+            in_session(
+                lambda: models.JobRecord.select_one_in_progress_by_date(
+                    USER_NAME, last_date
+                )
+            )
+        )
+        assert db_job_record is not None
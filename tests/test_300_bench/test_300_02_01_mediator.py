@@ -0,0 +1,132 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Generator
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests import database
+from tests.database import USER_NAME
+from tests.session_state import DictSessionState
+from work_report import fast_path, mediator
+from work_report.database.database import DatabaseSingleton
+from work_report.mediator import Dataset, Mediator
+from work_report.session_storage import SessionStorage
+
+from .data_generator import GeneratedData
+
+
+@pytest.fixture(scope="function", params=[False, True], ids=["orm", "fast_path"])
+def fixt_fast_path(request: pytest.FixtureRequest) -> Generator[None, None, None]:
+    if request.param and database.settings.provider != "sqlite":
+        pytest.skip("Fast path of SQLite")
+    try:
+        fast_path.configure(enabled=request.param)
+        yield
+    finally:
+        fast_path.configure(enabled=False)
+
+
+# NOTE: seconds added to each statement, like a round trip to a networked database
+LATENCY = 0.002
+
+
+@pytest.fixture(scope="function")
+def fixt_latency(monkeypatch: pytest.MonkeyPatch) -> None:
+    exec_sql = DatabaseSingleton._exec_sql
+
+    def _exec_sql(self: DatabaseSingleton, *args: Any, **kwargs: Any) -> Any:
+        time.sleep(LATENCY)
+        return exec_sql(self, *args, **kwargs)
+
+    monkeypatch.setattr(DatabaseSingleton, "_exec_sql", _exec_sql)
+
+
+@pytest.fixture(scope="function")
+def fixt_no_reuse(monkeypatch: pytest.MonkeyPatch) -> None:
+    # NOTE: each round is a rerun of the same session, which would reuse the data loaded first
+    monkeypatch.setattr(mediator.app_settings, "session_data_ttl", None)
+
+
+@pytest.fixture(
+    scope="function", params=[False, True], ids=["sequential", "concurrent"]
+)
+def fixt_load_executor(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> Generator[None, None, None]:
+    if not request.param:
+        yield
+        return
+    if not mediator.db.is_shared_by_threads():
+        pytest.skip("SQLite in memory is not shared by threads")
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        monkeypatch.setattr(mediator, "load_executor", executor)
+        yield
+
+
+class TestMediator:
+    @pytest.mark.benchmark(group="Mediator.__init__ with latency")
+    @pytest.mark.usefixtures("fixt_latency", "fixt_load_executor", "fixt_no_reuse")
+    def test_init_latency(
+        self,
+        benchmark: BenchmarkFixture,
+        fixt_bench_db: GeneratedData,
+        fixt_session_state: DictSessionState,
+    ) -> None:
+        storage = SessionStorage(state=fixt_session_state)
+        storage.set_state(storage.key_user.name, USER_NAME)
+        storage.set_state(storage.key_date_selection.input, fixt_bench_db.last_date)
+
+        benchmark(Mediator, storage=storage)
+        assert storage.get_job_record_in_progress() is not None
+
+    @pytest.mark.benchmark(group="Mediator.__init__ with latency")
+    @pytest.mark.usefixtures("fixt_latency")
+    def test_init_latency_reused(
+        self,
+        benchmark: BenchmarkFixture,
+        fixt_bench_db: GeneratedData,
+        fixt_session_state: DictSessionState,
+    ) -> None:
+        storage = SessionStorage(state=fixt_session_state)
+        storage.set_state(storage.key_user.name, USER_NAME)
+        storage.set_state(storage.key_date_selection.input, fixt_bench_db.last_date)
+        Mediator(storage=storage)
+
+        benchmark(Mediator, storage=storage)
+        assert storage.get_job_record_in_progress() is not None
+
+    @pytest.mark.benchmark(group="Mediator.__init__ of the timer only layout")
+    @pytest.mark.usefixtures("fixt_no_reuse")
+    def test_init_timer_only(
+        self,
+        benchmark: BenchmarkFixture,
+        fixt_bench_db: GeneratedData,
+        fixt_session_state: DictSessionState,
+    ) -> None:
+        storage = SessionStorage(state=fixt_session_state)
+        storage.set_state(storage.key_user.name, USER_NAME)
+        storage.set_state(storage.key_date_selection.input, fixt_bench_db.last_date)
+
+        benchmark(
+            Mediator,
+            storage=storage,
+            datasets=frozenset({Dataset.jobs, Dataset.job_record_in_progress}),
+        )
+        assert storage.get_job_record_in_progress() is not None
+        assert storage.get_job_records() == []
+
+    @pytest.mark.benchmark(group="Mediator.__init__")
+    @pytest.mark.usefixtures("fixt_fast_path", "fixt_no_reuse")
+    def test_init(
+        self,
+        benchmark: BenchmarkFixture,
+        fixt_bench_db: GeneratedData,
+        fixt_session_state: DictSessionState,
+    ) -> None:
+        storage = SessionStorage(state=fixt_session_state)
+        storage.set_state(storage.key_user.name, USER_NAME)
+        storage.set_state(storage.key_date_selection.input, fixt_bench_db.last_date)
+
+        benchmark(Mediator, storage=storage)
+        assert storage.get_job_record_in_progress() is not None
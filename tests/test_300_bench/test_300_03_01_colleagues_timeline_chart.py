@@ -0,0 +1,52 @@
+from datetime import time
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.database import USER_NAME
+from tests.session_state import DictSessionState
+from work_report.colleagues.timeline_chart import build_figure, get_figure
+from work_report.mediator import Mediator
+from work_report.session_storage import SessionStorage
+
+from .data_generator import GeneratedData
+
+
+class TestTimelineChart:
+    @pytest.mark.benchmark(group="timeline_chart.build_figure")
+    def test_build_figure(
+        self,
+        benchmark: BenchmarkFixture,
+        fixt_bench_db: GeneratedData,
+        fixt_session_state: DictSessionState,
+    ) -> None:
+        storage = SessionStorage(state=fixt_session_state)
+        storage.set_state(storage.key_user.name, USER_NAME)
+        storage.set_state(storage.key_date_selection.input, fixt_bench_db.last_date)
+        storage.set_state(
+            storage.key_working_hours_schedule.slider, (time(9, 0), time(18, 0))
+        )
+        Mediator(storage=storage)
+
+        fig = benchmark(build_figure, storage)
+        assert fig is not None
+
+    @pytest.mark.benchmark(group="timeline_chart.get_figure of a past date")
+    def test_get_figure(
+        self,
+        benchmark: BenchmarkFixture,
+        fixt_bench_db: GeneratedData,
+        fixt_session_state: DictSessionState,
+    ) -> None:
+        storage = SessionStorage(state=fixt_session_state)
+        storage.set_state(storage.key_user.name, USER_NAME)
+        storage.set_state(storage.key_date_selection.input, fixt_bench_db.first_date)
+        storage.set_state(
+            storage.key_working_hours_schedule.slider, (time(9, 0), time(18, 0))
+        )
+        Mediator(storage=storage)
+        fig = get_figure(storage)
+
+        # NOTE: the figure of the first rerun is reused by the others
+        assert benchmark(get_figure, storage) is fig
+        assert fig is not None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Mapping
+
+from streamlit.scriptrunner import get_script_run_ctx
+from streamlit.server.server import Server
+
+from .config import AppSettings
+
+
+class AuthenticationError(Exception):
+    pass
+
+
+def get_request_headers() -> Mapping[str, str] | None:
+    """Get the headers of the request opening the websocket of the current session.
+
+    Returns:
+        Mapping[str, str] | None: Headers. None if not run by `streamlit run`.
+    """
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    # NOTE: streamlit 1.10 has no public API for the headers
+    session_info = (
+        Server.get_current()._get_session_info(  # pylint: disable=protected-access
+            ctx.session_id
+        )
+    )
+    if session_info is None:
+        return None
+    return session_info.ws.request.headers
+
+
+def get_user_name(settings: AppSettings, headers: Mapping[str, str] | None) -> str:
+    """Get the user of the session.
+
+    The app is single-user, i.e. always the default user, unless user_header is set.
+    If set, the user is the one authenticated by the reverse proxy and set to the header.
+
+    Args:
+        settings (AppSettings): Settings
+        headers (Mapping[str, str] | None): Headers of the request of the session
+
+    Raises:
+        AuthenticationError: Occurs when the header is set but missing in the request
+
+    Returns:
+        str: User name
+    """
+    if settings.user_header is None:
+        return settings.default_user
+
+    user_name = (headers or {}).get(settings.user_header, "")
+    if not user_name:
+        raise AuthenticationError(
+            f"The request has no user authenticated by the header {settings.user_header}"
+        )
+    return user_name
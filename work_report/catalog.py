@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, List, Tuple, TypeVar
+
+from . import metrics
+from .database.database import DatabaseSingleton
+
+T = TypeVar("T")
+
+
+class Catalog(Generic[T]):
+    """Process-wide cache of reference data of each user, e.g. all jobs.
+
+    - Lists are loaded on the first request, and shared by all sessions of the process.
+    - Lists are dropped by invalidate(), and loaded again on the next request.
+      Call it after the transaction changing the data is committed.
+    - Lists loaded while being invalidated are not cached, so stale data is never kept.
+    - All lists are dropped when the database is bound again.
+    - Lists expire the seconds of ttl after they started to be loaded,
+      so data changed by other processes are seen after that.
+    """
+
+    def __init__(self, name: str, *, ttl: float | None = None) -> None:
+        # NOTE: cache name of metrics
+        self.name = name
+        # NOTE: seconds until lists expire. Never expire if None.
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__provider: Any = None
+        # NOTE: lists with the time when they started to be loaded
+        self.__lists: Dict[str, Tuple[float, List[T]]] = {}
+        # NOTE: incremented on every invalidation of all users and of each user
+        self.__epoch = 0
+        self.__generations: Dict[str, int] = {}
+
+    def get(self, user_name: str, load: Callable[[], List[T]]) -> List[T]:
+        """Get the list of the user, loading it if not cached.
+
+        Args:
+            user_name (str): User name
+            load (Callable[[], List[T]]): Function loading the list from the database
+
+        Returns:
+            List[T]: Copy of the cached list
+        """
+        started = time.monotonic()
+        with self.__lock:
+            self.__check_provider()
+            cached = self.__lists.get(user_name)
+            if cached is not None and self.ttl is not None:
+                if started - cached[0] >= self.ttl:
+                    cached = None
+            generation = self.__get_generation(user_name)
+        metrics.record_cache_request(self.name, cached is not None)
+        if cached is not None:
+            return list(cached[1])
+
+        loaded = load()
+        with self.__lock:
+            self.__check_provider()
+            if self.__get_generation(user_name) == generation:
+                self.__lists[user_name] = (started, loaded)
+        return list(loaded)
+
+    def invalidate(self, user_name: str) -> None:
+        """Drop the list of the user.
+
+        Args:
+            user_name (str): User name
+        """
+        with self.__lock:
+            self.__lists.pop(user_name, None)
+            self.__generations[user_name] = self.__generations.get(user_name, 0) + 1
+
+    def clear(self) -> None:
+        """Drop the lists of all users."""
+        with self.__lock:
+            self.__clear()
+
+    def __check_provider(self) -> None:
+        provider = DatabaseSingleton.get_instance().provider
+        if provider is not self.__provider:
+            self.__provider = provider
+            self.__clear()
+
+    def __get_generation(self, user_name: str) -> Tuple[int, int]:
+        return self.__epoch, self.__generations.get(user_name, 0)
+
+    def __clear(self) -> None:
+        self.__lists.clear()
+        self.__generations.clear()
+        self.__epoch += 1
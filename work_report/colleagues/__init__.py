@@ -8,6 +8,8 @@ from .job_timer import job_timer
 from .language_selection import language_selection
 from .message_area import message_area
 from .note_area import note_area
+from .note_search import note_search
+from .profiling_panel import profiling_panel
 from .timeline_chart import timeline_chart
 from .working_hours_schedule import working_hours_schedule
 
@@ -20,6 +22,8 @@ __all__ = [
     "language_selection",
     "message_area",
     "note_area",
+    "note_search",
+    "profiling_panel",
     "timeline_chart",
     "working_hours_schedule",
 ]
@@ -1,10 +1,51 @@
+import html
+from datetime import datetime, timedelta
+from string import Template
+from typing import Final
+
+from streamlit.components import v1 as components
 from streamlit.delta_generator import DeltaGenerator
 
 from ..mediator import Mediator
 from ..session_storage import SessionStorage
 
+# NOTE: the elapsed time is counted up by the browser, so it ticks without reruns.
+#       It starts from the elapsed time on the server to ignore the clock of the client.
+ELAPSED_TIMER_HTML: Final[Template] = Template("""
+<div style="font-family: sans-serif; font-size: 14px;">
+  $label: <span id="elapsed" style="font-variant-numeric: tabular-nums;"></span>
+</div>
+<script>
+  const origin = Date.now() - $elapsed_ms;
+  const pad = (value) => String(value).padStart(2, "0");
+  const tick = () => {
+    const seconds = Math.floor((Date.now() - origin) / 1000);
+    document.getElementById("elapsed").textContent =
+      `$${Math.floor(seconds / 3600)}:$${pad(Math.floor(seconds / 60) % 60)}:$${pad(seconds % 60)}`;
+  };
+  tick();
+  setInterval(tick, 1000);
+</script>
+""")
+ELAPSED_TIMER_HEIGHT: Final[int] = 30
+
+
+def build_elapsed_timer_html(label: str, elapsed: timedelta) -> str:
+    """Build the HTML of the elapsed time ticking every second.
+
+    Args:
+        label (str): Label
+        elapsed (timedelta): Elapsed time on rendering
+
+    Returns:
+        str: HTML
+    """
+    return ELAPSED_TIMER_HTML.substitute(
+        label=html.escape(label),
+        elapsed_ms=max(int(elapsed.total_seconds() * 1000), 0),
+    )
+
 
-# TODO: 現在の実行状況も確認できると良い
 def job_timer(
     gen: DeltaGenerator,
     storage: SessionStorage,
@@ -29,3 +70,14 @@ def job_timer(
         disabled=storage.get_state(storage.key_job_timer.button_stop_disabled),
         on_click=mediator.click_stop_job,
     )
+
+    job_record_in_progress = storage.get_job_record_in_progress()
+    if job_record_in_progress is not None:
+        with gen:
+            components.html(
+                build_elapsed_timer_html(
+                    storage.get_language().job_timer_elapsed,
+                    datetime.now() - job_record_in_progress.start,
+                ),
+                height=ELAPSED_TIMER_HEIGHT,
+            )
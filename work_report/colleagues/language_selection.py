@@ -7,9 +7,12 @@ def language_selection(
     gen: DeltaGenerator,
     storage: SessionStorage,
 ) -> None:
+    # NOTE: languages are listed by their names, and built only when selected
+    codes = storage.get_language_codes()
     gen.selectbox(
         storage.get_language().language_selection_selectbox,
         key=storage.key_language_selection.selectbox,
-        options=storage.get_languages(),
-        index=storage.get_languages().index(storage.get_language()),
+        options=codes,
+        index=codes.index(storage.get_language_code()),
+        format_func=storage.get_language_name,
     )
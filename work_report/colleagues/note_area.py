@@ -14,11 +14,26 @@ def note_area(
     if note is not None and note.content is not None:
         content = note.content
 
+    if note is not None and note.truncated:
+        gen.text(f"{content}...")
+        gen.button(
+            storage.get_language().note_area_button_expand,
+            key=storage.key_note_area.button_expand,
+            on_click=mediator.click_expand_note,
+        )
+        return
+
+    # NOTE: the content is seeded to the session state by the mediator, not passed as the value.
+    #       Otherwise the widget is recreated with the saved content when a debounced write lands.
     gen.text_area(
         storage.get_language().note_area_text_area,
         key=storage.key_note_area.text_area,
-        value=content,
         height=300,
+        on_change=mediator.change_note,
+    )
+    gen.checkbox(
+        storage.get_language().note_area_checkbox_autosave,
+        key=storage.key_note_area.checkbox_autosave,
     )
     gen.button(
         storage.get_language().note_area_button,
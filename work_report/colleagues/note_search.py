@@ -0,0 +1,23 @@
+from streamlit.delta_generator import DeltaGenerator
+
+from ..mediator import Mediator
+from ..session_storage import SessionStorage
+
+
+def note_search(
+    gen: DeltaGenerator,
+    storage: SessionStorage,
+    mediator: Mediator,
+) -> None:
+    gen.text_input(
+        storage.get_language().note_search_text_input,
+        key=storage.key_note_search.input,
+    )
+    for i, result in enumerate(storage.get_note_search_results()):
+        gen.button(
+            str(result.date),
+            key=f"{storage.key_note_search.button}_{i}",
+            on_click=mediator.click_note_search_result,
+            args=(result.date,),
+        )
+        gen.caption(result.snippet)
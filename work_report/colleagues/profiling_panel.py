@@ -0,0 +1,29 @@
+import pandas as pd
+from streamlit.delta_generator import DeltaGenerator
+
+from ..profiling import Profiler
+from ..session_storage import SessionStorage
+
+
+def profiling_panel(
+    gen: DeltaGenerator,
+    storage: SessionStorage,
+    profiler: Profiler,
+) -> None:
+    summary = profiler.summarize()
+    expander = gen.expander(storage.get_language().profiling_panel_expander)
+
+    st_metrics = expander.columns(3)
+    st_metrics[0].metric("ms", round(summary["elapsed"] * 1000, 1))
+    st_metrics[1].metric("SQL", summary["sql_count"])
+    st_metrics[2].metric("SQL ms", round(summary["sql_time"] * 1000, 1))
+
+    records = pd.DataFrame(summary["phases"])
+    if not records.empty:
+        records["name"] = [
+            "  " * depth + name
+            for name, depth in zip(records["name"], records["depth"])
+        ]
+        records["elapsed"] = records["elapsed"] * 1000
+        records["sql_time"] = records["sql_time"] * 1000
+        expander.dataframe(records.drop(columns="depth"))
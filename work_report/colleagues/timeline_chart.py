@@ -1,8 +1,9 @@
 from datetime import datetime, time
-from typing import Tuple, TypedDict
+from typing import Any, Tuple, TypedDict
 
 import pandas as pd
 from plotly import express as px
+from plotly.graph_objects import Figure
 from streamlit.delta_generator import DeltaGenerator
 
 from ..session_storage import SessionStorage
@@ -16,11 +17,15 @@ class FigDict(TypedDict):
     status: str
 
 
-def timeline_chart(
-    gen: DeltaGenerator,
-    storage: SessionStorage,
-) -> None:
+def build_figure(storage: SessionStorage) -> Figure | None:
+    """Build the timeline figure of job records in the storage.
+
+    Args:
+        storage (SessionStorage): Storage
 
+    Returns:
+        Figure | None: None if there is no job record.
+    """
     job_records = storage.get_job_records()
     job_record_in_progress = storage.get_job_record_in_progress()
 
@@ -42,13 +47,16 @@ def timeline_chart(
             job_id=job_record_in_progress.job.id,
             job=str(job_record_in_progress.job),
             start=job_record_in_progress.start,
+            # NOTE: the bar ends at the rerun, unlike the job timer ticking in the browser.
+            #       The chart is drawn by Streamlit's own Plotly, which a component cannot update,
+            #       so get_figure() rebuilds it on every rerun while the job is in progress.
             end=datetime.now(),
             status="InProgress",
         )
         dict_job_records.append(dict_job_record)
 
     if dict_job_records == []:
-        return
+        return None
 
     df = pd.DataFrame(dict_job_records)
 
@@ -62,15 +70,60 @@ def timeline_chart(
     fig.update_yaxes(autorange="reversed")
 
     selected_date = storage.get_selected_date()
-    scheduled_working_time: Tuple[time, time] = storage.get_state(
+    scheduled_working_time: Tuple[time, time] | None = storage.get_state(
         storage.key_working_hours_schedule.slider
     )
+    # NOTE: not set if working_hours_schedule is not rendered
+    if scheduled_working_time is None:
+        return fig
+
     scheduled_working_datetime = (
         datetime.combine(selected_date, scheduled_working_time[0]),
         datetime.combine(selected_date, scheduled_working_time[1]),
     )
     fig.add_vline(x=scheduled_working_datetime[0])
     fig.add_vline(x=scheduled_working_datetime[1])
+    return fig
+
+
+def get_figure(storage: SessionStorage) -> Figure | None:
+    """Get the timeline figure built by a previous rerun, or build it again.
+
+    The figure is built again if the data drawn in it have changed,
+    or while a job record is in progress, whose bar ends at the current time.
+
+    Args:
+        storage (SessionStorage): Storage
+
+    Returns:
+        Figure | None: None if there is no job record.
+    """
+    job_record_in_progress = storage.get_job_record_in_progress()
+    inputs = (
+        storage.get_job_records(),
+        job_record_in_progress,
+        storage.get_selected_date(),
+        storage.get_state(storage.key_working_hours_schedule.slider),
+    )
+    built: Tuple[Any, Figure | None] | None = storage.get_state(
+        storage.key_timeline_chart.figure
+    )
+    if job_record_in_progress is None and built is not None and built[0] == inputs:
+        return built[1]
+
+    fig = build_figure(storage)
+    storage.set_state(storage.key_timeline_chart.figure, (inputs, fig))
+    return fig
+
+
+def timeline_chart(
+    gen: DeltaGenerator,
+    storage: SessionStorage,
+) -> None:
+    fig = get_figure(storage)
+    if fig is None:
+        return
+
     gen.plotly_chart(
         fig, key=storage.key_timeline_chart.chart, use_container_width=True
     )
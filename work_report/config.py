@@ -8,7 +8,81 @@ class DatabaseSettings(BaseSettings):
     provider: str = "sqlite"
     filename: str = "../sqlite.db"
     create_db: bool = True
+    # NOTE: connection to PostgreSQL, used if the provider is "postgres"
+    pg_host: str = "localhost"
+    pg_port: int = 5432
+    pg_user: str = "postgres"
+    pg_password: str = ""
+    pg_database: str = "work_report"
+    # NOTE: milliseconds until statements are cancelled by the server. Not limited if None.
+    statement_timeout: int | None = 5000
+    # NOTE: connections shared by all sessions except SQLite. One connection per thread if None.
+    pool_size: int | None = 10
+    pool_timeout: float = 10.0
     create_tables: bool = True
+    # NOTE: SQLite file of each user formatted with the user name, e.g. "shards/{shard}.db".
+    #       Relative to the directory of filename, which is still used outside of user sessions.
+    #       Not sharded if None.
+    shard_filename: str | None = None
+    # NOTE: max number of shards whose connections are kept open
+    max_shards: int = 64
+    # NOTE: statements slower than the seconds, and db_sessions executing more statements are logged
+    slow_query_threshold: float | None = 0.1
+    session_statement_threshold: int | None = 50
+    # NOTE: write queue executing database writes on a background thread
+    write_queue_max_retries: int = 5
+    write_queue_backoff: float = 0.05
+    write_queue_wait_timeout: float = 1.0
+    # NOTE: notes longer than the threshold are compressed unless the codec is None
+    note_codec: str | None = "zlib"
+    note_compression_threshold: int = 4096
+    note_preview_length: int = 1000
+    # NOTE: seconds until jobs and categories cached in the process are loaded again,
+    #       so changes by other processes, e.g. other workers, are seen. Never expire if None.
+    catalog_ttl: float | None = 30.0
+    # NOTE: read jobs, job records and notes of each rerun with raw SQL instead of the ORM.
+    #       Used only if the provider is "sqlite".
+    fast_path: bool = False
 
     def dict_bind(self) -> Dict[str, Any]:
-        return self.dict(include={"provider", "filename", "create_db"})
+        match self.provider:
+            case "postgres":
+                bind: Dict[str, Any] = {
+                    "provider": self.provider,
+                    "host": self.pg_host,
+                    "port": self.pg_port,
+                    "user": self.pg_user,
+                    "password": self.pg_password,
+                    "database": self.pg_database,
+                    "client_encoding": "UTF8",
+                }
+                if self.statement_timeout is not None:
+                    bind["options"] = f"-c statement_timeout={self.statement_timeout}"
+                return bind
+            case _:
+                return self.dict(include={"provider", "filename", "create_db"})
+
+
+class AppSettings(BaseSettings):
+    # NOTE: seconds to wait after the last edit before the note is saved automatically
+    note_autosave_delay: float = 2.0
+    # NOTE: measure each rerun, show the profiling panel and log the summary
+    profiling: bool = False
+    # NOTE: serve metrics at http://metrics_host:metrics_port/metrics if the port is set
+    metrics_port: int | None = None
+    metrics_host: str = "127.0.0.1"
+    # NOTE: user whose data is shown if user_header is None, i.e. the app is single-user
+    default_user: str = "default"
+    # NOTE: request header of the user authenticated by a reverse proxy, e.g. "X-Forwarded-User".
+    #       The proxy must overwrite the header sent by clients. Single-user if None.
+    user_header: str | None = None
+    # NOTE: threads loading the data of each rerun concurrently, each with its own db_session.
+    #       Worth it on networked databases, e.g. PostgreSQL. Loaded one by one if None,
+    #       or the database is SQLite in memory.
+    load_workers: int | None = None
+    # NOTE: seconds for which data loaded on a rerun are reused by later reruns of the session,
+    #       unless their arguments are changed or the session writes them. Loaded on every rerun if None.
+    #       Writes of other sessions are seen after this at the latest.
+    session_data_ttl: float | None = 30.0
+    # NOTE: JSON file of work_report.layout.Layout placing the colleagues. The default layout if None.
+    layout_file: str | None = None
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import argparse
+import os
+from contextlib import nullcontext
+from datetime import date, datetime
+from typing import Final, List, Tuple
+
+from pony.orm import Database, db_session
+
+from ..config import DatabaseSettings
+from .database import DatabaseSingleton
+
+db: Database = DatabaseSingleton.get_instance()
+
+DATETIME_FORMAT: Final[str] = "%Y-%m-%d %H:%M:%S.%f"
+COLUMNS: Final[str] = 'id, user_name, job, start, "end"'
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def get_schema(year: int) -> str:
+    return f"archive_{year}"
+
+
+def get_main_filename() -> str | None:
+    """Get the file of the main database of the current connection.
+
+    Returns:
+        str | None: None if the database is not a SQLite file
+    """
+    if db.provider.dialect != "SQLite":
+        return None
+    filename: str = db.select("file FROM pragma_database_list WHERE name = 'main'")[0]
+    # NOTE: in-memory databases have no file name
+    return filename or None
+
+
+def get_archive_filename(main_filename: str, year: int) -> str:
+    """Get the archive file of the year, placed next to the main database file.
+
+    Args:
+        main_filename (str): File of the main database, e.g. "sqlite.db"
+        year (int): Year
+
+    Returns:
+        str: e.g. "sqlite.2021.db"
+    """
+    stem, extension = os.path.splitext(main_filename)
+    return f"{stem}.{year}{extension}"
+
+
+def attach(year: int, *, create: bool = False) -> str | None:
+    """Attach the archive of the year to the current connection unless already attached.
+
+    Must be used inside db_session.
+
+    Args:
+        year (int): Year
+        create (bool, optional): Create the archive if not exists
+
+    Returns:
+        str | None: Schema name of the archive. None if there is no archive of the year.
+    """
+    main_filename = get_main_filename()
+    if main_filename is None:
+        return None
+
+    schema = get_schema(year)
+    attached = set(db.select("name FROM pragma_database_list"))
+    if schema in attached:
+        return schema
+
+    filename = get_archive_filename(main_filename, year)
+    if not create and not os.path.exists(filename):
+        return None
+
+    # NOTE: the schema name is made of an integer, and cannot be a parameter
+    db.execute(
+        f"ATTACH DATABASE $filename AS {schema}",
+        globals={},
+        locals={"filename": filename},
+    )
+    db.execute(
+        f"CREATE TABLE IF NOT EXISTS {schema}.job_records ("
+        "id INTEGER PRIMARY KEY, user_name TEXT NOT NULL, job INTEGER NOT NULL, "
+        'start DATETIME NOT NULL, "end" DATETIME NOT NULL)'
+    )
+    db.execute(
+        f"CREATE INDEX IF NOT EXISTS {schema}.idx_job_records__user_name_start "
+        "ON job_records (user_name, start)"
+    )
+    return schema
+
+
+def select_finished(
+    year: int, user_name: str, start: datetime, end: datetime
+) -> List[Tuple[int, int, datetime, datetime]]:
+    """Select archived job records of the user finished in the range.
+
+    Must be used inside db_session.
+
+    Args:
+        year (int): Year of the archive
+        user_name (str): User name
+        start (datetime): Job records starting at or after this are selected
+        end (datetime): Job records ending before this are selected
+
+    Returns:
+        List[Tuple[int, int, datetime, datetime]]: Id, job id, start and end.
+            Empty if there is no archive of the year.
+    """
+    schema = attach(year)
+    if schema is None:
+        return []
+
+    rows = db.select(
+        f'SELECT id, job, start, "end" FROM {schema}.job_records '
+        "WHERE user_name = $user_name AND start >= $range_start "
+        'AND "end" < $range_end',
+        globals={},
+        locals={
+            "user_name": user_name,
+            "range_start": start.strftime(DATETIME_FORMAT),
+            "range_end": end.strftime(DATETIME_FORMAT),
+        },
+    )
+    return [
+        (row[0], row[1], datetime.fromisoformat(row[2]), datetime.fromisoformat(row[3]))
+        for row in rows
+    ]
+
+
+@db_session(serializable=True, strict=True)  # type: ignore[misc]
+def archive_year(year: int) -> int:
+    """Move finished job records of the closed year into the archive of the year.
+
+    Archived job records can be selected, but cannot be revised any more.
+    Only SQLite files can be archived. The archive of each shard is placed next to the shard.
+
+    Args:
+        year (int): Year before the current year
+
+    Raises:
+        ArchiveError: Occurs when the year is not closed, or the database is not a SQLite file
+
+    Returns:
+        int: Number of archived job records
+    """
+    if year >= date.today().year:
+        raise ArchiveError(f"{year} is not closed yet")
+    schema = attach(year, create=True)
+    if schema is None:
+        raise ArchiveError("Only SQLite files can be archived")
+
+    year_range = {
+        "year_start": datetime(year, 1, 1).strftime(DATETIME_FORMAT),
+        "year_end": datetime(year + 1, 1, 1).strftime(DATETIME_FORMAT),
+    }
+    condition = 'start >= $year_start AND start < $year_end AND "end" IS NOT NULL'
+    count: int = db.select(
+        f"COUNT(*) FROM main.job_records WHERE {condition}",
+        globals={},
+        locals=year_range,
+    )[0]
+    db.execute(
+        f"INSERT INTO {schema}.job_records ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM main.job_records WHERE {condition}",
+        globals={},
+        locals=year_range,
+    )
+    db.execute(
+        f"DELETE FROM main.job_records WHERE {condition}",
+        globals={},
+        locals=year_range,
+    )
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move finished job records of a closed year into its archive"
+    )
+    parser.add_argument("year", type=int, help="Year before the current year")
+    parser.add_argument(
+        "--user", help="Archive the shard of the user if the database is sharded"
+    )
+    args = parser.parse_args()
+
+    settings = DatabaseSettings()
+    db.bind(**settings.dict_bind())
+    db.generate_mapping(create_tables=settings.create_tables)
+    if settings.shard_filename is not None:
+        db.use_sharding(settings.shard_filename, max_shards=settings.max_shards)
+    with db.route(args.user) if args.user is not None else nullcontext():
+        print(archive_year(args.year))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import zlib
+from typing import Final, List
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+ZLIB: Final[str] = "zlib"
+ZSTD: Final[str] = "zstd"
+
+
+class CompressionError(Exception):
+    pass
+
+
+def available_codecs() -> List[str]:
+    """List codecs usable in this environment.
+
+    zstd is available only when the optional zstandard package is installed.
+
+    Returns:
+        List[str]: Codec names
+    """
+    if zstandard is None:
+        return [ZLIB]
+    return [ZLIB, ZSTD]
+
+
+def compress(content: str, codec: str) -> bytes:
+    """Compress text with the codec.
+
+    Args:
+        content (str): Text
+        codec (str): Codec name
+
+    Raises:
+        CompressionError: Occurs when the codec is not available
+
+    Returns:
+        bytes: Compressed UTF-8 text
+    """
+    data = content.encode("utf-8")
+    match codec:
+        case "zlib":
+            return zlib.compress(data)
+        case "zstd" if zstandard is not None:
+            return bytes(zstandard.ZstdCompressor().compress(data))
+        case _:
+            raise CompressionError(f"Codec({codec}) is not available.")
+
+
+def decompress(data: bytes, codec: str) -> str:
+    """Decompress text compressed by compress().
+
+    Args:
+        data (bytes): Compressed UTF-8 text
+        codec (str): Codec name
+
+    Raises:
+        CompressionError: Occurs when the codec is not available
+
+    Returns:
+        str: Text
+    """
+    match codec:
+        case "zlib":
+            return zlib.decompress(data).decode("utf-8")
+        case "zstd" if zstandard is not None:
+            return bytes(zstandard.ZstdDecompressor().decompress(data)).decode("utf-8")
+        case _:
+            raise CompressionError(f"Codec({codec}) is not available.")
@@ -1,14 +1,60 @@
 from __future__ import annotations
 
-from pony.orm import Database
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Final,
+    Iterator,
+    List,
+    NamedTuple,
+    ParamSpec,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import quote
+
+from pony.orm import Database, db_session
+from pony.orm.dbproviders.sqlite import SQLitePool
+
+from .. import metrics
+from .pool import ShardedPool, SharedPool
+
+P = ParamSpec("P")
+R = TypeVar("R")
+F = TypeVar("F", bound=Callable[[Database, Any], None])
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE: Final[Tuple[str, ...]] = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
 
 
 class InstantiationError(Exception):
     pass
 
 
+class QueryCounters(NamedTuple):
+    statements: int
+    slow_statements: int
+    sessions: int
+    max_session_statements: int
+    # NOTE: sessions which executed more statements than the threshold (e.g. N+1 queries)
+    chatty_sessions: int
+
+
 class DatabaseSingleton(Database):  # type: ignore[misc]
-    """Singleton inheriting from pony.orm.Database"""
+    """Singleton inheriting from pony.orm.Database
+
+    Every executed statement is counted per db_session and in the metrics registry,
+    and slow statements are logged with their parameters and query plan.
+    Query plans are explained only on SQLite and PostgreSQL.
+    """
 
     def __new__(cls) -> DatabaseSingleton:
         if hasattr(cls, "_singleton"):
@@ -19,9 +65,284 @@ class DatabaseSingleton(Database):  # type: ignore[misc]
 
         return cls._singleton
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.slow_query_threshold: float | None = None
+        self.session_statement_threshold: int | None = None
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__counters = QueryCounters(0, 0, 0, 0, 0)
+        self.__on_create_tables_funcs: List[
+            Tuple[Callable[[Database, Any], None], str | None]
+        ] = []
+
     @classmethod
     def get_instance(cls) -> DatabaseSingleton:
         return cls._singleton
 
+    def configure_query_log(
+        self,
+        *,
+        slow_query_threshold: float | None,
+        session_statement_threshold: int | None,
+    ) -> None:
+        """Configure the thresholds of the query log.
+
+        Args:
+            slow_query_threshold (float | None): Statements taking seconds longer than this are logged.
+                Not logged if None.
+            session_statement_threshold (int | None): db_sessions executing statements more than this are logged.
+                Not logged if None.
+        """
+        self.slow_query_threshold = slow_query_threshold
+        self.session_statement_threshold = session_statement_threshold
+
+    def on_create_tables(self, provider: str | None = None) -> Callable[[F], F]:
+        """Register a function creating database objects which Pony cannot define, e.g. partial indexes.
+
+        Like on_connect(), the function is called with the database and the connection,
+        but after the tables are created by generate_mapping(create_tables=True)
+        and in the file of each shard.
+        The function must not fail if the objects already exist.
+
+        Args:
+            provider (str | None, optional): Called only for the provider, e.g. "sqlite".
+                Called for all providers if None.
+
+        Returns:
+            Callable[[F], F]: Decorator
+        """
+
+        def decorator(func: F) -> F:
+            self.__on_create_tables_funcs.append((func, provider))
+            return func
+
+        return decorator
+
+    def create_tables(self, check_tables: bool = False) -> None:
+        super().create_tables(check_tables)
+        with db_session(ddl=True):
+            self.__call_on_create_tables(self.get_connection())
+
+    def __call_on_create_tables(self, connection: Any) -> None:
+        for func, provider in self.__on_create_tables_funcs:
+            if provider is None or provider == self.provider_name:
+                func(self, connection)
+                connection.commit()
+
+    def use_shared_pool(self, *, size: int, timeout: float) -> None:
+        """Replace the connection pool of the bound provider with SharedPool.
+
+        Args:
+            size (int): Max number of connections
+            timeout (float): Seconds to wait for a connection returned to the pool
+        """
+        pool = self.provider.pool
+        self.provider.pool = SharedPool(
+            pool.dbapi_module, pool.args, pool.kwargs, size=size, timeout=timeout
+        )
+        pool.disconnect()
+
+    def use_sharding(self, filename: str, *, max_shards: int) -> None:
+        """Replace the connection pool of the bound SQLite provider with ShardedPool.
+
+        Tables are created in the file of each shard when it is opened first.
+
+        Args:
+            filename (str): File name of shards formatted with the shard name, e.g. "shards/{shard}.db".
+                Relative to the directory of the default file.
+            max_shards (int): Max number of shards whose connections are kept open
+        """
+        pool = self.provider.pool
+        directory = os.path.dirname(pool.filename)
+
+        def get_filename(shard: str) -> str:
+            # NOTE: the shard name can be user input, so it must not be a path
+            return os.path.join(directory, filename.format(shard=quote(shard, safe="")))
+
+        def open_shard(shard_filename: str) -> Any:
+            os.makedirs(os.path.dirname(shard_filename) or ".", exist_ok=True)
+            shard_pool = SQLitePool(
+                False, shard_filename, True, check_same_thread=False, **pool.kwargs
+            )
+            shard_pool._connect()  # pylint: disable=protected-access
+            connection = shard_pool.con
+            if self.schema is not None:
+                self.schema.create_tables(self.provider, connection)
+                self.__call_on_create_tables(connection)
+            return connection
+
+        self.provider.pool = ShardedPool(
+            open_shard, get_filename, pool.filename, max_shards=max_shards
+        )
+        pool.disconnect()
+
+    @contextmanager
+    def route(self, shard: str) -> Iterator[None]:
+        """Route db_sessions started inside the with statement on this thread to the shard.
+
+        Does nothing unless use_sharding() is called.
+
+        Args:
+            shard (str): Shard name
+        """
+        pool = self.provider.pool if self.provider is not None else None
+        if not isinstance(pool, ShardedPool):
+            yield
+            return
+        with pool.route(shard):
+            yield
+
+    def is_shared_by_threads(self) -> bool:
+        """Check whether db_sessions on different threads see the same data.
+
+        Pony's SQLite pool connects each thread on its own, so a private in-memory
+        database (":memory:") is a different database on each thread.
+
+        Returns:
+            bool: False if not bound, or bound to SQLite in memory not shared
+        """
+        if self.provider is None:
+            return False
+        pool = self.provider.pool
+        if isinstance(pool, SQLitePool):
+            return bool(pool.is_shared_memory_db or pool.filename != ":memory:")
+        return True
+
+    def get_query_counters(self) -> QueryCounters:
+        """Get the counters aggregated over all threads since the last reset.
+
+        Returns:
+            QueryCounters: Counters
+        """
+        with self.__lock:
+            return self.__counters
+
+    def reset_query_counters(self) -> None:
+        with self.__lock:
+            self.__counters = QueryCounters(0, 0, 0, 0, 0)
+
+    def get_session_statement_count(self) -> int:
+        """Count statements executed in the current db_session of this thread.
+
+        Returns:
+            int: 0 if no statement has been executed yet
+        """
+        return int(getattr(self.__local, "count", 0))
+
+    def _exec_sql(
+        self,
+        sql: str,
+        arguments: Any = None,
+        returning_id: bool = False,
+        start_transaction: bool = False,
+    ) -> Any:
+        cache = self._get_cache()
+        start = time.perf_counter()
+        result = super()._exec_sql(sql, arguments, returning_id, start_transaction)
+        elapsed = time.perf_counter() - start
+
+        slow = (
+            self.slow_query_threshold is not None
+            and elapsed >= self.slow_query_threshold
+        )
+        self.__count(cache.num, sql, slow)
+        metrics.statements.inc()
+        if slow:
+            metrics.slow_statements.inc()
+            self.__log_slow_query(cache.connection, sql, arguments, elapsed)
+        return result
+
+    def __count(self, session_number: int, sql: str, slow: bool) -> None:
+        # NOTE: each db_session has its own cache numbered uniquely
+        new_session = getattr(self.__local, "session_number", None) != session_number
+        if new_session:
+            self.__local.session_number = session_number
+            self.__local.count = 0
+        self.__local.count += 1
+        count: int = self.__local.count
+
+        chatty = count - 1 == self.session_statement_threshold
+        if chatty:
+            logger.warning(
+                "db_session executed more than %d statements. Last statement: %s",
+                self.session_statement_threshold,
+                sql,
+            )
+
+        with self.__lock:
+            counters = self.__counters
+            self.__counters = QueryCounters(
+                statements=counters.statements + 1,
+                slow_statements=counters.slow_statements + slow,
+                sessions=counters.sessions + new_session,
+                max_session_statements=max(counters.max_session_statements, count),
+                chatty_sessions=counters.chatty_sessions + chatty,
+            )
+
+    def __log_slow_query(
+        self, connection: Any, sql: str, arguments: Any, elapsed: float
+    ) -> None:
+        plan = None
+        if connection is not None and sql.lstrip().upper().startswith(EXPLAINABLE):
+            try:
+                plan = self.__explain(connection, sql, arguments)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to explain the slow statement", exc_info=True)
+
+        logger.warning(
+            "Slow statement took %.3f seconds: %s arguments=%r plan=%r",
+            elapsed,
+            sql,
+            arguments,
+            plan,
+        )
+
+    def __explain(self, connection: Any, sql: str, arguments: Any) -> List[str] | None:
+        cursor = connection.cursor()
+        match self.provider.dialect:
+            case "SQLite":
+                cursor.execute("EXPLAIN QUERY PLAN " + sql, arguments or ())
+                return [row[-1] for row in cursor.fetchall()]
+            case "PostgreSQL":
+                # NOTE: a failed statement would abort the transaction of the session
+                in_transaction = not connection.autocommit
+                if in_transaction:
+                    cursor.execute("SAVEPOINT explain_slow_statement")
+                try:
+                    cursor.execute("EXPLAIN " + sql, arguments)
+                    return [row[0] for row in cursor.fetchall()]
+                except Exception:
+                    if in_transaction:
+                        cursor.execute("ROLLBACK TO SAVEPOINT explain_slow_statement")
+                    raise
+                finally:
+                    if in_transaction:
+                        cursor.execute("RELEASE SAVEPOINT explain_slow_statement")
+            case _:
+                return None
+
+
+def routed(func: Callable[P, R]) -> Callable[P, R]:
+    """Decorate a function taking user_name to run it on the shard of the user.
+
+    Must be applied outside of db_session.
+
+    Args:
+        func (Callable[P, R]): Function having the user_name parameter
+
+    Returns:
+        Callable[P, R]: Decorated function
+    """
+    signature = inspect.signature(inspect.unwrap(func))
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        user_name = signature.bind(*args, **kwargs).arguments["user_name"]
+        with DatabaseSingleton.get_instance().route(user_name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
 
 DatabaseSingleton()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from datetime import date, datetime
+from typing import Dict, List
+
+from pony.orm import db_session
+
+from ..config import DatabaseSettings
+from . import compression, models
+from .database import DatabaseSingleton, routed
+
+
+class MigrationError(Exception):
+    pass
+
+
+def _columns(connection: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in connection.execute(f"PRAGMA table_info({table})")]
+
+
+@routed
+@db_session(serializable=True, strict=True)  # type: ignore[misc]
+def import_single_user_file(
+    filename: str,
+    user_name: str,
+    *,
+    codec: str | None = None,
+    threshold: int = 4096,
+    preview_length: int = 1000,
+) -> None:
+    """Import a SQLite file created before entities had users into the bound database.
+
+    The data is imported into the shard of the user if the database is sharded.
+
+    All categories, jobs, job records and notes of the file are owned by the user.
+    Job ids and job record ids are renumbered.
+
+    Args:
+        filename (str): SQLite file of the single user
+        user_name (str): Owner of the imported data
+        codec (str | None, optional): Codec to compress long notes. Not compressed if None.
+        threshold (int, optional): Notes longer than this are compressed
+        preview_length (int, optional): Notes longer than this get preview
+
+    Raises:
+        MigrationError: Occurs when the file already has users
+    """
+    connection = sqlite3.connect(f"file:{filename}?mode=ro", uri=True)
+    try:
+        if "user_name" in _columns(connection, "categories"):
+            raise MigrationError(f"{filename} already has users")
+
+        models.User.insert_if_not_exists(user_name)
+        for (category_name,) in connection.execute("SELECT name FROM categories"):
+            models.Category.insert(user_name, category_name)
+
+        db_jobs: Dict[int, models.Job] = {}
+        for job_id, job_name, category_name in connection.execute(
+            "SELECT id, name, category FROM jobs ORDER BY id"
+        ):
+            db_jobs[job_id] = models.Job(
+                user=user_name,
+                name=job_name,
+                category=(
+                    None
+                    if category_name is None
+                    else models.Category.select_one_by_name(user_name, category_name)
+                ),
+            )
+
+        for job_id, start, end in connection.execute(
+            'SELECT job, start, "end" FROM job_records ORDER BY id'
+        ):
+            models.JobRecord.insert(
+                db_jobs[job_id],
+                datetime.fromisoformat(start),
+                None if end is None else datetime.fromisoformat(end),
+            )
+
+        # NOTE: notes of old files may lack the columns for compression
+        compressed = "codec" in _columns(connection, "notes")
+        query = (
+            "SELECT date, content, compressed_content, codec FROM notes"
+            if compressed
+            else "SELECT date, content, NULL, NULL FROM notes"
+        )
+        for note_date, content, compressed_content, note_codec in connection.execute(
+            query
+        ):
+            if note_codec is not None:
+                content = compression.decompress(compressed_content, note_codec)
+            models.Note.upsert(
+                user_name,
+                date.fromisoformat(note_date),
+                content or "",
+                codec=codec,
+                threshold=threshold,
+                preview_length=preview_length,
+            )
+    finally:
+        connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import a SQLite file created before entities had users"
+    )
+    parser.add_argument("filename", help="SQLite file of the single user")
+    parser.add_argument("user_name", help="Owner of the imported data")
+    args = parser.parse_args()
+
+    settings = DatabaseSettings()
+    db = DatabaseSingleton.get_instance()
+    db.bind(**settings.dict_bind())
+    db.generate_mapping(create_tables=settings.create_tables)
+    if settings.shard_filename is not None:
+        db.use_sharding(settings.shard_filename, max_shards=settings.max_shards)
+    import_single_user_file(
+        args.filename,
+        args.user_name,
+        codec=settings.note_codec,
+        threshold=settings.note_compression_threshold,
+        preview_length=settings.note_preview_length,
+    )
+
+
+if __name__ == "__main__":
+    main()
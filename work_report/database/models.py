@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import List, TypeAlias, cast
+from datetime import date, datetime, time, timedelta
+from typing import Any, Final, List, NamedTuple, Tuple, TypeAlias, cast
 
 from pony.orm import (
     Database,
@@ -10,11 +10,16 @@ from pony.orm import (
     PrimaryKey,
     Required,
     Set,
+    coalesce,
+    composite_index,
     composite_key,
+    flush,
 )
-from pony.orm.core import CacheIndexError
+from pony.orm.core import CacheIndexError, TransactionIntegrityError
 
+from . import archive, compression
 from .database import DatabaseSingleton
+from .statements import statements
 
 Date: TypeAlias = date
 DateTime: TypeAlias = datetime
@@ -22,142 +27,239 @@ DateTime: TypeAlias = datetime
 db: Database = DatabaseSingleton.get_instance()
 
 
+def day_range(__date: Date) -> Tuple[DateTime, DateTime]:
+    """Get the datetime range of the date.
+
+    Used instead of comparing datetime.date() so that queries are portable among providers
+    and can use indexes on the datetime column.
+
+    Args:
+        __date (date): Date
+
+    Returns:
+        Tuple[datetime, datetime]: The start of the date, and the start of the next date
+    """
+    start = datetime.combine(__date, time.min)
+    return start, start + timedelta(days=1)
+
+
 class CRUDException(Exception):
     pass
 
 
 class DataAlreadyExistsError(CRUDException):
-    def __init__(self, entity: db.Entity) -> None:
+    def __init__(self, entity: object) -> None:
         message = f"{entity} is already exists."
         super().__init__(message)
 
 
+class User(db.Entity):  # type: ignore[misc]
+    _table_ = "users"
+    name = PrimaryKey(str)
+    categories = Set("Category")
+    jobs = Set("Job")
+    job_records = Set("JobRecord")
+    notes = Set("Note")
+
+    @classmethod
+    def insert_if_not_exists(cls, name: str) -> None:
+        """Insert a user to the database if not exists.
+
+        Args:
+            name (str): User name
+        """
+        if cls.get(name=name) is None:
+            cls(name=name)
+
+
+# NOTE: all entities owned by users have the user name as the first column of their keys,
+#       so that queries filtered by user use indexes
 class Category(db.Entity):  # type: ignore[misc]
     _table_ = "categories"
-    name = PrimaryKey(str)
+    user = Required("User", column="user_name")
+    name = Required(str)
     jobs = Set("Job")
+    PrimaryKey(user, name)
 
     @classmethod
-    def insert(cls, name: str) -> None:
+    def insert(cls, user_name: str, name: str) -> None:
         """Insert a category to the database.
 
         Args:
+            user_name (str): User name
             name (str): Category name
 
         Raises:
-            CRUDException: Occurs when instantiate by the same primary keys name within same transaction
+            CRUDException: Occurs when instantiate by the same primary keys within same transaction
         """
         try:
-            cls(name=name)
+            cls(user=user_name, name=name)
         except CacheIndexError as error:
             raise CRUDException from error
 
     @classmethod
-    def select_all(cls) -> List[Category]:
-        """Select all categories from the database.
+    def select_all(cls, user_name: str) -> List[Category]:
+        """Select all categories of the user from the database.
+
+        Args:
+            user_name (str): User name
 
         Returns:
             List[Category]: All categories ordered by category name
         """
         return cast(
             List[Category],
-            cls.select().order_by(lambda x: x.name)[:],
+            cls.select(lambda x: x.user.name == user_name).order_by(lambda x: x.name)[
+                :
+            ],
         )
 
     @classmethod
-    def select_one_by_name(cls, name: str) -> Category | None:
+    def select_one_by_name(cls, user_name: str, name: str) -> Category | None:
         """Select a category by name from the database.
 
         Args:
+            user_name (str): User name
             name (str): Category name
 
         Returns:
             Category | None: Returns None if there is no such object.
         """
-        return cast(Category | None, cls.get(name=name))
+        return cast(Category | None, cls.get(user=user_name, name=name))
 
 
 class Job(db.Entity):  # type: ignore[misc]
     _table_ = "jobs"
     id = PrimaryKey(int, auto=True)
+    user = Required("User", column="user_name")
     name = Required(str)
     category = Optional("Category")
     job_records = Set("JobRecord")
-    composite_key(name, category)
+    composite_key(user, name, category)
+    composite_index(user, category, name)
 
-    # TODO: docstring修正
     @classmethod
-    def insert(cls, name: str, category: Category | None = None) -> None:
+    def insert(
+        cls, user_name: str, name: str, category: Category | None = None
+    ) -> None:
         """Insert a job to the database.
         Establish a relationship between job and category if category is given as argument.
 
-        Raises CRUDException explicitly when trying to insert job whose category is None and that is already inserted to the database the database.
-        Because most database's composite unique constraints does not work when either of them is None.
+        The job is flushed at once by a single statement,
+        so that duplicates are detected by the unique constraints of the database
+        even between concurrent transactions.
+        Jobs without category are unique by the partial index created by create_jobs_without_category_key,
+        because most database's composite unique constraints does not work when either of them is None.
 
         Args:
+            user_name (str): User name
             name (str): Job name
-            category (Category | None): Category
+            category (Category | None): Category of the same user
 
         Raises:
-            CRUDException:
-                - Occurs when instantiate by the same composite keys within same transaction
-                - Occurs when trying to instantiate by the same job name that is already inserted to the database if category is None
+            DataAlreadyExistsError: Occurs when the job of the same name and category already exists
         """
-        db_job: Job | None
-        if category is None:
-            db_job = cls.get(lambda x: x.name == name and x.category is None)
-        else:
-            db_job = cls.get(lambda x: x.name == name and x.category == category)
-        if db_job is not None:
-            raise DataAlreadyExistsError(db_job)
-
+        category_name = category.name if category is not None else None
+        key = f"Job(user={user_name!r}, name={name!r}, category={category_name!r})"
         try:
-            cls(name=name, category=category)
+            db_job = cls(user=user_name, name=name, category=category)
         except CacheIndexError as error:
-            raise CRUDException from error
+            raise DataAlreadyExistsError(key) from error
+        try:
+            flush()
+        except TransactionIntegrityError as error:
+            # NOTE: the job not stored is cancelled, so that it is not flushed again on commit
+            db_job.delete()
+            raise DataAlreadyExistsError(key) from error
 
     @classmethod
-    def select_all(cls) -> List[Job]:
-        """Select all jobs from the database.
+    def select_all(cls, user_name: str) -> List[Job]:
+        """Select all jobs of the user from the database.
+
+        Jobs without category come first on every provider.
+
+        Args:
+            user_name (str): User name
 
         Returns:
             List[Job]: All jobs ordered by category name and job name
         """
-        return cast(
-            List[Job],
-            cls.select().order_by(lambda x: (x.category.name, x.name))[:],
-        )
+        query = cls.select(lambda x: x.user.name == user_name)
+        # NOTE: NULL is sorted first on SQLite but last on PostgreSQL.
+        #       On SQLite, jobs are read in the order of the index on (user, category, name)
+        #       without sorting.
+        if db.provider.dialect == "PostgreSQL":
+            query = query.order_by(lambda x: (coalesce(x.category.name, ""), x.name))
+        else:
+            query = query.order_by(lambda x: (x.category, x.name))
+        return cast(List[Job], query[:])
 
     @classmethod
-    def select_one_by_id(cls, __id: int) -> Job | None:
-        """Select a job by id from the database.
+    def select_one_by_id(cls, user_name: str, __id: int) -> Job | None:
+        """Select a job of the user by id from the database.
 
         Args:
+            user_name (str): User name
             __id (int): Job id
 
         Returns:
-            Job | None: Returns None if there is no such object.
+            Job | None: Returns None if there is no such object, or it is owned by another user.
         """
-        return cast(Job | None, cls.get(id=__id))
+        return cast(
+            Job | None,
+            cls.get_by_sql(
+                statements.get("Job.select_one_by_id"),
+                globals={},
+                locals={"job_id": __id, "user_name": user_name},
+            ),
+        )
+
+
+@db.on_create_tables()  # type: ignore[misc]
+def create_jobs_without_category_key(_: Database, connection: Any) -> None:
+    """Create the unique index of jobs without category if not exists.
+
+    The composite key of jobs does not work for jobs without category,
+    because NULL is distinct from NULL in unique constraints.
+
+    Args:
+        _ (Database): Database
+        connection (Any): DBAPI connection
+    """
+    connection.cursor().execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS unq_jobs__user_name_name__without_category "
+        "ON jobs (user_name, name) WHERE category_name IS NULL"
+    )
+
+
+class FinishedJobRecord(NamedTuple):
+    """Finished job record either in the live table or in an archive."""
+
+    id: int
+    job: Job
+    start: DateTime
+    end: DateTime
 
 
 class JobRecord(db.Entity):  # type: ignore[misc]
     _table_ = "job_records"
     id = PrimaryKey(int, auto=True)
+    user = Required("User", column="user_name")
     job = Required("Job")
     start = Required(datetime, precision=6)
     end = Optional(datetime, precision=6)
+    composite_index(user, start)
 
     @classmethod
     def insert(cls, job: Job, start: DateTime, end: DateTime | None = None) -> None:
-        """Insert a job record to the database.
+        """Insert a job record of the user owning the job to the database.
 
         Args:
             job (Job): Job
             start (datetime): Start datetime
             end (datetime | None): End datetime
         """
-        cls(job=job, start=start, end=end)
+        cls(user=job.user, job=job, start=start, end=end)
 
     @classmethod
     def update(
@@ -190,48 +292,95 @@ class JobRecord(db.Entity):  # type: ignore[misc]
         cls.update(job_record, job_record.job, job_record.start, end)
 
     @classmethod
-    def select_all_finished_by_date(cls, __date: Date) -> List[JobRecord]:
-        """Select all finished job records filtered by date from the database.
+    def select_finished_between(
+        cls, user_name: str, start: Date, end: Date
+    ) -> List[FinishedJobRecord]:
+        """Select all finished job records of the user between the dates from the database.
+
+        Archives of closed years are attached and selected only if the dates are in those years.
+
+        Args:
+            user_name (str): User name
+            start (date): First date
+            end (date): Last date
 
         Returns:
-            List[JobRecord]: All finished job records filtered by date, and ordered by start datetime and id
+            List[FinishedJobRecord]: All finished job records between the dates, and ordered by start datetime and id
         """
-        return cast(
-            List[JobRecord],
-            cls.select(
-                lambda j: j.start.date() == __date and j.end.date() == __date
-            ).order_by(lambda x: (x.start, x.id))[:],
+        range_start, _ = day_range(start)
+        _, range_end = day_range(end)
+        db_job_records = cls.select_by_sql(
+            statements.get("JobRecord.select_finished_between"),
+            globals={},
+            locals={
+                "user_name": user_name,
+                "range_start": range_start,
+                "range_end": range_end,
+            },
         )
+        records = [
+            FinishedJobRecord(j.id, j.job, j.start, j.end) for j in db_job_records
+        ]
+
+        last_closed_year = min(end.year, Date.today().year - 1)
+        archived = [
+            row
+            for year in range(start.year, last_closed_year + 1)
+            for row in archive.select_finished(year, user_name, range_start, range_end)
+        ]
+        if archived:
+            job_ids = list({row[1] for row in archived})
+            db_jobs = {
+                db_job.id: db_job for db_job in Job.select(lambda x: x.id in job_ids)
+            }
+            records.extend(
+                FinishedJobRecord(row[0], db_jobs[row[1]], row[2], row[3])
+                for row in archived
+            )
+        return sorted(records, key=lambda x: (x.start, x.id))
 
     @classmethod
-    def select_one_by_id(cls, __id: int) -> JobRecord | None:
-        """Select a job record by id from the database.
+    def select_one_by_id(cls, user_name: str, __id: int) -> JobRecord | None:
+        """Select a job record of the user by id from the database.
 
         Args:
+            user_name (str): User name
             __id (int): Job id
 
         Returns:
-            JobRecord | None: Returns None if there is no such object.
+            JobRecord | None: Returns None if there is no such object, or it is owned by another user.
         """
 
-        return cast(JobRecord | None, cls.get(id=__id))
+        return cast(JobRecord | None, cls.get(id=__id, user=user_name))
 
     @classmethod
-    def select_one_in_progress_by_date(cls, __date: Date) -> JobRecord | None:
-        """Select an in progress job record by date from the database.
+    def select_one_in_progress_by_date(
+        cls, user_name: str, __date: Date
+    ) -> JobRecord | None:
+        """Select an in progress job record of the user by date from the database.
 
         In progress job is equal to the end column has None.
 
         Args:
+            user_name (str): User name
             __date (int): Date
 
         Returns:
             JobRecord | None: Returns None if there is no such object.
         """
 
+        day_start, day_end = day_range(__date)
         return cast(
             JobRecord | None,
-            cls.get(lambda j: j.start.date() == __date and j.end is None),
+            cls.get_by_sql(
+                statements.get("JobRecord.select_one_in_progress_by_date"),
+                globals={},
+                locals={
+                    "user_name": user_name,
+                    "day_start": day_start,
+                    "day_end": day_end,
+                },
+            ),
         )
 
     # FIXME: comment out
@@ -271,36 +420,397 @@ class JobRecord(db.Entity):  # type: ignore[misc]
     #     return db.select(" ".join(query))[0]
 
 
+# NOTE: statements of hot lookups used instead of lambda queries,
+#       so that they are not translated by Pony on every call
+@statements.register("Job.select_one_by_id")
+def build_select_job_by_id(provider: Any) -> str:
+    quote = provider.quote_name
+    return (
+        f"SELECT * FROM {quote(Job._table_)} "
+        f"WHERE {quote(Job.id.column)} = $job_id "
+        f"AND {quote(Job.user.column)} = $user_name"
+    )
+
+
+@statements.register("JobRecord.select_finished_between")
+def build_select_finished_job_records(provider: Any) -> str:
+    quote = provider.quote_name
+    start, end = quote(JobRecord.start.column), quote(JobRecord.end.column)
+    return (
+        f"SELECT * FROM {quote(JobRecord._table_)} "
+        f"WHERE {quote(JobRecord.user.column)} = $user_name "
+        f"AND {start} >= $range_start AND {start} < $range_end "
+        f"AND {end} >= $range_start AND {end} < $range_end "
+        f"ORDER BY {start}, {quote(JobRecord.id.column)}"
+    )
+
+
+@statements.register("JobRecord.select_one_in_progress_by_date")
+def build_select_job_record_in_progress(provider: Any) -> str:
+    quote = provider.quote_name
+    start = quote(JobRecord.start.column)
+    return (
+        f"SELECT * FROM {quote(JobRecord._table_)} "
+        f"WHERE {quote(JobRecord.user.column)} = $user_name "
+        f"AND {start} >= $day_start AND {start} < $day_end "
+        f"AND {quote(JobRecord.end.column)} IS NULL"
+    )
+
+
+def note_content(
+    raw_content: str | None, compressed_content: bytes | None, codec: str | None
+) -> str | None:
+    """Get the content of the note decompressed if compressed.
+
+    Args:
+        raw_content (str | None): Content column, empty if compressed
+        compressed_content (bytes | None): Compressed content column
+        codec (str | None): Codec of the compressed content. Not compressed if None.
+
+    Returns:
+        str | None: Content
+    """
+    if codec is None:
+        return raw_content
+    return compression.decompress(cast(bytes, compressed_content), codec)
+
+
+@db.on_connect(provider="sqlite")  # type: ignore[misc]
+def create_notes_fts(_: Database, connection: Any) -> None:
+    """Create the full-text search index of notes if not exists.
+
+    The index is an external content FTS5 table kept in sync by Note.upsert,
+    so it keeps no copy of the contents, and compressed notes stay compressed.
+    Snippets are made of the contents read through the view notes_fts_source,
+    which decompresses them by the SQL function note_content registered here.
+    The index of the older layout, which kept a copy of the contents, is rebuilt from notes.
+
+    Args:
+        _ (Database): Database
+        connection (Any): sqlite3 connection
+    """
+    connection.create_function("note_content", 3, note_content, deterministic=True)
+    cursor = connection.cursor()
+    cursor.execute("PRAGMA table_info(notes_fts_keys)")
+    if cursor.fetchall():
+        return
+
+    cursor.execute("DROP TABLE IF EXISTS notes_fts")
+    # NOTE: rowids of the index, which must not be changed by VACUUM unlike implicit ones of notes
+    cursor.execute(
+        "CREATE TABLE notes_fts_keys (id INTEGER PRIMARY KEY, "
+        "user_name TEXT NOT NULL, date TEXT NOT NULL, UNIQUE (user_name, date))"
+    )
+    cursor.execute(
+        "CREATE VIEW IF NOT EXISTS notes_fts_source AS "
+        "SELECT k.id AS id, note_content(n.content, n.compressed_content, n.codec) AS content "
+        "FROM notes_fts_keys AS k "
+        "JOIN notes AS n ON n.user_name = k.user_name AND n.date = k.date"
+    )
+    cursor.execute(
+        "CREATE VIRTUAL TABLE notes_fts "
+        "USING fts5(content, content='notes_fts_source', content_rowid='id')"
+    )
+
+    cursor.execute("PRAGMA table_info(notes)")
+    if "user_name" in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(
+            "INSERT INTO notes_fts_keys(user_name, date) SELECT user_name, date FROM notes"
+        )
+        cursor.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+
+
+@db.on_connect(provider="postgres")  # type: ignore[misc]
+def create_notes_fts_postgres(_: Database, connection: Any) -> None:
+    """Create the table for full-text search of notes if not exists.
+
+    The table keeps the tsvector of each note instead of a copy of the content,
+    and is indexed by it.
+    The table of the older layout, which kept a copy of the contents, is rebuilt from notes.
+
+    Args:
+        _ (Database): Database
+        connection (Any): psycopg2 connection
+    """
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_name = 'notes_fts' AND table_schema = current_schema()"
+    )
+    columns = {row[0] for row in cursor.fetchall()}
+    if "tsv" in columns:
+        return
+
+    cursor.execute("DROP TABLE IF EXISTS notes_fts")
+    cursor.execute(
+        "CREATE TABLE notes_fts "
+        "(user_name TEXT, date TEXT, tsv TSVECTOR NOT NULL, PRIMARY KEY (user_name, date))"
+    )
+    cursor.execute("CREATE INDEX notes_fts_tsv ON notes_fts USING GIN (tsv)")
+
+    cursor.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_name = 'notes' AND table_schema = current_schema()"
+    )
+    if "user_name" not in {row[0] for row in cursor.fetchall()}:
+        return
+    cursor.execute(
+        "SELECT user_name, date, content, compressed_content, codec FROM notes"
+    )
+    for (
+        user_name,
+        note_date,
+        raw_content,
+        compressed_content,
+        codec,
+    ) in cursor.fetchall():
+        cursor.execute(
+            "INSERT INTO notes_fts(user_name, date, tsv) "
+            "VALUES (%s, %s, to_tsvector('simple', %s))",
+            (
+                user_name,
+                note_date.isoformat(),
+                note_content(raw_content, bytes(compressed_content or b""), codec),
+            ),
+        )
+
+
+# NOTE: options of ts_headline of PostgreSQL, like snippet of SQLite
+HEADLINE_OPTIONS: Final[str] = "StartSel=**, StopSel=**, MaxWords=16, MinWords=8"
+
+
 class Note(db.Entity):  # type: ignore[misc]
     _table_ = "notes"
-    date = PrimaryKey(Date)
-    content = Optional(LongStr)
+    user = Required("User", column="user_name")
+    date = Required(Date)
+    # NOTE: raw_content is empty if compressed_content is set
+    raw_content = Optional(LongStr, column="content")
+    compressed_content = Optional(bytes, lazy=True)
+    codec = Optional(str, nullable=True)
+    # NOTE: the first characters of the content, set only when the content is longer
+    preview = Optional(str, nullable=True)
+    PrimaryKey(user, date)
+
+    @property
+    def content(self) -> str | None:
+        """Content decompressed if compressed."""
+        return note_content(self.raw_content, self.compressed_content, self.codec)
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the preview is shorter than the content."""
+        return self.preview is not None
+
+    @classmethod
+    def __index(
+        cls, user_name: str, __date: Date, content: str, old_content: str | None
+    ) -> None:
+        """Replace the note in the full-text search index.
+
+        The index of SQLite keeps no copy of the content,
+        so the terms of the old content are removed by giving it again.
+
+        Args:
+            user_name (str): User name
+            __date (date): Date
+            content (str): Content
+            old_content (str | None): Content before the update. None if the note is new.
+        """
+        key = {"user_name": user_name, "date_text": __date.isoformat()}
+        if db.provider.dialect == "PostgreSQL":
+            db.execute(
+                "INSERT INTO notes_fts(user_name, date, tsv) "
+                "VALUES ($user_name, $date_text, to_tsvector('simple', $content)) "
+                "ON CONFLICT (user_name, date) DO UPDATE SET tsv = excluded.tsv",
+                globals={},
+                locals={**key, "content": content},
+            )
+            return
+
+        db.execute(
+            "INSERT INTO notes_fts_keys(user_name, date) "
+            "VALUES ($user_name, $date_text) ON CONFLICT DO NOTHING",
+            globals={},
+            locals=key,
+        )
+        rowid = db.get(
+            "id FROM notes_fts_keys WHERE user_name = $user_name AND date = $date_text",
+            globals={},
+            locals=key,
+        )
+        if old_content is not None:
+            db.execute(
+                "INSERT INTO notes_fts(notes_fts, rowid, content) "
+                "VALUES ('delete', $rowid, $old_content)",
+                globals={},
+                locals={"rowid": rowid, "old_content": old_content},
+            )
+        db.execute(
+            "INSERT INTO notes_fts(rowid, content) VALUES ($rowid, $content)",
+            globals={},
+            locals={"rowid": rowid, "content": content},
+        )
 
     @classmethod
-    def upsert(cls, __date: Date, content: str) -> None:
+    def upsert(
+        cls,
+        user_name: str,
+        __date: Date,
+        content: str,
+        *,
+        codec: str | None = None,
+        threshold: int = 4096,
+        preview_length: int = 1000,
+    ) -> None:
         """Insert note to the database if not exists.
-        Update note in the database if already exists.
+        Update note in the database if already exists and the content is changed.
 
         Args:
+            user_name (str): User name
             __date (date): Date
             content (str): Content
+            codec (str | None, optional): Codec to compress the content. Not compressed if None.
+            threshold (int, optional): Content longer than this is compressed
+            preview_length (int, optional): Content longer than this gets preview
+
+        Raises:
+            compression.CompressionError: Occurs when the codec is not available
         """
-        note = cast(Note | None, Note.get(date=__date))
+        compressed_content: bytes | None = None
+        raw_content = content
+        if codec is not None and len(content) > threshold:
+            compressed_content = compression.compress(content, codec)
+            raw_content = ""
+        else:
+            codec = None
+        preview = content[:preview_length] if len(content) > preview_length else None
 
+        note = cast(Note | None, Note.get(user=user_name, date=__date))
+        old_content = None if note is None else note.content
         if note is None:
-            cls(date=__date, content=content)
+            cls(
+                user=user_name,
+                date=__date,
+                raw_content=raw_content,
+                compressed_content=compressed_content,
+                codec=codec,
+                preview=preview,
+            )
+        elif old_content != content:
+            note.set(
+                raw_content=raw_content,
+                compressed_content=compressed_content,
+                codec=codec,
+                preview=preview,
+            )
         else:
-            note.content = content
+            return
+        cls.__index(user_name, __date, content, old_content)
 
     @classmethod
-    def select_one_by_date(cls, __date: Date) -> Note | None:
-        """Select a note by date from the database.
+    def select_one_by_date(cls, user_name: str, __date: Date) -> Note | None:
+        """Select a note of the user by date from the database.
 
         Args:
+            user_name (str): User name
             __date (date): Date
 
         Returns:
             models.JobRecord | None: None if there is no such object.
         """
 
-        return cast(Note | None, cls.get(date=__date))
+        return cast(Note | None, cls.get(user=user_name, date=__date))
+
+    @classmethod
+    def search(cls, user_name: str, query: str, limit: int) -> List[Tuple[Date, str]]:
+        """Search notes of the user by words from the full-text search index.
+
+        Notes containing all words of the query are matched,
+        and query syntax in user input is not interpreted.
+        SQLite uses the FTS5 table, and PostgreSQL uses the GIN index of tsvector.
+
+        Args:
+            user_name (str): User name
+            query (str): Words separated by whitespace
+            limit (int): Max number of notes
+
+        Returns:
+            List[Tuple[date, str]]: Dates and snippets ordered by relevance
+        """
+        if not query.split():
+            return []
+
+        rows: List[Tuple[str, str]]
+        if db.provider.dialect == "PostgreSQL":
+            # NOTE: headlines of compressed notes are made of the contents decompressed here
+            ranked: List[Tuple[str, str | None]] = db.select(
+                "f.date, CASE WHEN n.codec IS NULL "
+                "THEN ts_headline('simple', n.content, tsquery, $options) END "
+                "FROM notes_fts AS f "
+                "JOIN notes AS n "
+                "ON n.user_name = f.user_name AND n.date = CAST(f.date AS DATE) "
+                "CROSS JOIN plainto_tsquery('simple', $query) AS tsquery "
+                "WHERE f.user_name = $user_name AND f.tsv @@ tsquery "
+                "ORDER BY ts_rank(f.tsv, tsquery) DESC "
+                "LIMIT $limit",
+                globals={},
+                locals={
+                    "user_name": user_name,
+                    "query": query,
+                    "limit": limit,
+                    "options": HEADLINE_OPTIONS,
+                },
+            )
+            rows = [
+                (
+                    date_text,
+                    (
+                        cls.__headline(user_name, date_text, query)
+                        if headline is None
+                        else headline
+                    ),
+                )
+                for date_text, headline in ranked
+            ]
+        else:
+            words = ['"' + word.replace('"', '""') + '"' for word in query.split()]
+            rows = db.select(
+                "k.date, snippet(notes_fts, 0, '**', '**', '...', 16) FROM notes_fts "
+                "JOIN notes_fts_keys AS k ON k.id = notes_fts.rowid "
+                "WHERE notes_fts MATCH $match AND k.user_name = $user_name "
+                "ORDER BY rank LIMIT $limit",
+                globals={},
+                locals={
+                    "match": " ".join(words),
+                    "user_name": user_name,
+                    "limit": limit,
+                },
+            )
+        return [(Date.fromisoformat(row[0]), row[1]) for row in rows]
+
+    @classmethod
+    def __headline(cls, user_name: str, date_text: str, query: str) -> str:
+        """Make the headline of the compressed note by PostgreSQL.
+
+        Args:
+            user_name (str): User name
+            date_text (str): Date in ISO format
+            query (str): Words separated by whitespace
+
+        Returns:
+            str: Headline
+        """
+        note = cast(Note, cls.get(user=user_name, date=Date.fromisoformat(date_text)))
+        return cast(
+            str,
+            db.get(
+                "ts_headline('simple', $content, plainto_tsquery('simple', $query), "
+                "$options)",
+                globals={},
+                locals={
+                    "content": note.content,
+                    "query": query,
+                    "options": HEADLINE_OPTIONS,
+                },
+            ),
+        )
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from .. import metrics
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class SharedPool:
+    """Connection pool shared by all threads with a bounded number of connections.
+
+    Pony keeps one connection per thread, and Streamlit runs each rerun on a new thread,
+    so server databases would get a new connection on every rerun.
+    This pool implements the same interface as pony.orm.dbapiprovider.Pool,
+    and lends idle connections to whichever thread starts a db_session.
+    """
+
+    def __init__(
+        self,
+        dbapi_module: Any,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        *,
+        size: int,
+        timeout: float,
+    ) -> None:
+        self.dbapi_module = dbapi_module
+        self.args = args
+        self.kwargs = kwargs
+        self.__timeout = timeout
+        self.__semaphore = threading.BoundedSemaphore(size)
+        self.__lock = threading.Lock()
+        self.__idle: List[Any] = []
+
+    def connect(self) -> Tuple[Any, bool]:
+        """Borrow an idle connection, or open a new one if there is none.
+
+        Raises:
+            PoolTimeoutError: Occurs when all connections are borrowed until the timeout
+
+        Returns:
+            Tuple[Any, bool]: The connection and whether it is newly opened
+        """
+        if not self.__semaphore.acquire(timeout=self.__timeout):
+            raise PoolTimeoutError(
+                f"No connection was returned to the pool in {self.__timeout} seconds"
+            )
+
+        with self.__lock:
+            if self.__idle:
+                return self.__idle.pop(), False
+
+        try:
+            connection = self.dbapi_module.connect(*self.args, **self.kwargs)
+        except BaseException:
+            self.__semaphore.release()
+            raise
+        return connection, True
+
+    def release(self, connection: Any) -> None:
+        """Roll back the connection and return it to the pool.
+
+        Args:
+            connection (Any): Borrowed connection
+        """
+        try:
+            connection.rollback()
+        except BaseException:
+            self.drop(connection)
+            raise
+
+        with self.__lock:
+            self.__idle.append(connection)
+        self.__semaphore.release()
+
+    def drop(self, connection: Any) -> None:
+        """Close the connection instead of returning it to the pool.
+
+        Args:
+            connection (Any): Borrowed connection
+        """
+        try:
+            connection.close()
+        finally:
+            self.__semaphore.release()
+
+    def disconnect(self) -> None:
+        """Close all idle connections."""
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+        for connection in idle:
+            connection.close()
+
+
+class ShardedPool:
+    """Connection pool routing each db_session to the SQLite file of its shard.
+
+    The shard is chosen by route() on the thread before the db_session connects,
+    and the default file is used outside of route().
+    Idle connections of recently used shards are kept open,
+    and those of the least recently used shards are closed beyond max_shards.
+    Connections are opened with check_same_thread=False, and lent to one thread at a time.
+    """
+
+    def __init__(
+        self,
+        opener: Callable[[str], Any],
+        filename: Callable[[str], str],
+        default_filename: str,
+        *,
+        max_shards: int,
+    ) -> None:
+        self.__opener = opener
+        self.__filename = filename
+        self.__default_filename = default_filename
+        self.__max_shards = max_shards
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        # NOTE: idle connections per file ordered from the least recently used
+        self.__idle: OrderedDict[str, List[Any]] = OrderedDict()
+        self.__borrowed: Dict[int, str] = {}
+
+    @contextmanager
+    def route(self, shard: str) -> Iterator[None]:
+        """Route db_sessions started inside the with statement on this thread to the shard.
+
+        Args:
+            shard (str): Shard name
+        """
+        previous = getattr(self.__local, "filename", None)
+        self.__local.filename = self.__filename(shard)
+        try:
+            yield
+        finally:
+            self.__local.filename = previous
+
+    def get_open_filenames(self) -> List[str]:
+        """List files having idle connections from the least recently used.
+
+        Returns:
+            List[str]: File names
+        """
+        with self.__lock:
+            return list(self.__idle)
+
+    def connect(self) -> Tuple[Any, bool]:
+        """Borrow an idle connection to the routed file, or open a new one if there is none.
+
+        Returns:
+            Tuple[Any, bool]: The connection and whether it is newly opened
+        """
+        filename = getattr(self.__local, "filename", None) or self.__default_filename
+        with self.__lock:
+            idle = self.__idle.get(filename)
+            if idle:
+                connection = idle.pop()
+                self.__borrowed[id(connection)] = filename
+                metrics.record_cache_request("shard", True)
+                return connection, False
+
+        metrics.record_cache_request("shard", False)
+        connection = self.__opener(filename)
+        with self.__lock:
+            self.__borrowed[id(connection)] = filename
+        return connection, True
+
+    def release(self, connection: Any) -> None:
+        """Roll back the connection and keep it open as the most recently used.
+
+        Args:
+            connection (Any): Borrowed connection
+        """
+        try:
+            connection.rollback()
+        except BaseException:
+            self.drop(connection)
+            raise
+
+        evicted: List[Any] = []
+        with self.__lock:
+            filename = self.__borrowed.pop(id(connection))
+            self.__idle.setdefault(filename, []).append(connection)
+            self.__idle.move_to_end(filename)
+            while len(self.__idle) > self.__max_shards:
+                _, connections = self.__idle.popitem(last=False)
+                evicted.extend(connections)
+        for idle_connection in evicted:
+            idle_connection.close()
+
+    def drop(self, connection: Any) -> None:
+        """Close the connection instead of keeping it open.
+
+        Args:
+            connection (Any): Borrowed connection
+        """
+        with self.__lock:
+            self.__borrowed.pop(id(connection), None)
+        connection.close()
+
+    def disconnect(self) -> None:
+        """Close all idle connections."""
+        with self.__lock:
+            idle, self.__idle = self.__idle, OrderedDict()
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
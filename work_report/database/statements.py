@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+from .database import DatabaseSingleton
+
+B = TypeVar("B", bound=Callable[[Any], str])
+
+
+class StatementRegistry:
+    """Raw SQL statements of hot lookups built once per process and dialect.
+
+    Pony decompiles a lambda query, extracts its variables and looks up its translation
+    on every call, which takes longer than a small lookup itself.
+    Statements are built by the registered functions from the mapping on first use,
+    and reused by all later calls.
+    They take $name parameters like db.select(),
+    so pass them to Entity.select_by_sql() or Entity.get_by_sql() with the parameters in locals.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__builders: Dict[str, Callable[[Any], str]] = {}
+        self.__statements: Dict[Tuple[str, str], str] = {}
+
+    def register(self, name: str) -> Callable[[B], B]:
+        """Register a function building the statement from the provider.
+
+        Args:
+            name (str): Statement name, e.g. "JobRecord.select_one_in_progress_by_date"
+
+        Raises:
+            ValueError: Occurs when the name is already registered
+
+        Returns:
+            Callable[[B], B]: Decorator
+        """
+
+        def decorator(build: B) -> B:
+            with self.__lock:
+                if name in self.__builders:
+                    raise ValueError(f"Statement({name}) is already registered")
+                self.__builders[name] = build
+            return build
+
+        return decorator
+
+    def get(self, name: str) -> str:
+        """Get the statement for the bound provider, building it on first use.
+
+        Args:
+            name (str): Statement name
+
+        Raises:
+            KeyError: Occurs when the name is not registered
+
+        Returns:
+            str: SQL with $name parameters
+        """
+        provider = DatabaseSingleton.get_instance().provider
+        key = (name, provider.dialect)
+        statement = self.__statements.get(key)
+        if statement is not None:
+            return statement
+
+        with self.__lock:
+            statement = self.__builders[name](provider)
+            self.__statements[key] = statement
+        return statement
+
+
+statements = StatementRegistry()
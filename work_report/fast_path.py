@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Dict, Final, List, Tuple
+
+from . import view_models
+from .database import archive, compression
+from .database.database import DatabaseSingleton
+from .database.models import day_range
+
+# NOTE: columns of a job record joined with its job and category
+JOB_RECORD_COLUMNS: Final[str] = (
+    'r.id, r.start, r."end", j.id, j.name, j.category_name '
+    "FROM job_records r JOIN jobs j ON j.id = r.job"
+)
+
+_enabled = False
+
+
+def configure(*, enabled: bool) -> None:
+    """Enable or disable the fast path.
+
+    Args:
+        enabled (bool): Read with raw SQL if True. Only SQLite is supported.
+    """
+    global _enabled  # pylint: disable=global-statement
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Judge if the data of each rerun are read with raw SQL instead of the ORM.
+
+    Returns:
+        bool: False if not enabled, or the bound database is not SQLite
+    """
+    provider = DatabaseSingleton.get_instance().provider
+    return _enabled and provider is not None and provider.dialect == "SQLite"
+
+
+def _execute(sql: str, parameters: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+    # NOTE: the sqlite3 connection of the db_session is reused,
+    #       and it caches the statements prepared by the same SQL
+    connection = DatabaseSingleton.get_instance().get_connection()
+    return connection.execute(sql, parameters).fetchall()  # type: ignore[no-any-return]
+
+
+def _to_text(__datetime: datetime) -> str:
+    return __datetime.strftime(archive.DATETIME_FORMAT)
+
+
+def _to_job(job_id: int, name: str, category_name: str | None) -> view_models.Job:
+    # NOTE: values read from the database are already valid, so validation is skipped
+    category = (
+        view_models.Category.construct(name=category_name)
+        if category_name is not None
+        else None
+    )
+    return view_models.Job.construct(id=job_id, name=name, category=category)
+
+
+def _to_job_record(row: Tuple[Any, ...]) -> view_models.JobRecord:
+    record_id, start, end, job_id, job_name, category_name = row
+    return view_models.JobRecord.construct(
+        id=record_id,
+        job=_to_job(job_id, job_name, category_name),
+        start=datetime.fromisoformat(start),
+        end=datetime.fromisoformat(end) if end is not None else None,
+    )
+
+
+def select_jobs(user_name: str) -> List[view_models.Job]:
+    """Select all jobs of the user.
+
+    Must be used inside db_session.
+
+    Args:
+        user_name (str): User name
+
+    Returns:
+        List[view_models.Job]: All jobs ordered by category name and job name
+    """
+    rows = _execute(
+        "SELECT id, name, category_name FROM jobs WHERE user_name = ? "
+        "ORDER BY category_user_name, category_name, name",
+        (user_name,),
+    )
+    return [_to_job(*row) for row in rows]
+
+
+def select_finished_job_records(
+    user_name: str, start: date, end: date
+) -> List[view_models.JobRecord]:
+    """Select all finished job records of the user between the dates.
+
+    Must be used inside db_session.
+    Job records of closed years are selected from their archives.
+
+    Args:
+        user_name (str): User name
+        start (date): First date
+        end (date): Last date
+
+    Returns:
+        List[view_models.JobRecord]: Job records ordered by start datetime and id
+    """
+    range_start, _ = day_range(start)
+    _, range_end = day_range(end)
+    text_start, text_end = _to_text(range_start), _to_text(range_end)
+    job_records = [
+        _to_job_record(row)
+        for row in _execute(
+            f"SELECT {JOB_RECORD_COLUMNS} WHERE r.user_name = ? "
+            'AND r.start >= ? AND r.start < ? AND r."end" >= ? AND r."end" < ?',
+            (user_name, text_start, text_end, text_start, text_end),
+        )
+    ]
+
+    last_closed_year = min(end.year, date.today().year - 1)
+    archived = [
+        row
+        for year in range(start.year, last_closed_year + 1)
+        for row in archive.select_finished(year, user_name, range_start, range_end)
+    ]
+    if archived:
+        job_ids = sorted({row[1] for row in archived})
+        placeholders = ", ".join("?" * len(job_ids))
+        jobs: Dict[int, view_models.Job] = {
+            row[0]: _to_job(*row)
+            for row in _execute(
+                f"SELECT id, name, category_name FROM jobs WHERE id IN ({placeholders})",
+                tuple(job_ids),
+            )
+        }
+        job_records.extend(
+            view_models.JobRecord.construct(
+                id=record_id, job=jobs[job_id], start=record_start, end=record_end
+            )
+            for record_id, job_id, record_start, record_end in archived
+        )
+    return sorted(job_records, key=lambda x: (x.start, x.id))
+
+
+def select_job_record_in_progress(
+    user_name: str, __date: date
+) -> view_models.JobRecord | None:
+    """Select the job record of the user in progress on the date.
+
+    Must be used inside db_session.
+
+    Args:
+        user_name (str): User name
+        __date (date): Date
+
+    Returns:
+        view_models.JobRecord | None: None if there is no such job record.
+    """
+    day_start, day_end = day_range(__date)
+    rows = _execute(
+        f"SELECT {JOB_RECORD_COLUMNS} WHERE r.user_name = ? "
+        'AND r.start >= ? AND r.start < ? AND r."end" IS NULL',
+        (user_name, _to_text(day_start), _to_text(day_end)),
+    )
+    if not rows:
+        return None
+    return _to_job_record(rows[0])
+
+
+def select_note(
+    user_name: str, __date: date, *, preview: bool = False
+) -> view_models.Note | None:
+    """Select the note of the user on the date.
+
+    Must be used inside db_session.
+
+    Args:
+        user_name (str): User name
+        __date (date): Date
+        preview (bool, optional): Select only the preview of long content
+            without reading the whole content.
+
+    Returns:
+        view_models.Note | None: None if there is no such note.
+    """
+    parameters = (user_name, __date.isoformat())
+    rows = _execute(
+        "SELECT codec, preview FROM notes WHERE user_name = ? AND date = ?",
+        parameters,
+    )
+    if not rows:
+        return None
+
+    codec, note_preview = rows[0]
+    if preview and note_preview is not None:
+        return view_models.Note.construct(
+            date=__date, content=note_preview, truncated=True
+        )
+
+    if codec is None:
+        content = _execute(
+            "SELECT content FROM notes WHERE user_name = ? AND date = ?", parameters
+        )[0][0]
+    else:
+        compressed_content = _execute(
+            "SELECT compressed_content FROM notes WHERE user_name = ? AND date = ?",
+            parameters,
+        )[0][0]
+        content = compression.decompress(compressed_content, codec)
+    return view_models.Note.construct(date=__date, content=content, truncated=False)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Callable, Dict, FrozenSet, List
+
+from pydantic import BaseModel, PositiveInt, root_validator
+
+from .mediator import Dataset
+
+
+class Panel(str, Enum):
+    """Colleagues placed by the layout"""
+
+    main_title = "main_title"
+    language_selection = "language_selection"
+    message_area = "message_area"
+    date_selection = "date_selection"
+    working_hours_schedule = "working_hours_schedule"
+    timeline_chart = "timeline_chart"
+    job_timer = "job_timer"
+    job_addition_manually = "job_addition_manually"
+    job_creation = "job_creation"
+    job_logs = "job_logs"
+    note_area = "note_area"
+    note_search = "note_search"
+
+
+# NOTE: data loaded by the mediator only if a panel depending on them is rendered
+PANEL_DATASETS: Dict[Panel, FrozenSet[Dataset]] = {
+    Panel.timeline_chart: frozenset(
+        {Dataset.job_records, Dataset.job_record_in_progress}
+    ),
+    Panel.job_timer: frozenset({Dataset.jobs, Dataset.job_record_in_progress}),
+    Panel.job_addition_manually: frozenset({Dataset.jobs}),
+    Panel.job_creation: frozenset({Dataset.categories}),
+    Panel.job_logs: frozenset({Dataset.jobs, Dataset.job_records}),
+    Panel.note_area: frozenset({Dataset.note}),
+    Panel.note_search: frozenset({Dataset.note_search_results}),
+}
+
+
+class PanelLayout(BaseModel):
+    panel: Panel
+    # NOTE: disabled panels are neither rendered nor loaded
+    enabled: bool = True
+    # NOTE: collapsed panels are rendered and loaded only while expanded by the user
+    collapsed: bool = False
+
+
+class RowLayout(BaseModel):
+    # NOTE: relative widths of the columns
+    widths: List[PositiveInt]
+    # NOTE: panels of each column from top to bottom
+    columns: List[List[PanelLayout]]
+
+    @root_validator(skip_on_failure=True)
+    @classmethod
+    def check_columns(cls, values: Dict[str, List[object]]) -> Dict[str, List[object]]:
+        if len(values["widths"]) != len(values["columns"]):
+            raise ValueError("widths and columns must have the same length")
+        return values
+
+
+class Layout(BaseModel):
+    rows: List[RowLayout]
+
+    def get_panels(self) -> List[PanelLayout]:
+        """Get the enabled panels.
+
+        Returns:
+            List[PanelLayout]: Panels in order of rendering
+        """
+        return [
+            panel
+            for row in self.rows
+            for column in row.columns
+            for panel in column
+            if panel.enabled
+        ]
+
+    def get_datasets(self, is_expanded: Callable[[Panel], bool]) -> FrozenSet[Dataset]:
+        """Get the data which the rendered panels depend on.
+
+        Args:
+            is_expanded (Callable[[Panel], bool]): Judge if the collapsed panel is expanded
+
+        Returns:
+            FrozenSet[Dataset]: Data to be loaded
+        """
+        return frozenset(
+            dataset
+            for panel in self.get_panels()
+            if not panel.collapsed or is_expanded(panel.panel)
+            for dataset in PANEL_DATASETS.get(panel.panel, frozenset())
+        )
+
+
+def load_layout(filename: str | None) -> Layout:
+    """Load the layout from the JSON file.
+
+    Args:
+        filename (str | None): JSON file. The default layout is used if None.
+
+    Raises:
+        pydantic.ValidationError: Occurs when the layout is invalid
+
+    Returns:
+        Layout: Layout
+    """
+    if filename is None:
+        return DEFAULT_LAYOUT
+    return Layout.parse_file(filename)
+
+
+def _column(*panels: Panel) -> List[PanelLayout]:
+    return [PanelLayout(panel=panel) for panel in panels]
+
+
+DEFAULT_LAYOUT = Layout(
+    rows=[
+        RowLayout(
+            widths=[9, 1],
+            columns=[_column(Panel.main_title), _column(Panel.language_selection)],
+        ),
+        RowLayout(widths=[1], columns=[_column(Panel.message_area)]),
+        RowLayout(
+            widths=[1, 1],
+            columns=[
+                _column(Panel.date_selection),
+                _column(Panel.working_hours_schedule),
+            ],
+        ),
+        RowLayout(
+            widths=[2, 1],
+            columns=[
+                _column(Panel.timeline_chart),
+                _column(
+                    Panel.job_timer, Panel.job_addition_manually, Panel.job_creation
+                ),
+            ],
+        ),
+        RowLayout(
+            widths=[1, 1],
+            columns=[
+                _column(Panel.job_logs),
+                _column(Panel.note_area, Panel.note_search),
+            ],
+        ),
+    ]
+)
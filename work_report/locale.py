@@ -1,3 +1,10 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Final, List
+
 from pydantic import BaseModel, StrictStr
 
 
@@ -29,76 +36,149 @@ class Language(BaseModel):
     job_timer_selectbox: StrictStr
     job_timer_button_start: StrictStr
     job_timer_button_stop: StrictStr
+    job_timer_elapsed: StrictStr
     # note_area
     note_area_text_area: StrictStr
     note_area_button: StrictStr
+    note_area_checkbox_autosave: StrictStr
+    note_area_button_expand: StrictStr
+    # note_search
+    note_search_text_input: StrictStr
+    # message_area
+    message_area_pending_write: StrictStr
+    # profiling_panel
+    profiling_panel_expander: StrictStr
     # TODO: timeline_chart
     # working_hours_schedule
     working_hours_schedule_slider: StrictStr
     # locale_selection
     language_selection_selectbox: StrictStr
+    # layout
+    layout_checkbox_expanded: StrictStr
+
+    class Config:
+        # NOTE: instances are shared by all sessions
+        allow_mutation = False
 
     def __str__(self) -> str:
         return self.language
 
 
-class LanguageJP(Language):
-    def __init__(self) -> None:
-        super().__init__(
-            language="日本語",
-            main_page_title="作業管理",
-            main_title="作業管理",
-            date_selection_date_input="日付",
-            date_selection_button="今日",
-            job_addition_manually_expander="手動登録",
-            job_addition_manually_selectbox="作業したジョブ",
-            job_addition_manually_slider="作業した時間",
-            job_addition_manually_button="追加",
-            job_creation_expander="ジョブ/カテゴリの登録",
-            job_creation_radio="ジョブ/カテゴリ",
-            job_creation_selectbox="カテゴリ",
-            job_creation_checkbox="カテゴリを選択しない",
-            job_creation_text_input="ジョブ名/カテゴリ名",
-            job_creation_button="作成",
-            job_logs_selectbox="ジョブ",
-            job_logs_slider="作業時間",
-            job_logs_button="修正",
-            job_timer_selectbox="ジョブ",
-            job_timer_button_start="開始",
-            job_timer_button_stop="終了",
-            note_area_text_area="メモ",
-            note_area_button="保存",
-            working_hours_schedule_slider="作業予定時間",
-            language_selection_selectbox="言語",
-        )
-
-
-class LanguageEN(Language):
-    def __init__(self) -> None:
-        super().__init__(
-            language="English",
-            main_page_title="Work Report",
-            main_title="Work Report",
-            date_selection_date_input="Date",
-            date_selection_button="Today",
-            job_addition_manually_expander="Register a record manually",
-            job_addition_manually_selectbox="What you did?",
-            job_addition_manually_slider="When did you do?",
-            job_addition_manually_button="Register",
-            job_creation_expander="Create a job/category",
-            job_creation_radio="Which do you register?",
-            job_creation_selectbox="Which category does the job belong to?",
-            job_creation_checkbox="Select no category",
-            job_creation_text_input="Job/Category name",
-            job_creation_button="Create",
-            job_logs_selectbox="Job",
-            job_logs_slider="Hours worked",
-            job_logs_button="Revise",
-            job_timer_selectbox="Which job do you start/stop?",
-            job_timer_button_start="Start",
-            job_timer_button_stop="Stop",
-            note_area_text_area="Note",
-            note_area_button="Save",
-            working_hours_schedule_slider="How long do you plan to work today?",
-            language_selection_selectbox="Language",
-        )
+class LocaleRegistry:
+    """Languages looked up by code, each read from JSON and validated once per process.
+
+    Files are read on first use, so languages never selected cost nothing,
+    and the built instances are shared by all sessions.
+    Names of languages are registered with them, so they can be listed without being read.
+    """
+
+    def __init__(self, default_code: str) -> None:
+        self.default_code = default_code
+        # NOTE: reentrant because a language falls back to the default one while being built
+        self.__lock = threading.RLock()
+        self.__names: Dict[str, str] = {}
+        self.__paths: Dict[str, Path] = {}
+        self.__languages: Dict[str, Language] = {}
+
+    def register_file(self, code: str, name: str, path: Path) -> None:
+        """Register a JSON file of the language, which is read on first use.
+
+        Keys missing in the file fall back to the default language.
+
+        Args:
+            code (str): Language code, e.g. "en"
+            name (str): Language name shown to users, e.g. "English"
+            path (Path): JSON file with fields of Language
+
+        Raises:
+            ValueError: Occurs when the code is already registered
+        """
+        with self.__lock:
+            if code in self.__paths:
+                raise ValueError(f"Language({code}) is already registered")
+            self.__names[code] = name
+            self.__paths[code] = path
+
+    def register_directory(self, directory: Path) -> None:
+        """Register JSON files of the languages listed in languages.json of the directory.
+
+        languages.json maps each language code to its name, e.g. {"en": "English"},
+        and the language is read from the file named by the code, e.g. en.json.
+
+        Args:
+            directory (Path): Directory of the files
+
+        Raises:
+            ValueError: Occurs when a code is already registered
+        """
+        with open(directory / "languages.json", encoding="utf-8") as f:
+            names: Dict[str, str] = json.load(f)
+        for code, name in names.items():
+            self.register_file(code, name, directory / f"{code}.json")
+
+    def get(self, code: str) -> Language:
+        """Get the language, reading it on first use.
+
+        Args:
+            code (str): Language code
+
+        Raises:
+            KeyError: Occurs when the code is not registered
+            pydantic.ValidationError: Occurs when the language is invalid
+
+        Returns:
+            Language: Language
+        """
+        language = self.__languages.get(code)
+        if language is not None:
+            return language
+
+        with self.__lock:
+            language = self.__languages.get(code)
+            if language is None:
+                language = self.__parse_file(code, self.__paths[code])
+                self.__languages[code] = language
+        return language
+
+    def get_default(self) -> Language:
+        """Get the default language.
+
+        Returns:
+            Language: Language of default_code
+        """
+        return self.get(self.default_code)
+
+    def get_codes(self) -> List[str]:
+        """Get the codes of all registered languages without reading them.
+
+        Returns:
+            List[str]: Codes in order of registration
+        """
+        return list(self.__paths)
+
+    def get_name(self, code: str) -> str:
+        """Get the name of the language without reading it.
+
+        Args:
+            code (str): Language code
+
+        Raises:
+            KeyError: Occurs when the code is not registered
+
+        Returns:
+            str: Language name
+        """
+        return self.__names[code]
+
+    def __parse_file(self, code: str, path: Path) -> Language:
+        with open(path, encoding="utf-8") as f:
+            data: Dict[str, Any] = json.load(f)
+        if code != self.default_code:
+            data = {**self.get_default().dict(), **data}
+        return Language.parse_obj(data)
+
+
+LOCALE_DIRECTORY: Final[Path] = Path(__file__).parent / "locales"
+
+languages = LocaleRegistry(default_code="en")
+languages.register_directory(LOCALE_DIRECTORY)
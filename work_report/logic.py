@@ -4,11 +4,23 @@ from typing import Final, List
 from pony.orm import db_session
 from pony.orm.core import TransactionIntegrityError
 
-from . import view_models
+from . import fast_path, metrics, view_models
+from .catalog import Catalog
+from .config import DatabaseSettings
 from .database import models
+from .database.compression import CompressionError
+from .database.database import routed
 
 # register >  update > delete > acquire-many > acquire-one
 
+settings = DatabaseSettings()
+
+# NOTE: read on every rerun, but changed only by registration
+category_catalog: Catalog[view_models.Category] = Catalog(
+    "category_catalog", ttl=settings.catalog_ttl
+)
+job_catalog: Catalog[view_models.Job] = Catalog("job_catalog", ttl=settings.catalog_ttl)
+
 
 class LogicException(Exception):
     pass
@@ -16,10 +28,13 @@ class LogicException(Exception):
 
 class Category:
     @staticmethod
-    def register(name: str) -> None:
-        """Register a category
+    @metrics.timed
+    @routed
+    def register(user_name: str, name: str) -> None:
+        """Register a category of the user
 
         Args:
+            user_name (str): User name
             name (str): Category name
 
         Raises:
@@ -27,20 +42,35 @@ class Category:
         """
         try:
             with db_session(serializable=True, strict=True):
-                models.Category.insert(name)
+                models.User.insert_if_not_exists(user_name)
+                models.Category.insert(user_name, name)
         except TransactionIntegrityError as error:
             raise LogicException from error
+        finally:
+            category_catalog.invalidate(user_name)
+            job_catalog.invalidate(user_name)
 
-    @staticmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def acquire_all() -> List[view_models.Category]:
-        """Acquire all categories and convert to view model
+    @classmethod
+    @metrics.timed
+    def acquire_all(cls, user_name: str) -> List[view_models.Category]:
+        """Acquire all categories of the user and convert to view model
+
+        Categories are cached in the process until a category is registered,
+        or for DatabaseSettings.catalog_ttl seconds.
+
+        Args:
+            user_name (str): User name
 
         Returns:
             List[view_models.Category]: All categories
         """
+        return category_catalog.get(user_name, lambda: cls.__load_all(user_name))
 
-        db_categories = models.Category.select_all()
+    @staticmethod
+    @routed
+    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    def __load_all(user_name: str) -> List[view_models.Category]:
+        db_categories = models.Category.select_all(user_name)
 
         return [
             view_models.Category.from_orm(db_category) for db_category in db_categories
@@ -49,10 +79,15 @@ class Category:
 
 class Job:
     @staticmethod
-    def register(job_name: str, category_name: str | None = None) -> None:
-        """Register a job.
+    @metrics.timed
+    @routed
+    def register(
+        user_name: str, job_name: str, category_name: str | None = None
+    ) -> None:
+        """Register a job of the user.
 
         Args:
+            user_name (str): User name
             job_name (str): Job name
             category_name (str | None): Category name
 
@@ -64,28 +99,47 @@ class Job:
 
         try:
             with db_session(serializable=True, strict=True):
+                models.User.insert_if_not_exists(user_name)
                 if category_name is None:
-                    models.Job.insert(job_name, None)
+                    models.Job.insert(user_name, job_name, None)
                     return
 
-                db_category = models.Category.select_one_by_name(category_name)
+                db_category = models.Category.select_one_by_name(
+                    user_name, category_name
+                )
                 if db_category is None:
                     raise LogicException("Category is specified, but not found.")
-                models.Job.insert(job_name, db_category)
+                models.Job.insert(user_name, job_name, db_category)
 
         except (TransactionIntegrityError, models.CRUDException) as error:
             raise LogicException(error) from error
+        finally:
+            job_catalog.invalidate(user_name)
 
-    @staticmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def acquire_all() -> List[view_models.Job]:
-        """Acquire all jobs and convert to view model
+    @classmethod
+    @metrics.timed
+    def acquire_all(cls, user_name: str) -> List[view_models.Job]:
+        """Acquire all jobs of the user and convert to view model
+
+        Jobs are cached in the process until a job or a category is registered,
+        or for DatabaseSettings.catalog_ttl seconds.
+
+        Args:
+            user_name (str): User name
 
         Returns:
-            List[view_models.Job]: All jobs
+            List[view_models.Job]: All jobs ordered by category name and job name
         """
+        return job_catalog.get(user_name, lambda: cls.__load_all(user_name))
 
-        db_jobs = models.Job.select_all()
+    @staticmethod
+    @routed
+    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    def __load_all(user_name: str) -> List[view_models.Job]:
+        if fast_path.is_enabled():
+            return fast_path.select_jobs(user_name)
+
+        db_jobs = models.Job.select_all(user_name)
         return [view_models.Job.from_orm(db_job) for db_job in db_jobs]
 
 
@@ -104,20 +158,21 @@ class JobRecord:
 
     @classmethod
     def __judge_if_can_upsert_and_get_job(
-        cls, job_id: int, start: datetime, end: datetime | None = None
+        cls, user_name: str, job_id: int, start: datetime, end: datetime | None = None
     ) -> models.Job:
         """Judge if job record can be upcert and returns the job if so.
 
         This private function must be used inside db_session.
 
         Args:
+            user_name (str): User name
             job_id (int): Job id
             start (datetime): Start time
             end (datetime | None, optional): End time
 
         Raises:
             LogicException:  Occurs when future time is set for start datetime or end datetime.
-            LogicException:  Occurs when job specified job id cannot be found.
+            LogicException:  Occurs when job specified job id cannot be found in the user's jobs.
             LogicException:  Occurs when end datetime is smaller than equal to start datetime.
             LogicException:  Occurs when start and end are not same dates.
 
@@ -129,7 +184,7 @@ class JobRecord:
         if start > CURRENT_DATETIME:
             raise LogicException("Start time cannot be set at future time.")
 
-        db_job = models.Job.select_one_by_id(job_id)
+        db_job = models.Job.select_one_by_id(user_name, job_id)
         if db_job is None:
             raise LogicException(f"Job(id={job_id}) cannot be found.")
 
@@ -144,11 +199,16 @@ class JobRecord:
         return db_job
 
     @classmethod
+    @metrics.timed
+    @routed
     @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def register(cls, job_id: int, start: datetime, end: datetime) -> None:
-        """Register a job record.
+    def register(
+        cls, user_name: str, job_id: int, start: datetime, end: datetime
+    ) -> None:
+        """Register a job record of the user.
 
         Args:
+            user_name (str): User name
             job_id (int): Job ID
             start (datetime): Start datetime
             end (datetime): End datetime
@@ -160,17 +220,25 @@ class JobRecord:
 
         start = cls.__replace_second_0(start)
         end = cls.__replace_second_0(end)
-        db_job = cls.__judge_if_can_upsert_and_get_job(job_id, start, end)
+        db_job = cls.__judge_if_can_upsert_and_get_job(user_name, job_id, start, end)
         models.JobRecord.insert(db_job, start, end)
 
     @classmethod
+    @metrics.timed
+    @routed
     @db_session(serializable=True, strict=True)  # type: ignore[misc]
     def revise(
-        cls, job_record_id: int, job_id: int, start: datetime, end: datetime
+        cls,
+        user_name: str,
+        job_record_id: int,
+        job_id: int,
+        start: datetime,
+        end: datetime,
     ) -> None:
-        """Revise the job record specified by id.
+        """Revise the job record of the user specified by id.
 
         Args:
+            user_name (str): User name
             job_record_id (int): Job record id
             job_id (int): Job id
             start (datetime): Start datetime
@@ -182,21 +250,26 @@ class JobRecord:
         """
         # TODO: 終了したジョブを開始するのに変更できるようにendでnullableを許容する
 
-        db_job_record = models.JobRecord.select_one_by_id(job_record_id)
+        db_job_record = models.JobRecord.select_one_by_id(user_name, job_record_id)
         if db_job_record is None:
             raise LogicException(f"JobRecord(id={job_record_id}) cannot be found")
 
         start = cls.__replace_second_0(start)
         end = cls.__replace_second_0(end)
-        db_job = JobRecord.__judge_if_can_upsert_and_get_job(job_id, start, end)
+        db_job = JobRecord.__judge_if_can_upsert_and_get_job(
+            user_name, job_id, start, end
+        )
         models.JobRecord.update(db_job_record, db_job, start, end)
 
     @classmethod
+    @metrics.timed
+    @routed
     @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def start(cls, job_id: int) -> None:
-        """Start a job record specified by job id.
+    def start(cls, user_name: str, job_id: int) -> None:
+        """Start a job record of the user specified by job id.
 
         Args:
+            user_name (str): User name
             job_id (int): Job id
 
         Raises:
@@ -205,7 +278,7 @@ class JobRecord:
         """
         current_datetime = datetime.now()
         job_record_in_progress = models.JobRecord.select_one_in_progress_by_date(
-            current_datetime.date()
+            user_name, current_datetime.date()
         )
         if job_record_in_progress is not None:
             raise LogicException(
@@ -213,15 +286,18 @@ class JobRecord:
             )
 
         start = cls.__replace_second_0(datetime.now())
-        db_job = cls.__judge_if_can_upsert_and_get_job(job_id, start)
+        db_job = cls.__judge_if_can_upsert_and_get_job(user_name, job_id, start)
         models.JobRecord.insert(db_job, start)
 
     @classmethod
+    @metrics.timed
+    @routed
     @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def stop(cls, job_record_id: int) -> None:
-        """Stop a job record specified by job record id.
+    def stop(cls, user_name: str, job_record_id: int) -> None:
+        """Stop a job record of the user specified by job record id.
 
         Args:
+            user_name (str): User name
             job_record_id (int): Job record id
 
         Raises:
@@ -230,7 +306,7 @@ class JobRecord:
         """
 
         current_datetime = datetime.now()
-        db_job_record = models.JobRecord.select_one_by_id(job_record_id)
+        db_job_record = models.JobRecord.select_one_by_id(user_name, job_record_id)
         if db_job_record is None:
             raise LogicException(f"JobRecord(id={job_record_id}) cannot be found.")
         if db_job_record.end is not None:
@@ -240,9 +316,46 @@ class JobRecord:
 
     # TODO: docstring
     @classmethod
+    @metrics.timed
+    @routed
     @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def acquire_all_finished_by_date(cls, __date: date) -> List[view_models.JobRecord]:
-        db_job_records = models.JobRecord.select_all_finished_by_date(__date)
+    def acquire_all_finished_by_date(
+        cls, user_name: str, __date: date
+    ) -> List[view_models.JobRecord]:
+        if fast_path.is_enabled():
+            return fast_path.select_finished_job_records(user_name, __date, __date)
+
+        db_job_records = models.JobRecord.select_finished_between(
+            user_name, __date, __date
+        )
+        return [
+            view_models.JobRecord.from_orm(db_job_record)
+            for db_job_record in db_job_records
+        ]
+
+    @classmethod
+    @metrics.timed
+    @routed
+    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    def acquire_all_finished_between(
+        cls, user_name: str, start: date, end: date
+    ) -> List[view_models.JobRecord]:
+        """Acquire all finished job records of the user between the dates and convert to view model
+
+        Job records of closed years are acquired from their archives.
+
+        Args:
+            user_name (str): User name
+            start (date): First date
+            end (date): Last date
+
+        Returns:
+            List[view_models.JobRecord]: Job records ordered by start datetime
+        """
+        if fast_path.is_enabled():
+            return fast_path.select_finished_job_records(user_name, start, end)
+
+        db_job_records = models.JobRecord.select_finished_between(user_name, start, end)
         return [
             view_models.JobRecord.from_orm(db_job_record)
             for db_job_record in db_job_records
@@ -250,11 +363,18 @@ class JobRecord:
 
     # TODO: docstring
     @classmethod
+    @metrics.timed
+    @routed
     @db_session(serializable=True, strict=True)  # type: ignore[misc]
     def acquire_one_in_progress_by_date(
-        cls, __date: date
+        cls, user_name: str, __date: date
     ) -> view_models.JobRecord | None:
-        db_job_record = models.JobRecord.select_one_in_progress_by_date(__date)
+        if fast_path.is_enabled():
+            return fast_path.select_job_record_in_progress(user_name, __date)
+
+        db_job_record = models.JobRecord.select_one_in_progress_by_date(
+            user_name, __date
+        )
         if db_job_record is None:
             return None
 
@@ -262,18 +382,95 @@ class JobRecord:
 
 
 class Note:
-    # TODO: docstring
     @classmethod
+    @metrics.timed
+    @routed
     @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def save(cls, __date: date, content: str) -> None:
-        models.Note.upsert(__date, content)
+    def save(
+        cls,
+        user_name: str,
+        __date: date,
+        content: str,
+        *,
+        codec: str | None = None,
+        threshold: int = 4096,
+        preview_length: int = 1000,
+    ) -> None:
+        """Save the note of the user on the date.
+
+        Args:
+            user_name (str): User name
+            __date (date): Date
+            content (str): Content
+            codec (str | None, optional): Codec to compress long content. Not compressed if None.
+            threshold (int, optional): Content longer than this is compressed
+            preview_length (int, optional): Content longer than this gets preview
+
+        Raises:
+            LogicException: Occurs when the codec is not available
+        """
+        try:
+            models.User.insert_if_not_exists(user_name)
+            models.Note.upsert(
+                user_name,
+                __date,
+                content,
+                codec=codec,
+                threshold=threshold,
+                preview_length=preview_length,
+            )
+        except CompressionError as error:
+            raise LogicException(error) from error
 
-    # TODO: docstring
     @classmethod
+    @metrics.timed
+    @routed
     @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def acquire_one_by_date(cls, __date: date) -> view_models.Note | None:
-        db_note = models.Note.select_one_by_date(__date)
+    def acquire_one_by_date(
+        cls, user_name: str, __date: date, *, preview: bool = False
+    ) -> view_models.Note | None:
+        """Acquire the note of the user on the date and convert to view model
+
+        Args:
+            user_name (str): User name
+            __date (date): Date
+            preview (bool, optional): Acquire only the preview of long content
+                without loading the whole content.
+
+        Returns:
+            view_models.Note | None: None if there is no such note.
+        """
+        if fast_path.is_enabled():
+            return fast_path.select_note(user_name, __date, preview=preview)
+
+        db_note = models.Note.select_one_by_date(user_name, __date)
         if db_note is None:
             return None
 
-        return view_models.Note.from_orm(db_note)
+        if preview and db_note.truncated:
+            return view_models.Note(
+                date=db_note.date, content=db_note.preview, truncated=True
+            )
+        return view_models.Note(date=db_note.date, content=db_note.content)
+
+    @classmethod
+    @metrics.timed
+    @routed
+    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    def search(
+        cls, user_name: str, query: str, limit: int = 10
+    ) -> List[view_models.NoteSearchResult]:
+        """Search notes of the user containing all words of the query.
+
+        Args:
+            user_name (str): User name
+            query (str): Words separated by whitespace
+            limit (int, optional): Max number of notes
+
+        Returns:
+            List[view_models.NoteSearchResult]: Dates and snippets ordered by relevance
+        """
+        return [
+            view_models.NoteSearchResult(date=__date, snippet=snippet)
+            for __date, snippet in models.Note.search(user_name, query, limit)
+        ]
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Callable, Final, List, ParamSpec, TypeVar
+
+from pony.orm.core import CommitException
+
+from . import logic, view_models
+from .logic import LogicException
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# NOTE: same as the default size of the connection pool,
+#       so threads do not wait for connections
+DEFAULT_MAX_WORKERS: Final[int] = 10
+# NOTE: calls failing to serialize with concurrent ones on PostgreSQL are retried
+#       after random delays growing exponentially up to MAX_BACKOFF seconds
+MAX_RETRIES: Final[int] = 10
+BACKOFF: Final[float] = 0.01
+MAX_BACKOFF: Final[float] = 0.5
+
+__all__ = ["Category", "Job", "JobRecord", "LogicException", "Note"]
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_max_workers = DEFAULT_MAX_WORKERS
+
+
+def configure(*, max_workers: int) -> None:
+    """Set the max number of threads running the logic.
+
+    The executor already created is shut down after its running calls are finished.
+
+    Args:
+        max_workers (int): Max number of threads, i.e. of concurrent db_sessions
+    """
+    global _max_workers  # pylint: disable=global-statement
+    with _lock:
+        _max_workers = max_workers
+    shutdown()
+
+
+def shutdown() -> None:
+    """Shut down the executor. A new one is created by the next call."""
+    global _executor  # pylint: disable=global-statement
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor  # pylint: disable=global-statement
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_workers, thread_name_prefix="work_report-logic"
+            )
+        return _executor
+
+
+def is_serialization_failure(error: BaseException) -> bool:
+    """Judge if the transaction failed to serialize with concurrent ones, and can be retried.
+
+    Pony marks such errors, but wraps those raised on flush or commit in other errors,
+    so the whole chain of causes is inspected.
+
+    Args:
+        error (BaseException): Error raised by the logic
+
+    Returns:
+        bool: True if the error is a serialization failure
+    """
+    current: BaseException | None = error
+    while current is not None:
+        if getattr(current, "should_retry", False):
+            return True
+        if isinstance(current, CommitException) and any(
+            is_serialization_failure(exc_info[1]) for exc_info in current.exceptions
+        ):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+async def _run(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    # NOTE: the logic runs in a db_session of the thread, and its exceptions are raised as they are
+    loop = asyncio.get_running_loop()
+    retry = 0
+    while True:
+        try:
+            return await loop.run_in_executor(
+                _get_executor(), functools.partial(func, *args, **kwargs)
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            if retry >= MAX_RETRIES or not is_serialization_failure(error):
+                raise
+        # NOTE: the thread is released while waiting
+        await asyncio.sleep(random.uniform(0, min(BACKOFF * 2**retry, MAX_BACKOFF)))
+        retry += 1
+
+
+class Category:
+    @staticmethod
+    async def register(user_name: str, name: str) -> None:
+        """Register a category of the user. See logic.Category.register()
+
+        Raises:
+            LogicException: Occurs when trying to register same category name
+        """
+        await _run(logic.Category.register, user_name, name)
+
+    @staticmethod
+    async def acquire_all(user_name: str) -> List[view_models.Category]:
+        """Acquire all categories of the user. See logic.Category.acquire_all()"""
+        return await _run(logic.Category.acquire_all, user_name)
+
+
+class Job:
+    @staticmethod
+    async def register(
+        user_name: str, job_name: str, category_name: str | None = None
+    ) -> None:
+        """Register a job of the user. See logic.Job.register()
+
+        Raises:
+            LogicException: See logic.Job.register()
+        """
+        await _run(logic.Job.register, user_name, job_name, category_name)
+
+    @staticmethod
+    async def acquire_all(user_name: str) -> List[view_models.Job]:
+        """Acquire all jobs of the user. See logic.Job.acquire_all()"""
+        return await _run(logic.Job.acquire_all, user_name)
+
+
+class JobRecord:
+    @staticmethod
+    async def register(
+        user_name: str, job_id: int, start: datetime, end: datetime
+    ) -> None:
+        """Register a job record of the user. See logic.JobRecord.register()
+
+        Raises:
+            LogicException: See logic.JobRecord.register()
+        """
+        await _run(logic.JobRecord.register, user_name, job_id, start, end)
+
+    @staticmethod
+    async def revise(
+        user_name: str,
+        job_record_id: int,
+        job_id: int,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        """Revise the job record of the user. See logic.JobRecord.revise()
+
+        Raises:
+            LogicException: See logic.JobRecord.revise()
+        """
+        await _run(logic.JobRecord.revise, user_name, job_record_id, job_id, start, end)
+
+    @staticmethod
+    async def start(user_name: str, job_id: int) -> None:
+        """Start a job record of the user. See logic.JobRecord.start()
+
+        Raises:
+            LogicException: See logic.JobRecord.start()
+        """
+        await _run(logic.JobRecord.start, user_name, job_id)
+
+    @staticmethod
+    async def stop(user_name: str, job_record_id: int) -> None:
+        """Stop a job record of the user. See logic.JobRecord.stop()
+
+        Raises:
+            LogicException: See logic.JobRecord.stop()
+        """
+        await _run(logic.JobRecord.stop, user_name, job_record_id)
+
+    @staticmethod
+    async def acquire_all_finished_by_date(
+        user_name: str, __date: date
+    ) -> List[view_models.JobRecord]:
+        """Acquire all finished job records of the user on the date."""
+        return await _run(
+            logic.JobRecord.acquire_all_finished_by_date, user_name, __date
+        )
+
+    @staticmethod
+    async def acquire_all_finished_between(
+        user_name: str, start: date, end: date
+    ) -> List[view_models.JobRecord]:
+        """Acquire all finished job records of the user between the dates.
+        See logic.JobRecord.acquire_all_finished_between()
+        """
+        return await _run(
+            logic.JobRecord.acquire_all_finished_between, user_name, start, end
+        )
+
+    @staticmethod
+    async def acquire_one_in_progress_by_date(
+        user_name: str, __date: date
+    ) -> view_models.JobRecord | None:
+        """Acquire the job record of the user in progress on the date."""
+        return await _run(
+            logic.JobRecord.acquire_one_in_progress_by_date, user_name, __date
+        )
+
+
+class Note:
+    @staticmethod
+    async def save(
+        user_name: str,
+        __date: date,
+        content: str,
+        *,
+        codec: str | None = None,
+        threshold: int = 4096,
+        preview_length: int = 1000,
+    ) -> None:
+        """Save the note of the user on the date. See logic.Note.save()
+
+        Raises:
+            LogicException: Occurs when the codec is not available
+        """
+        await _run(
+            logic.Note.save,
+            user_name,
+            __date,
+            content,
+            codec=codec,
+            threshold=threshold,
+            preview_length=preview_length,
+        )
+
+    @staticmethod
+    async def acquire_one_by_date(
+        user_name: str, __date: date, *, preview: bool = False
+    ) -> view_models.Note | None:
+        """Acquire the note of the user on the date. See logic.Note.acquire_one_by_date()"""
+        return await _run(
+            logic.Note.acquire_one_by_date, user_name, __date, preview=preview
+        )
+
+    @staticmethod
+    async def search(
+        user_name: str, query: str, limit: int = 10
+    ) -> List[view_models.NoteSearchResult]:
+        """Search notes of the user. See logic.Note.search()"""
+        return await _run(logic.Note.search, user_name, query, limit)
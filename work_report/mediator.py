@@ -1,57 +1,277 @@
+import functools
+import hashlib
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import date, datetime
-from typing import Any
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, Hashable, NamedTuple, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from . import locale, logic, session_storage
-from .config import DatabaseSettings
+from . import fast_path, locale, logic, metrics, session_storage
+from .config import AppSettings, DatabaseSettings
 from .database.database import DatabaseSingleton
+from .profiling import Profiler
+from .write_queue import WriteQueue
+
+app_settings = AppSettings()
 
-# init database
 settings = DatabaseSettings()
 db = DatabaseSingleton.get_instance()
-db.bind(**settings.dict_bind())
-db.generate_mapping(create_tables=settings.create_tables)
+
+# init write queue shared by all sessions
+write_queue = WriteQueue(
+    max_retries=settings.write_queue_max_retries,
+    backoff=settings.write_queue_backoff,
+)
+
+# load the data of each rerun concurrently if the number of threads is configured
+# NOTE: created by init_database() once the database is bound
+load_executor: ThreadPoolExecutor | None = None
+
+# serve metrics of all sessions if the port is configured
+metrics_server = (
+    metrics.start_http_server(app_settings.metrics_port, app_settings.metrics_host)
+    if app_settings.metrics_port is not None
+    else None
+)
+
+
+def _init_load_executor() -> None:
+    global load_executor  # pylint: disable=global-statement
+    # NOTE: each thread of the executor starts its own db_session,
+    #       so the data are not seen if the database is private to a thread
+    if app_settings.load_workers is not None and db.is_shared_by_threads():
+        load_executor = ThreadPoolExecutor(
+            max_workers=app_settings.load_workers, thread_name_prefix="work_report-load"
+        )
+
+
+def init_database() -> None:
+    """Bind the database and generate mapping unless already bound.
+
+    Called on every rerun, but binds only once per process.
+    """
+    if db.provider is None:
+        db.configure_query_log(
+            slow_query_threshold=settings.slow_query_threshold,
+            session_statement_threshold=settings.session_statement_threshold,
+        )
+        db.bind(**settings.dict_bind())
+        # NOTE: SQLite connections are cheap, and :memory: databases are not shared
+        if settings.provider != "sqlite" and settings.pool_size is not None:
+            db.use_shared_pool(size=settings.pool_size, timeout=settings.pool_timeout)
+        db.generate_mapping(create_tables=settings.create_tables)
+        if settings.provider == "sqlite" and settings.shard_filename is not None:
+            db.use_sharding(settings.shard_filename, max_shards=settings.max_shards)
+        fast_path.configure(enabled=settings.fast_path)
+        _init_load_executor()
+
+
+class Dataset(str, Enum):
+    """Data loaded by the mediator on each rerun"""
+
+    jobs = "jobs"
+    job_records = "job_records"
+    job_record_in_progress = "job_record_in_progress"
+    categories = "categories"
+    note = "note"
+    note_search_results = "note_search_results"
+
+
+# NOTE: data which are None instead of an empty list if not loaded
+OPTIONAL_DATASETS: FrozenSet[Dataset] = frozenset(
+    {Dataset.job_record_in_progress, Dataset.note}
+)
+
+# NOTE: phase names of the profiler
+LOAD_PHASES: Dict[Dataset, str] = {
+    Dataset.jobs: "logic.Job.acquire_all",
+    Dataset.job_records: "logic.JobRecord.acquire_all_finished_by_date",
+    Dataset.job_record_in_progress: "logic.JobRecord.acquire_one_in_progress_by_date",
+    Dataset.categories: "logic.Category.acquire_all",
+    Dataset.note: "logic.Note.acquire_one_by_date",
+    Dataset.note_search_results: "logic.Note.search",
+}
+
+
+class PendingWrite(NamedTuple):
+    # NOTE: debounced writes are not waited for on the next rerun
+    waits: bool
+    # NOTE: data changed by the write, which are not reused until it is done
+    datasets: FrozenSet[Dataset]
+
+
+class LoadedData(NamedTuple):
+    # NOTE: the data are reused only by reruns fetching them with the same arguments
+    arguments: Tuple[Any, ...]
+    loaded_at: float
+    value: Any
 
 
 class Mediator(BaseModel):
     storage: session_storage.SessionStorage
+    profiler: Profiler = Field(default_factory=Profiler)
+    # NOTE: data not included are left empty, i.e. not used by any rendered colleague
+    datasets: FrozenSet[Dataset] = frozenset(Dataset)
 
     def __init__(self, **data: Any) -> None:
         super().__init__(**data)
 
-        # 日付の初期化・取得
+        # ユーザー・日付の初期化・取得
+        self.storage.init_state(self.storage.key_user.name, app_settings.default_user)
         self.storage.init_state(self.storage.key_date_selection.input, date.today())
-        selected_date: date = self.storage.get_selected_date()
 
-        # DBからデータを取得してstorageにセット
-        self.storage.set_jobs(logic.Job.acquire_all())
-        self.storage.set_job_records(
-            logic.JobRecord.acquire_all_finished_by_date(selected_date)
+        # 書き込みキューの完了待ち
+        with self.profiler.measure("Mediator.wait_pending_writes"):
+            self.__wait_pending_writes()
+
+        # DBからデータを取得してstorageにセット(使われないデータは空にする)
+        self.__load(self.datasets)
+        for dataset in Dataset:
+            if dataset not in self.datasets:
+                self.__store(dataset, None if dataset in OPTIONAL_DATASETS else [])
+
+        with self.profiler.measure("Mediator.init_state"):
+            # デフォルト言語設定
+            self.__change_language()
+
+            # 初期化
+            self.__init_message_area()
+            self.__notify_pending_writes()
+            self.__init_note_area()
+
+            # 状態変更
+            self.__change_state_job_timer()
+            self.__change_state_job_creation()
+            self.__change_state_job_addition_manually()
+
+    def __load(self, datasets: FrozenSet[Dataset]) -> None:
+        """Load the data from the database and set them to the storage.
+
+        The data loaded by a previous rerun of the session are reused within session_data_ttl,
+        unless their arguments have changed or a write of the session has changed them.
+        The others are loaded concurrently if load_executor is configured.
+        """
+        # NOTE: arguments are read here because the session state is not available in other threads
+        fetchers = {
+            dataset: fetcher
+            for dataset, fetcher in self.__get_fetchers().items()
+            if dataset in datasets
+        }
+
+        now = time.monotonic()
+        loaded = self.__get_loaded_data()
+        for dataset, fetcher in list(fetchers.items()):
+            cached = loaded.get(dataset)
+            if (
+                cached is None
+                or cached.arguments != self.__get_arguments(fetcher)
+                or app_settings.session_data_ttl is None
+                or now - cached.loaded_at >= app_settings.session_data_ttl
+            ):
+                metrics.record_cache_request("session_data", False)
+                continue
+            metrics.record_cache_request("session_data", True)
+            self.__store(dataset, cached.value)
+            del fetchers[dataset]
+
+        values = self.__fetch(fetchers)
+        for dataset, value in values.items():
+            self.__store(dataset, value)
+
+        # NOTE: data which pending writes are changing would be stale on the next rerun
+        if app_settings.session_data_ttl is None:
+            return
+        changing = frozenset().union(
+            *(write.datasets for write in self.__get_pending_writes().values())
         )
-        self.storage.set_job_record_in_progress(
-            logic.JobRecord.acquire_one_in_progress_by_date(selected_date)
+        for dataset, value in values.items():
+            if dataset not in changing:
+                loaded[dataset] = LoadedData(
+                    self.__get_arguments(fetchers[dataset]), now, value
+                )
+        self.storage.set_state(self.storage.key_session_data.loaded, loaded)
+
+    def __fetch(
+        self, fetchers: Dict[Dataset, functools.partial[Any]]
+    ) -> Dict[Dataset, Any]:
+        if load_executor is None or len(fetchers) < 2:
+            values: Dict[Dataset, Any] = {}
+            for dataset, fetcher in fetchers.items():
+                with self.profiler.measure(LOAD_PHASES[dataset]):
+                    values[dataset] = fetcher()
+            return values
+
+        # NOTE: each fetcher runs in its own db_session of the thread
+        with self.profiler.measure("Mediator.load_concurrently"):
+            futures = {
+                dataset: load_executor.submit(fetcher)
+                for dataset, fetcher in fetchers.items()
+            }
+            return {dataset: future.result() for dataset, future in futures.items()}
+
+    @staticmethod
+    def __get_arguments(fetcher: functools.partial[Any]) -> Tuple[Any, ...]:
+        return fetcher.args, tuple(sorted(fetcher.keywords.items()))
+
+    def __get_loaded_data(self) -> Dict[Dataset, LoadedData]:
+        loaded: Dict[Dataset, LoadedData] | None = self.storage.get_state(
+            self.storage.key_session_data.loaded
         )
-        self.storage.set_categories(logic.Category.acquire_all())
-        self.storage.set_note(logic.Note.acquire_one_by_date(selected_date))
-
-        # デフォルト言語設定
-        self.__change_language()
+        return loaded or {}
 
-        # 初期化
-        self.__init_message_area()
-
-        # 状態変更
-        self.__change_state_job_timer()
-        self.__change_state_job_creation()
-        self.__change_state_job_addition_manually()
+    def __get_fetchers(self) -> Dict[Dataset, functools.partial[Any]]:
+        user_name = self.storage.get_user_name()
+        selected_date = self.storage.get_selected_date()
+        return {
+            Dataset.jobs: functools.partial(logic.Job.acquire_all, user_name),
+            Dataset.job_records: functools.partial(
+                logic.JobRecord.acquire_all_finished_by_date, user_name, selected_date
+            ),
+            Dataset.job_record_in_progress: functools.partial(
+                logic.JobRecord.acquire_one_in_progress_by_date,
+                user_name,
+                selected_date,
+            ),
+            Dataset.categories: functools.partial(
+                logic.Category.acquire_all, user_name
+            ),
+            Dataset.note: functools.partial(
+                logic.Note.acquire_one_by_date,
+                user_name,
+                selected_date,
+                preview=self.storage.get_state(self.storage.key_note_area.expanded_date)
+                != selected_date,
+            ),
+            Dataset.note_search_results: functools.partial(
+                logic.Note.search,
+                user_name,
+                self.storage.get_state(self.storage.key_note_search.input) or "",
+            ),
+        }
+
+    def __store(self, dataset: Dataset, value: Any) -> None:
+        match dataset:
+            case Dataset.jobs:
+                self.storage.set_jobs(value)
+            case Dataset.job_records:
+                self.storage.set_job_records(value)
+            case Dataset.job_record_in_progress:
+                self.storage.set_job_record_in_progress(value)
+            case Dataset.categories:
+                self.storage.set_categories(value)
+            case Dataset.note:
+                self.storage.set_note(value)
+            case Dataset.note_search_results:
+                self.storage.set_note_search_results(value)
 
     def __change_language(self) -> None:
-        language = self.storage.get_state(self.storage.key_language_selection.selectbox)
-        if language:
-            self.storage.set_language(language)
+        code = self.storage.get_state(self.storage.key_language_selection.selectbox)
+        if code:
+            self.storage.set_language(code)
         else:
-            self.storage.set_language(locale.LanguageEN())
+            self.storage.set_language(locale.languages.default_code)
 
     def __change_state_job_timer(self) -> None:
         disabled_selectbox: bool = True
@@ -172,75 +392,244 @@ class Mediator(BaseModel):
         self.storage.init_state(self.storage.key_message_area.error, None)
         self.storage.init_state(self.storage.key_message_area.exception, None)
 
+    def __init_note_area(self) -> None:
+        self.storage.init_state(self.storage.key_note_area.checkbox_autosave, False)
+
+        selected_date = self.storage.get_selected_date()
+        note = self.storage.get_note()
+        content = "" if note is None or note.content is None else note.content
+
+        # NOTE: keep the hash of the last submitted content while its write is pending
+        saved_hash = self.storage.get_state(self.storage.key_note_area.saved_hash)
+        if (
+            saved_hash is None
+            or saved_hash[0] != selected_date
+            or not self.__get_pending_writes()
+        ):
+            self.storage.set_state(
+                self.storage.key_note_area.saved_hash,
+                (selected_date, self.__hash_content(content)),
+            )
+
+        # NOTE: seed the text area with the saved content once per date,
+        #       and keep what the user typed afterwards even if the saved content changes
+        if note is not None and note.truncated:
+            return
+        if (
+            self.storage.get_state(self.storage.key_note_area.text_area_date)
+            != selected_date
+            or self.storage.get_state(self.storage.key_note_area.text_area) is None
+        ):
+            self.storage.set_state(self.storage.key_note_area.text_area, content)
+            self.storage.set_state(
+                self.storage.key_note_area.text_area_date, selected_date
+            )
+
+    @staticmethod
+    def __hash_content(content: str) -> str:
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def __save_note(self, *, delay: float = 0.0, force: bool = False) -> None:
+        """Submit the note content to the write queue.
+
+        Args:
+            delay (float): Seconds to wait before saving
+            force (bool): Save even if the content is unchanged since the last save
+        """
+        content: str = self.storage.get_state(self.storage.key_note_area.text_area)
+        user_name = self.storage.get_user_name()
+        selected_date = self.storage.get_selected_date()
+        saved_hash = (selected_date, self.__hash_content(content))
+        unchanged = (
+            self.storage.get_state(self.storage.key_note_area.saved_hash) == saved_hash
+        )
+        if unchanged and not force:
+            return
+
+        # NOTE: bursts of saves for the same date are coalesced into the last one
+        self.__submit_write(
+            functools.partial(
+                logic.Note.save,
+                codec=settings.note_codec,
+                threshold=settings.note_compression_threshold,
+                preview_length=settings.note_preview_length,
+            ),
+            user_name,
+            selected_date,
+            content,
+            datasets=frozenset({Dataset.note, Dataset.note_search_results}),
+            key=("note", user_name, selected_date),
+            delay=delay,
+        )
+        self.storage.set_state(self.storage.key_note_area.saved_hash, saved_hash)
+
     def __set_error(self, error: Exception) -> None:
         self.storage.set_state(self.storage.key_message_area.error, error)
 
+    def __get_pending_writes(self) -> Dict[Future[Any], PendingWrite]:
+        """Get futures of pending writes mapped to the writes."""
+        futures: Dict[Future[Any], PendingWrite] | None = self.storage.get_state(
+            self.storage.key_write_queue.futures
+        )
+        return futures or {}
+
+    def __submit_write(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        datasets: FrozenSet[Dataset],
+        key: Hashable | None = None,
+        delay: float = 0.0,
+    ) -> None:
+        """Submit a write to the write queue.
+
+        Args:
+            func (Callable[..., Any]): Logic function writing the data
+            datasets (FrozenSet[Dataset]): Data changed by the write, which are loaded again
+            key (Hashable | None, optional): Writes with the same key are coalesced
+            delay (float, optional): Seconds to wait before writing
+        """
+        future = write_queue.submit(func, *args, key=key, delay=delay)
+        futures = self.__get_pending_writes()
+        futures[future] = PendingWrite(waits=delay == 0.0, datasets=datasets)
+        self.storage.set_state(self.storage.key_write_queue.futures, futures)
+
+        loaded = self.__get_loaded_data()
+        for dataset in datasets:
+            loaded.pop(dataset, None)
+        self.storage.set_state(self.storage.key_session_data.loaded, loaded)
+
+    def __wait_pending_writes(self) -> None:
+        metrics.write_queue_depth.observe(write_queue.depth())
+        futures = self.__get_pending_writes()
+        wait(
+            [future for future, write in futures.items() if write.waits],
+            timeout=settings.write_queue_wait_timeout,
+        )
+
+        pending: Dict[Future[Any], PendingWrite] = {}
+        for future, write in futures.items():
+            if not future.done():
+                pending[future] = write
+                continue
+
+            error = future.exception()
+            if isinstance(error, logic.LogicException):
+                self.__set_error(error)
+            elif error is not None:
+                raise error
+        self.storage.set_state(self.storage.key_write_queue.futures, pending)
+
+    def __notify_pending_writes(self) -> None:
+        if self.__get_pending_writes():
+            self.storage.set_state(
+                self.storage.key_message_area.info,
+                self.storage.get_language().message_area_pending_write,
+            )
+
     def click_today(self) -> None:
         self.storage.set_state(self.storage.key_date_selection.input, date.today())
 
     def click_start_job(self) -> None:
         job = self.storage.get_state(self.storage.key_job_timer.selectbox)
-        logic.JobRecord.start(job.id)
+        self.__submit_write(
+            logic.JobRecord.start,
+            self.storage.get_user_name(),
+            job.id,
+            datasets=frozenset({Dataset.job_record_in_progress}),
+        )
 
     def click_stop_job(self) -> None:
         job_record_in_progress = self.storage.get_job_record_in_progress()
         if job_record_in_progress is None:
             raise Exception("!?!?!?")
-        logic.JobRecord.stop(job_record_in_progress.id)
+        self.__submit_write(
+            logic.JobRecord.stop,
+            self.storage.get_user_name(),
+            job_record_in_progress.id,
+            datasets=frozenset({Dataset.job_records, Dataset.job_record_in_progress}),
+        )
 
     def click_create_job_or_category(self) -> None:
         value_radio = self.storage.get_state(self.storage.key_job_creation.radio)
         value_input = self.storage.get_state(self.storage.key_job_creation.input)
         value_category = self.storage.get_state(self.storage.key_job_creation.selectbox)
         value_checkbox = self.storage.get_state(self.storage.key_job_creation.checkbox)
+        user_name = self.storage.get_user_name()
 
-        try:
-            match value_radio:
-                case session_storage.RadioJobCreation.job.value:
-                    if value_checkbox:
-                        logic.Job.register(value_input)
-                    else:
-                        logic.Job.register(value_input, value_category.name)
-                case session_storage.RadioJobCreation.category.value:
-                    logic.Category.register(value_input)
-                case _:
-                    # TODO: handle error properly
-                    raise Exception("!?!?!?")
-        except logic.LogicException as error:
-            self.__set_error(error)
+        match value_radio:
+            case session_storage.RadioJobCreation.job.value:
+                if value_checkbox:
+                    self.__submit_write(
+                        logic.Job.register,
+                        user_name,
+                        value_input,
+                        datasets=frozenset({Dataset.jobs}),
+                    )
+                else:
+                    self.__submit_write(
+                        logic.Job.register,
+                        user_name,
+                        value_input,
+                        value_category.name,
+                        datasets=frozenset({Dataset.jobs}),
+                    )
+            case session_storage.RadioJobCreation.category.value:
+                self.__submit_write(
+                    logic.Category.register,
+                    user_name,
+                    value_input,
+                    datasets=frozenset({Dataset.categories}),
+                )
+            case _:
+                # TODO: handle error properly
+                raise Exception("!?!?!?")
 
     def click_add_job_record(self) -> None:
         job = self.storage.get_state(self.storage.key_job_addition_manually.selectbox)
         start_time, end_time = self.storage.get_state(
             self.storage.key_job_addition_manually.slider
         )
-        try:
-            logic.JobRecord.register(
-                job.id,
-                datetime.combine(self.storage.get_selected_date(), start_time),
-                datetime.combine(self.storage.get_selected_date(), end_time),
-            )
-        except logic.LogicException as error:
-            self.__set_error(error)
+        self.__submit_write(
+            logic.JobRecord.register,
+            self.storage.get_user_name(),
+            job.id,
+            datetime.combine(self.storage.get_selected_date(), start_time),
+            datetime.combine(self.storage.get_selected_date(), end_time),
+            datasets=frozenset({Dataset.job_records}),
+        )
 
     def click_edit_job_log(
         self, key_selectbox: str, key_slider: str, job_record_id: int
     ) -> None:
         job = self.storage.get_state(key_selectbox)
         time_start, time_end = self.storage.get_state(key_slider)
-        try:
-            logic.JobRecord.revise(
-                job_record_id,
-                job.id,
-                datetime.combine(self.storage.get_selected_date(), time_start),
-                datetime.combine(self.storage.get_selected_date(), time_end),
-            )
-        except logic.LogicException as error:
-            self.__set_error(error)
+        self.__submit_write(
+            logic.JobRecord.revise,
+            self.storage.get_user_name(),
+            job_record_id,
+            job.id,
+            datetime.combine(self.storage.get_selected_date(), time_start),
+            datetime.combine(self.storage.get_selected_date(), time_end),
+            datasets=frozenset({Dataset.job_records}),
+        )
 
     def click_save_note(self) -> None:
-        content = self.storage.get_state(self.storage.key_note_area.text_area)
-        logic.Note.save(self.storage.get_selected_date(), content)
+        # NOTE: flush the debounced autosave immediately if it is pending
+        self.__save_note(force=True)
+
+    def change_note(self) -> None:
+        if not self.storage.get_state(self.storage.key_note_area.checkbox_autosave):
+            return
+        self.__save_note(delay=app_settings.note_autosave_delay)
+
+    def click_expand_note(self) -> None:
+        self.storage.set_state(
+            self.storage.key_note_area.expanded_date, self.storage.get_selected_date()
+        )
+
+    def click_note_search_result(self, __date: date) -> None:
+        self.storage.set_state(self.storage.key_date_selection.input, __date)
 
     def draw_message(self) -> None:
         self.storage.set_state(self.storage.key_message_area.info, None)
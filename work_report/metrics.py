@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import bisect
+import functools
+import inspect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Final, List, ParamSpec, Sequence, Tuple, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS: Final[Tuple[float, ...]] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    """Monotonically increasing value for each combination of labels."""
+
+    kind: Final[str] = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.__lock = threading.Lock()
+        self.__values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.__lock:
+            self.__values[key] = self.__values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        with self.__lock:
+            return self.__values.get(tuple(sorted(labels.items())), 0.0)
+
+    def samples(self) -> List[str]:
+        with self.__lock:
+            return [
+                f"{self.name}{_format_labels(key)} {value}"
+                for key, value in sorted(self.__values.items())
+            ]
+
+
+class Histogram:
+    """Distribution of observed values counted in cumulative buckets."""
+
+    kind: Final[str] = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.__lock = threading.Lock()
+        # NOTE: counts per bucket (the last one is +Inf), and the sum of values
+        self.__values: Dict[Labels, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.__lock:
+            counts, total = self.__values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.__values[key] = (counts, total + value)
+
+    def get_count(self, **labels: str) -> int:
+        with self.__lock:
+            counts, _ = self.__values.get(tuple(sorted(labels.items())), ([], 0.0))
+            return sum(counts)
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self.__lock:
+            for key, (counts, total) in sorted(self.__values.items()):
+                cumulative = 0
+                for bound, count in zip([*self.buckets, float("inf")], counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else str(bound)
+                    labels = _format_labels((*key, ("le", le)))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+M = TypeVar("M", Counter, Histogram)
+
+
+class Registry:
+    """Set of metrics rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__metrics: Dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self.__register(Counter(name, documentation))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.__register(Histogram(name, documentation, buckets))
+
+    def render(self) -> str:
+        """Render all metrics.
+
+        Returns:
+            str: Metrics in the Prometheus text exposition format
+        """
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def __register(self, metric: M) -> M:
+        with self.__lock:
+            if metric.name in self.__metrics:
+                raise ValueError(f"Metric({metric.name}) is already registered")
+            self.__metrics[metric.name] = metric
+        return metric
+
+
+registry = Registry()
+
+rerun_seconds = registry.histogram(
+    "work_report_rerun_seconds", "Seconds to run the script on each rerun"
+)
+logic_seconds = registry.histogram(
+    "work_report_logic_seconds", "Seconds of database transactions per logic method"
+)
+logic_errors = registry.counter(
+    "work_report_logic_errors_total", "Logic methods raising errors"
+)
+write_queue_depth = registry.histogram(
+    "work_report_write_queue_depth",
+    "Waiting writes in the write queue observed on each rerun",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+state_writes = registry.histogram(
+    "work_report_state_writes",
+    "Session state keys written on each rerun",
+    buckets=(0, 1, 2, 5, 10, 20, 50),
+)
+cache_requests = registry.counter(
+    "work_report_cache_requests_total", "Cache lookups by cache name and result"
+)
+statements = registry.counter(
+    "work_report_statements_total", "SQL statements executed by all sessions"
+)
+slow_statements = registry.counter(
+    "work_report_slow_statements_total",
+    "SQL statements taking longer than slow_query_threshold",
+)
+
+
+def timed(func: Callable[P, R]) -> Callable[P, R]:
+    """Decorate a logic method to observe its duration in logic_seconds.
+
+    The method is labelled by its qualified name, e.g. "Job.acquire_all",
+    looked up through decorators such as db_session.
+
+    Args:
+        func (Callable[P, R]): Logic method
+
+    Returns:
+        Callable[P, R]: Decorated method
+    """
+    method = inspect.unwrap(func).__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            logic_errors.inc(method=method)
+            raise
+        finally:
+            logic_seconds.observe(time.perf_counter() - start, method=method)
+
+    return wrapper
+
+
+def record_cache_request(cache: str, hit: bool) -> None:
+    """Count a cache lookup.
+
+    Args:
+        cache (str): Cache name
+        hit (bool): Whether the value was found in the cache
+    """
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry: Registry
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(
+        self, format: str, *args: object  # pylint: disable=redefined-builtin
+    ) -> None:
+        pass
+
+
+def start_http_server(
+    port: int, host: str = "127.0.0.1", target: Registry = registry
+) -> ThreadingHTTPServer:
+    """Serve the metrics at http://host:port/metrics on a background thread.
+
+    Args:
+        port (int): Port. A free port is chosen if 0.
+        host (str, optional): Host
+        target (Registry, optional): Registry to serve
+
+    Returns:
+        ThreadingHTTPServer: Server. Call shutdown() to stop it.
+    """
+    handler = type("Handler", (_Handler,), {"registry": target})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(
+        target=server.serve_forever, name="work_report-metrics", daemon=True
+    )
+    thread.start()
+    return server
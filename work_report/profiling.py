@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Tuple
+
+from .database.database import DatabaseSingleton
+
+logger = logging.getLogger(__name__)
+
+
+class Record(NamedTuple):
+    name: str
+    depth: int
+    elapsed: float
+    sql_count: int
+    sql_time: float
+
+
+def sql_totals() -> Tuple[int, float]:
+    """Sum up Pony's statistics of SQL executed in the current thread.
+
+    Returns:
+        Tuple[int, float]: The number of executed statements and their total seconds
+    """
+    stats = DatabaseSingleton.get_instance().local_stats
+    count = 0
+    seconds = 0.0
+    for stat in stats.values():
+        count += stat.db_count
+        seconds += stat.sum_time or 0.0
+    return count, seconds
+
+
+class Profiler:
+    """Wall time and SQL statistics of the phases of one rerun.
+
+    Phases can be nested, and are recorded in the order they are finished.
+    Nothing is measured when disabled.
+    """
+
+    def __init__(self, *, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.__records: List[Record] = []
+        self.__depth = 0
+        self.__start = time.perf_counter()
+        self.__start_sql = sql_totals() if enabled else (0, 0.0)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Measure the phase executed inside the with statement.
+
+        Args:
+            name (str): Phase name
+        """
+        if not self.enabled:
+            yield
+            return
+
+        depth = self.__depth
+        self.__depth += 1
+        start = time.perf_counter()
+        start_count, start_seconds = sql_totals()
+        try:
+            yield
+        finally:
+            end_count, end_seconds = sql_totals()
+            self.__depth = depth
+            self.__records.append(
+                Record(
+                    name=name,
+                    depth=depth,
+                    elapsed=time.perf_counter() - start,
+                    sql_count=end_count - start_count,
+                    sql_time=end_seconds - start_seconds,
+                )
+            )
+
+    def get_records(self) -> List[Record]:
+        return list(self.__records)
+
+    def summarize(self) -> Dict[str, Any]:
+        """Summarize the rerun until now.
+
+        Returns:
+            Dict[str, Any]: Total wall time and SQL statistics with each phase
+        """
+        count, seconds = sql_totals()
+        return {
+            "elapsed": time.perf_counter() - self.__start,
+            "sql_count": count - self.__start_sql[0],
+            "sql_time": seconds - self.__start_sql[1],
+            "phases": [record._asdict() for record in self.__records],
+        }
+
+    def log(self) -> None:
+        """Write the summary as a JSON log line if enabled."""
+        if self.enabled:
+            logger.info(json.dumps({"event": "rerun", **self.summarize()}))
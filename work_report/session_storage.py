@@ -1,12 +1,17 @@
 from datetime import date
 from enum import Enum
-from typing import Any, List, cast
+from typing import Any, List, Set, cast
 
 from pydantic import BaseModel, PrivateAttr
 from streamlit.state import SessionStateProxy
 
 from . import locale
-from .view_models import Category, Job, JobRecord, Note
+from .view_models import Category, Job, JobRecord, Note, NoteSearchResult
+
+
+class KeyUser(str, Enum):
+    __base = "user"
+    name = f"{__base}_name"
 
 
 class KeyMessageArea(str, Enum):
@@ -17,6 +22,17 @@ class KeyMessageArea(str, Enum):
     exception = f"{__base}_exception"
 
 
+class KeyWriteQueue(str, Enum):
+    __base = "write_queue"
+    futures = f"{__base}_futures"
+
+
+class KeySessionData(str, Enum):
+    __base = "session_data"
+    # NOTE: data loaded by the mediator and reused by later reruns
+    loaded = f"{__base}_loaded"
+
+
 class KeyDateSelection(str, Enum):
     __base = "date_selection"
     input = f"{__base}_date_input"
@@ -41,6 +57,8 @@ class KeyJobTimer(str, Enum):
 class KeyTimelineChart(str, Enum):
     __base = "timeline_chart"
     chart = f"{__base}_chart"
+    # NOTE: figure reused by later reruns with the data drawn in it
+    figure = f"{__base}_figure"
 
 
 class KeyJobAdditionManually(str, Enum):
@@ -75,6 +93,18 @@ class KeyJobLogs(str, Enum):
 class KeyNoteArea(str, Enum):
     __base = "note_area"
     text_area = f"{__base}_text_area"
+    # NOTE: date whose note the text area is seeded with
+    text_area_date = f"{text_area}_date"
+    button = f"{__base}_button"
+    checkbox_autosave = f"{__base}_checkbox_autosave"
+    saved_hash = f"{__base}_saved_hash"
+    button_expand = f"{__base}_button_expand"
+    expanded_date = f"{__base}_expanded_date"
+
+
+class KeyNoteSearch(str, Enum):
+    __base = "note_search"
+    input = f"{__base}_input"
     button = f"{__base}_button"
 
 
@@ -83,6 +113,12 @@ class KeyLanguageSelection(str, Enum):
     selectbox = f"{__base}_selectbox"
 
 
+class KeyLayout(str, Enum):
+    __base = "layout"
+    # NOTE: suffixed by the panel name
+    checkbox_expanded = f"{__base}_checkbox_expanded"
+
+
 class RadioJobCreation(str, Enum):
     job = "job"
     category = "category"
@@ -94,7 +130,10 @@ class RadioJobCreation(str, Enum):
 
 class SessionStorage(BaseModel):
     state: SessionStateProxy
+    key_user: KeyUser = KeyUser  # type: ignore[assignment]
     key_message_area: KeyMessageArea = KeyMessageArea  # type: ignore[assignment]
+    key_write_queue: KeyWriteQueue = KeyWriteQueue  # type: ignore[assignment]
+    key_session_data: KeySessionData = KeySessionData  # type: ignore[assignment]
     key_date_selection: KeyDateSelection = KeyDateSelection  # type: ignore[assignment]
     key_working_hours_schedule: KeyWorkingHoursSchedule = KeyWorkingHoursSchedule  # type: ignore[assignment]
     key_job_timer: KeyJobTimer = KeyJobTimer  # type: ignore[assignment]
@@ -103,7 +142,9 @@ class SessionStorage(BaseModel):
     key_job_creation: KeyJobCreation = KeyJobCreation  # type: ignore[assignment]
     key_job_logs: KeyJobLogs = KeyJobLogs  # type: ignore[assignment]
     key_note_area: KeyNoteArea = KeyNoteArea  # type: ignore[assignment]
+    key_note_search: KeyNoteSearch = KeyNoteSearch  # type: ignore[assignment]
     key_language_selection: KeyLanguageSelection = KeyLanguageSelection  # type: ignore[assignment]
+    key_layout: KeyLayout = KeyLayout  # type: ignore[assignment]
 
     job_creation_radio_values: List[str] = RadioJobCreation.get_values()
 
@@ -113,21 +154,56 @@ class SessionStorage(BaseModel):
     __job_record_in_progress: JobRecord | None = PrivateAttr()
     __categories: List[Category] = PrivateAttr()
     __note: Note | None = PrivateAttr()
+    __note_search_results: List[NoteSearchResult] = PrivateAttr()
+    __language_code: str = PrivateAttr()
     __language: locale.Language = PrivateAttr()
+    # NOTE: keys written since this storage is created, i.e. on this rerun
+    __changed_keys: Set[str] = PrivateAttr(default_factory=set)
 
     def init_state(self, key: str, value: Any) -> None:
         if key not in self.state:
-            self.state[key] = value
+            self.__write_state(key, value)
 
     def set_state(self, key: str, value: Any, *, do_init: bool = False) -> None:
+        """Set the value to the session state only if it is changed.
+
+        Writing the same value again makes streamlit compare and send the widget for nothing.
+
+        Args:
+            key (str): Key
+            value (Any): Value
+            do_init (bool, optional): Initialize the state before setting
+        """
         if do_init:
             self.init_state(key, value)
 
+        if key in self.state:
+            current = self.state[key]
+            # NOTE: compared with types, e.g. 1 and True are equal but different values
+            if type(current) is type(value) and current == value:
+                return
+        self.__write_state(key, value)
+
+    def get_changed_keys(self) -> Set[str]:
+        """Get the keys whose values are written on this rerun.
+
+        Only counted by the metric of state writes. Rendering of widgets is not skipped by them.
+
+        Returns:
+            Set[str]: Changed keys
+        """
+        return set(self.__changed_keys)
+
+    def __write_state(self, key: str, value: Any) -> None:
         self.state[key] = value
+        self.__changed_keys.add(key)
 
     def get_state(self, key: str) -> Any:
         return self.state.get(key, None)
 
+    def get_user_name(self) -> str:
+        return cast(str, self.get_state(self.key_user.name))
+
     def get_selected_date(self) -> date:
         return cast(date, self.get_state(self.key_date_selection.input))
 
@@ -161,14 +237,27 @@ class SessionStorage(BaseModel):
     def get_note(self) -> Note | None:
         return self.__note
 
-    def set_language(self, language: locale.Language) -> None:
-        self.__language = language
+    def set_note_search_results(self, results: List[NoteSearchResult]) -> None:
+        self.__note_search_results = results
+
+    def get_note_search_results(self) -> List[NoteSearchResult]:
+        return self.__note_search_results
+
+    def set_language(self, code: str) -> None:
+        self.__language_code = code
+        self.__language = locale.languages.get(code)
 
     def get_language(self) -> locale.Language:
         return self.__language
 
-    def get_languages(self) -> List[locale.Language]:
-        return [locale.LanguageEN(), locale.LanguageJP()]
+    def get_language_code(self) -> str:
+        return self.__language_code
+
+    def get_language_codes(self) -> List[str]:
+        return locale.languages.get_codes()
+
+    def get_language_name(self, code: str) -> str:
+        return locale.languages.get_name(code)
 
     class Config:
         allow_mutation = False
@@ -14,6 +14,8 @@ class Category(BaseModel):
 
     class Config:
         orm_mode = True
+        # NOTE: instances are shared by all sessions through the catalog
+        allow_mutation = False
 
 
 class Job(BaseModel):
@@ -35,6 +37,8 @@ class Job(BaseModel):
 
     class Config:
         orm_mode = True
+        # NOTE: instances are shared by all sessions through the catalog
+        allow_mutation = False
 
 
 class JobRecord(BaseModel):
@@ -56,6 +60,13 @@ class JobRecord(BaseModel):
 class Note(BaseModel):
     date: date
     content: StrictStr | None
+    # NOTE: True if content is the preview of the longer content
+    truncated: bool = False
 
     class Config:
         orm_mode = True
+
+
+class NoteSearchResult(BaseModel):
+    date: date
+    snippet: StrictStr
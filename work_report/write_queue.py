@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Hashable, Tuple
+
+LOCKED_MESSAGE = "database is locked"
+
+
+class WriteQueueClosedError(Exception):
+    pass
+
+
+class _Task:
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        args: Tuple[Any, ...],
+        key: Hashable | None,
+        due: float,
+    ) -> None:
+        self.func = func
+        self.args = args
+        self.key = key
+        self.due = due
+        self.future: Future[Any] = Future()
+
+
+def is_database_locked(error: BaseException) -> bool:
+    """Judge if the error is caused by a locked SQLite database.
+
+    Pony wraps the sqlite3 error (e.g. in CommitException),
+    so the whole chain of causes is inspected.
+
+    Args:
+        error (BaseException): Error
+
+    Returns:
+        bool: True if the error means "database is locked"
+    """
+    current: BaseException | None = error
+    while current is not None:
+        if LOCKED_MESSAGE in str(current):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+class WriteQueue:
+    """Single-writer queue executing database writes on a background thread.
+
+    - All submitted functions are executed one by one in submission order
+      (delayed ones once their delay has passed).
+    - Functions submitted with the same key while the previous one is still waiting
+      are coalesced, and only the last one is executed.
+    - Functions submitted with delay are not executed before the delay has passed,
+      and coalescing restarts the delay, so bursts are debounced.
+    - Functions failing with "database is locked" are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 5,
+        backoff: float = 0.05,
+        max_backoff: float = 2.0,
+    ) -> None:
+        self.__max_retries = max_retries
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+        self.__condition = threading.Condition()
+        self.__tasks: Deque[_Task] = deque()
+        self.__waiting: Dict[Hashable, _Task] = {}
+        self.__closed = False
+        self.__thread = threading.Thread(
+            target=self.__run, name="work_report-write-queue", daemon=True
+        )
+        self.__thread.start()
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        key: Hashable | None = None,
+        delay: float = 0.0,
+    ) -> Future[Any]:
+        """Submit a write function to the queue.
+
+        Args:
+            func (Callable[..., Any]): Function writing to the database
+            *args (Any): Arguments of the function
+            key (Hashable | None): Coalescing key. If a waiting task has the same key,
+                its function and arguments are replaced and its future is returned.
+            delay (float): Seconds to wait before executing the function
+
+        Raises:
+            WriteQueueClosedError: Occurs when the queue has been already closed
+
+        Returns:
+            Future[Any]: Future resolved with the return value of the function
+        """
+        with self.__condition:
+            if self.__closed:
+                raise WriteQueueClosedError("The write queue has been already closed")
+
+            due = time.monotonic() + delay
+            if key is not None and key in self.__waiting:
+                task = self.__waiting[key]
+                task.func = func
+                task.args = args
+                task.due = due
+                self.__condition.notify()
+                return task.future
+
+            task = _Task(func, args, key, due)
+            self.__tasks.append(task)
+            if key is not None:
+                self.__waiting[key] = task
+            self.__condition.notify()
+
+        return task.future
+
+    def depth(self) -> int:
+        """Count waiting tasks.
+
+        Returns:
+            int: The number of tasks not started yet
+        """
+        with self.__condition:
+            return len(self.__tasks)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stop accepting tasks and wait for waiting tasks to finish.
+
+        Args:
+            timeout (float | None): Seconds to wait for the worker thread
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+        self.__thread.join(timeout)
+
+    def __pop_ready_task(self) -> _Task | None:
+        """Pop the first task whose delay has passed.
+
+        This private function must be used while holding the condition.
+
+        Returns:
+            _Task | None: None if no task is ready, or the queue is closed and empty.
+        """
+        while True:
+            if not self.__tasks:
+                if self.__closed:
+                    return None
+                self.__condition.wait()
+                continue
+
+            now = time.monotonic()
+            for task in self.__tasks:
+                # NOTE: delayed tasks are executed immediately when closing
+                if task.due <= now or self.__closed:
+                    self.__tasks.remove(task)
+                    if task.key is not None:
+                        del self.__waiting[task.key]
+                    return task
+
+            self.__condition.wait(min(task.due for task in self.__tasks) - now)
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                task = self.__pop_ready_task()
+                if task is None:
+                    return
+
+            if task.future.set_running_or_notify_cancel():
+                self.__execute(task)
+
+    def __execute(self, task: _Task) -> None:
+        backoff = self.__backoff
+        for retry in range(self.__max_retries + 1):
+            try:
+                result = task.func(*task.args)
+            except Exception as error:  # pylint: disable=broad-except
+                if is_database_locked(error) and retry < self.__max_retries:
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, self.__max_backoff)
+                    continue
+                task.future.set_exception(error)
+                return
+            task.future.set_result(result)
+            return